@@ -5,16 +5,15 @@ Cung cấp các chức năng cơ bản để phát, dừng, seek audio
 """
 
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QSlider, QCheckBox
-from PySide6.QtCore import Qt, QTimer, Signal, QUrl
+from PySide6.QtCore import Qt, QTimer, Signal, QUrl, QBuffer, QByteArray, QIODevice
 from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
 from PySide6.QtGui import QKeyEvent, QShortcut
 from typing import Optional, List, Tuple
 import os
 import time
-from pydub import AudioSegment
 
 from app.utils.audio_helpers import ms_to_mmss, get_mp3_duration_ms
-from app.utils.helps import hide_directory_on_windows
+from app.core.segment_store import segment_store, KIND_SPLIT
 
 
 class ClickSlider(QSlider):
@@ -67,6 +66,9 @@ class AudioPlayer(QWidget):
         
         # Lưu trạng thái audio trước khi kéo
         self._was_playing_before_seek: bool = False
+
+        # Buffer đang phát khi segment nằm trong bộ nhớ (segment_store)
+        self._source_buffer: Optional[QBuffer] = None
         
         # Thiết lập giao diện
         self._setup_ui()
@@ -439,7 +441,7 @@ class AudioPlayer(QWidget):
         
         # Cập nhật trạng thái
         self.current_index = idx
-        self.player.setSource(QUrl.fromLocalFile(path))
+        self._set_player_source(path)
         self.player.setPosition(max(0, pos_in_segment_ms))
         self.player.play()
         self.timer.start()
@@ -454,6 +456,24 @@ class AudioPlayer(QWidget):
         # Phát signal
         self.segment_changed.emit(idx)
 
+    def _set_player_source(self, path: str) -> None:
+        """Đặt nguồn phát: QBuffer nếu segment còn trong bộ nhớ, ngược lại file trên đĩa"""
+        old_buffer = self._source_buffer
+        self._source_buffer = None
+        view = segment_store.memory_view(path)
+        if view is not None:
+            buffer = QBuffer(self)
+            buffer.setData(QByteArray(view.tobytes()))
+            buffer.open(QIODevice.ReadOnly)
+            # URL chỉ để QMediaPlayer nhận diện định dạng theo đuôi file
+            self.player.setSourceDevice(buffer, QUrl.fromLocalFile(path))
+            self._source_buffer = buffer
+        else:
+            self.player.setSource(QUrl.fromLocalFile(path))
+        if old_buffer is not None:
+            old_buffer.close()
+            old_buffer.deleteLater()
+
     def play_next(self):
         """Phát segment tiếp theo"""
         i = self.current_index + 1
@@ -554,31 +574,20 @@ class AudioPlayer(QWidget):
             return None, None
         
         original_path = self.segment_paths[segment_index]
-        if not original_path or not os.path.exists(original_path):
+        if not segment_store.exists(original_path):
             return None, None
         
         try:
             # Load audio file
-            audio = AudioSegment.from_file(original_path)
+            audio = segment_store.load_audio(original_path)
             
             # Cắt thành 2 phần
             part1 = audio[:split_position_ms]
             part2 = audio[split_position_ms:]
             
-            # Tạo tên file mới
-            base_name = os.path.splitext(os.path.basename(original_path))[0]
-            dir_path = os.path.dirname(original_path)
-            
-            part1_path = os.path.join(dir_path, f"part1_{base_name}.mp3")
-            part2_path = os.path.join(dir_path, f"part2_{base_name}.mp3")
-            
-            # Export 2 phần
-            part1.export(part1_path, format="mp3")
-            part2.export(part2_path, format="mp3")
-            
-            # Ẩn file sau khi tạo (chỉ trên Windows)
-            for file_path in [part1_path, part2_path]:
-                hide_directory_on_windows(file_path)
+            # Lưu 2 phần (trong bộ nhớ nếu còn ngân sách, ngược lại ra workspace)
+            part1_path = segment_store.put_audio(part1, tag=KIND_SPLIT)
+            part2_path = segment_store.put_audio(part2, tag=KIND_SPLIT)
             
             return part1_path, part2_path
             
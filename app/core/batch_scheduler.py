@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+"""
+Batch Scheduler - Lập lịch xử lý nhiều file theo sự kiện
+- Không có vòng lặp msleep/isRunning: mỗi việc xong sẽ tự đẩy việc kế tiếp vào pool
+- Một pool chunk dùng chung cho mọi file (executor của job_scheduler),
+  không tạo QThread + executor riêng cho từng file
+- Thứ tự file: "sjf" (file nhỏ trước - giảm thời gian hoàn thành trung bình),
+  "ljf" (file lớn trước - giảm tổng thời gian khi chỉ có vài file lớn), "fifo"
+- Chunk của file đứng trước được gửi trước nên file xong lần lượt, không bị chia đều rồi cùng xong muộn
+- Số liệu: file/giây, đoạn/giây, thời gian hoàn thành trung bình mỗi file (tính từ lúc bắt đầu batch)
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from app.core.job_scheduler import job_scheduler
+
+
+ORDER_SJF = "sjf"
+ORDER_LJF = "ljf"
+ORDER_FIFO = "fifo"
+
+METRICS_INTERVAL_S = 1.0  # Báo số liệu tối đa mỗi giây (ngoài lúc xong file)
+
+# Loại việc trong pool
+_PREPARE, _CHUNK, _FINALIZE = "prepare", "chunk", "finalize"
+
+
+def file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def order_files(files: Sequence[str], order: str = ORDER_SJF,
+                size_of: Callable[[str], int] = file_size) -> List[str]:
+    """Sắp xếp file theo chiến lược (ổn định: cùng kích thước giữ thứ tự chọn)"""
+    if order == ORDER_FIFO:
+        return list(files)
+    return sorted(files, key=size_of, reverse=(order == ORDER_LJF))
+
+
+class BatchMetrics(NamedTuple):
+    files_done: int
+    files_total: int
+    chunks_done: int
+    chunks_total: int  # Chỉ tính các file đã tách đoạn
+    elapsed: float
+    mean_file_s: float
+
+    @property
+    def files_per_s(self) -> float:
+        return self.files_done / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def chunks_per_s(self) -> float:
+        return self.chunks_done / self.elapsed if self.elapsed > 0 else 0.0
+
+    def describe(self) -> str:
+        return (f"📊 {self.files_done}/{self.files_total} file • {self.files_per_s:.2f} file/s • "
+                f"{self.chunks_per_s:.1f} đoạn/s • TB {self.mean_file_s:.1f}s/file")
+
+
+class BatchStats:
+    """Bộ đếm số liệu batch (an toàn khi gọi từ nhiều luồng)"""
+
+    def __init__(self, files_total: int) -> None:
+        self.files_total = files_total
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._files_done = 0
+        self._chunks_done = 0
+        self._chunks_total = 0
+        self._completion_sum = 0.0
+
+    def start(self) -> None:
+        self._started = time.monotonic()
+
+    def add_chunks(self, count: int) -> None:
+        with self._lock:
+            self._chunks_total += count
+
+    def chunk_done(self, count: int = 1) -> None:
+        with self._lock:
+            self._chunks_done += count
+
+    def file_done(self) -> None:
+        with self._lock:
+            self._files_done += 1
+            self._completion_sum += time.monotonic() - self._started
+
+    def snapshot(self) -> BatchMetrics:
+        with self._lock:
+            done = self._files_done
+            return BatchMetrics(done, self.files_total, self._chunks_done, self._chunks_total,
+                                time.monotonic() - self._started,
+                                self._completion_sum / done if done else 0.0)
+
+
+class BatchFile:
+    """Trạng thái một file trong batch"""
+
+    __slots__ = ("path", "index", "state", "chunks", "context", "results", "errors",
+                 "next_chunk", "outstanding")
+
+    def __init__(self, path: str, index: int) -> None:
+        self.path = path
+        self.index = index  # Vị trí sau khi sắp xếp (0-based)
+        self.state = "waiting"  # waiting | preparing | running | finalizing | done | failed | stopped
+        self.chunks: List[Any] = []
+        self.context: Any = None
+        self.results: Dict[int, Any] = {}  # index1 -> kết quả đoạn
+        self.errors: List[str] = []
+        self.next_chunk = 0
+        self.outstanding = 0
+
+    @property
+    def total(self) -> int:
+        return len(self.chunks)
+
+    @property
+    def processed(self) -> int:
+        return len(self.results) + len(self.errors)
+
+
+class BatchFileScheduler:
+    """
+    Xử lý danh sách file bằng một pool chunk dùng chung
+
+    prepare(path) -> (chunks, context): đọc + tách đoạn (chạy trong pool)
+    process_chunk(context, index1, chunk) -> kết quả đoạn
+    finalize(context, results, errors) -> output của file (ghép, ghi file...)
+    release(context): dọn dẹp sau khi file kết thúc (kể cả lỗi/dừng)
+
+    Callback (gọi từ luồng pool, ngoài khóa):
+    on_file_done(batch_file, output, error), on_chunk_done(batch_file), on_metrics(BatchMetrics)
+    """
+
+    def __init__(self, files: Sequence[str],
+                 prepare: Callable[[str], Tuple[List[Any], Any]],
+                 process_chunk: Callable[[Any, int, Any], Any],
+                 finalize: Callable[[Any, Dict[int, Any], List[str]], Any],
+                 *, workers: int, max_active_files: int = 1,
+                 queue: str = "tts", order: str = ORDER_SJF, label: str = "batch",
+                 release: Optional[Callable[[Any], None]] = None,
+                 on_file_done: Optional[Callable[[BatchFile, Any, Optional[str]], None]] = None,
+                 on_chunk_done: Optional[Callable[[BatchFile], None]] = None,
+                 on_metrics: Optional[Callable[[BatchMetrics], None]] = None,
+                 size_of: Callable[[str], int] = file_size) -> None:
+        self.files = [BatchFile(path, i) for i, path in enumerate(order_files(files, order, size_of))]
+        self.prepare = prepare
+        self.process_chunk = process_chunk
+        self.finalize = finalize
+        self.release = release
+        self.workers = max(1, workers)
+        self.max_active_files = max(1, max_active_files)
+        self.queue = queue
+        self.label = label
+        self.on_file_done = on_file_done
+        self.on_chunk_done = on_chunk_done
+        self.on_metrics = on_metrics
+        self.stats = BatchStats(len(self.files))
+
+        self._cond = threading.Condition()
+        self._waiting: "deque[BatchFile]" = deque(self.files)
+        self._active: List[BatchFile] = []  # Theo thứ tự ưu tiên
+        self._in_flight = 0
+        self._stopped = False
+        self._executor = None
+        self._last_metrics = 0.0
+
+    def stop(self) -> None:
+        """Không gửi việc mới; các việc đang chạy chạy nốt rồi run() trả về"""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def run(self) -> BatchMetrics:
+        """Chạy đồng bộ (block) tới khi xử lý xong mọi file hoặc bị dừng"""
+        self._executor = job_scheduler.executor(self.queue, self.workers, label=self.label)
+        self.stats.start()
+        try:
+            with self._cond:
+                self._pump()
+                while self._in_flight or (not self._stopped and (self._waiting or self._active)):
+                    self._cond.wait()
+                unfinished = list(self._active)
+                self._active.clear()
+        finally:
+            self._executor.shutdown(wait=True)
+        for bf in unfinished:
+            bf.state = "stopped"
+            self._finish(bf, None, "Bị dừng bởi người dùng.")
+        metrics = self.stats.snapshot()
+        if self.on_metrics:
+            self.on_metrics(metrics)
+        return metrics
+
+    # ==================== Điều phối (giữ _cond) ====================
+
+    def _next_task(self) -> Optional[Tuple[str, BatchFile, int]]:
+        for bf in self._active:
+            if bf.state == "running" and bf.next_chunk < bf.total:
+                bf.next_chunk += 1
+                bf.outstanding += 1
+                return _CHUNK, bf, bf.next_chunk
+        # Nhận file mới khi chưa đủ số file đang mở, hoặc khi pool sắp rảnh
+        # (các file đang mở chỉ còn đoạn cuối đang chạy) - số file mở vẫn bị chặn bởi workers
+        if self._waiting and (len(self._active) < self.max_active_files or self._in_flight < self.workers):
+            bf = self._waiting.popleft()
+            self._active.append(bf)
+            bf.state = "preparing"
+            return _PREPARE, bf, 0
+        return None
+
+    def _pump(self) -> None:
+        while not self._stopped and self._in_flight < self.workers:
+            task = self._next_task()
+            if task is None:
+                return
+            self._in_flight += 1
+            self._executor.submit(self._execute, *task)
+
+    # ==================== Thực thi (luồng pool) ====================
+
+    def _execute(self, kind: str, bf: BatchFile, index1: int) -> None:
+        result, error = None, None
+        try:
+            if kind == _PREPARE:
+                result = self.prepare(bf.path)
+            elif kind == _CHUNK:
+                result = self.process_chunk(bf.context, index1, bf.chunks[index1 - 1])
+            else:
+                result = self.finalize(bf.context, bf.results, bf.errors)
+        except Exception as e:
+            error = str(e) or e.__class__.__name__
+
+        finished = None  # (output, error) khi file kết thúc
+        chunk_event = False
+        with self._cond:
+            self._in_flight -= 1
+            if kind == _PREPARE:
+                chunks, context = result if error is None else ([], None)
+                bf.context = context
+                if error is None and not chunks:
+                    error = "File rỗng hoặc không thể tách đoạn."
+                if error is None:
+                    bf.chunks = list(chunks)
+                    bf.state = "running"
+                    self.stats.add_chunks(len(bf.chunks))
+                else:
+                    finished = (None, error)
+            elif kind == _CHUNK:
+                bf.outstanding -= 1
+                if error is None:
+                    bf.results[index1] = result
+                else:
+                    bf.errors.append(f"đoạn {index1}: {error}")
+                self.stats.chunk_done()
+                chunk_event = True
+                if bf.processed == bf.total and not self._stopped:
+                    # Ghép file ngay, dùng lại chỗ trong pool của đoạn vừa xong
+                    bf.state = "finalizing"
+                    self._in_flight += 1
+                    self._executor.submit(self._execute, _FINALIZE, bf, 0)
+            else:
+                finished = (result, error)
+
+            if finished is not None:
+                bf.state = "done" if finished[1] is None else "failed"
+                if bf in self._active:
+                    self._active.remove(bf)
+            self._pump()
+            self._cond.notify_all()
+
+        if chunk_event and self.on_chunk_done:
+            self.on_chunk_done(bf)
+        if finished is not None:
+            self._finish(bf, *finished)
+        elif chunk_event:
+            self._report_metrics()
+
+    def _finish(self, bf: BatchFile, output: Any, error: Optional[str]) -> None:
+        if bf.state != "stopped":
+            self.stats.file_done()
+        try:
+            if self.release and bf.context is not None:
+                self.release(bf.context)
+        finally:
+            # Giải phóng kết quả trung gian của file đã xong
+            bf.results = {}
+            bf.chunks = []
+            if self.on_file_done:
+                self.on_file_done(bf, output, error)
+            self._report_metrics(force=True)
+
+    def _report_metrics(self, force: bool = False) -> None:
+        if not self.on_metrics:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_metrics < METRICS_INTERVAL_S:
+            return
+        self._last_metrics = now
+        self.on_metrics(self.stats.snapshot())
@@ -44,14 +44,37 @@ class AppConfig:
     DATA_DIR.mkdir(parents=True, exist_ok=True)
 
     HISTORY_FILE = DATA_DIR / "tts_history.json"
+    UI_STATE_FILE = DATA_DIR / "ui_state.json"  # Trạng thái giao diện (tab đang mở...)
+    DOWNLOAD_QUEUE_DB = DATA_DIR / "download_queue.db"  # Hàng đợi tải video (tải tiếp sau khi tắt app)
+    DOWNLOAD_ARCHIVE_FILE = DATA_DIR / "download_archive.txt"  # Video đã tải (định dạng --download-archive của yt-dlp)
+    DOWNLOAD_MAX_ATTEMPTS = 3  # Số lần thử tối đa cho mỗi video trước khi đánh dấu lỗi
+
+    LOG_FILE = DATA_DIR / "logs" / "app.log"  # File log (xoay vòng app.log.1, app.log.2...)
+    LOG_FILE_MAX_MB = 5                   # Dung lượng mỗi file log trước khi xoay vòng
+    LOG_FILE_BACKUPS = 3                  # Số file log cũ giữ lại
+    LOG_BUFFER_LINES = 5000               # Số dòng log giữ trong bộ nhớ / hiển thị
+    LOG_FLUSH_MS = 100                    # Chu kỳ đưa log mới lên giao diện
 
     TEMP_PREFIX = "edge_tts_parts_"  # Tiền tố file tạm
+    TEMP_QUOTA_MB = 2048  # Giới hạn dung lượng thư mục tạm của một phiên
+    SEGMENT_MEMORY_MB = 256  # Ngân sách RAM giữ audio segment ngắn (vượt quá thì ghi ra đĩa)
+    SEGMENT_INLINE_MAX_KB = 2048  # Segment lớn hơn mức này ghi thẳng ra đĩa
     
     DEFAULT_VOICE = "vi-VN-HoaiMyNeural"  # Giọng tiếng Việt nữ mặc định
     DEFAULT_RATE = 0                      # Tốc độ bình thường (0%)
     DEFAULT_PITCH = 0                     # Cao độ bình thường (0%)
     DEFAULT_MAXLEN = 500                  # Độ dài tối đa mỗi đoạn (ký tự)
     DEFAULT_GAP_MS = 150                  # Khoảng cách giữa các đoạn (ms)
+    SCHEDULER_MAX_THREADS = 16            # Tổng số luồng làm việc của cả ứng dụng (xem job_scheduler)
+    SCHEDULER_QUEUES = {                  # Hàng đợi: (độ ưu tiên, số luồng tối đa)
+        "tts": (2, 12),
+        "translate": (2, 8),
+        "dubbing": (1, 8),
+        "download": (1, 8),
+    }
+    REORDER_WINDOW = 32                   # Số đoạn tối đa được gửi trước đoạn đầu chưa xong (xem reorder_window)
+    REORDER_HEDGE_AFTER_S = 30            # Đoạn đầu chờ quá lâu thì gửi thêm một lần (hedge)
+    GOOGLE_GTX_FAST_PATH = False          # Google Translate: thử endpoint JSON gtx trước deep_translator
     DEFAULT_WORKERS_CHUNK = 4             # Số luồng xử lý chunk
     DEFAULT_WORKERS_FILE = 2              # Số luồng xử lý file
     DEFAULT_WORKERS_PLAYER = 2            # Số luồng cho player
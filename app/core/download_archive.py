@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Download Archive - Kho lưu trữ video đã tải (dùng chung mọi phiên, mọi thư mục)
+- File text cùng định dạng --download-archive của yt-dlp: mỗi dòng "<extractor> <video id>"
+  (yt-dlp tự ghi thêm dòng khi tải xong và tự bỏ qua video đã có)
+- Bảng phụ trong SQLite: archive id -> file kết quả + SHA-256
+- Tab tải kiểm tra kho trước khi tạo DownloadRunnable để không tải lại video đã có
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Set, Union
+
+from app.core.config import AppConfig
+
+
+# Lấy id video YouTube từ URL mà không cần gọi yt-dlp
+YOUTUBE_ID_RE = re.compile(
+    r"(?:youtube\.com/(?:watch\?(?:[^#]*&)?v=|shorts/|live/|embed/)|youtu\.be/)([0-9A-Za-z_-]{11})")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS archive (
+    archive_id TEXT PRIMARY KEY,
+    files TEXT NOT NULL,
+    recorded_at TEXT NOT NULL
+);
+"""
+
+_HASH_CHUNK = 1024 * 1024
+
+
+def make_archive_id(extractor: str, video_id: str) -> str:
+    """Giống make_archive_id của yt-dlp: '<extractor viết thường> <id>'"""
+    return f"{extractor.lower()} {video_id}"
+
+
+def archive_id_for_url(url: str) -> Optional[str]:
+    """Archive id suy ra trực tiếp từ URL (hiện hỗ trợ YouTube), None nếu không biết"""
+    match = YOUTUBE_ID_RE.search(url or "")
+    return make_archive_id("youtube", match.group(1)) if match else None
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DownloadArchive:
+    """File archive của yt-dlp + bảng đường dẫn/hash"""
+
+    def __init__(self, archive_path: Union[str, Path] = AppConfig.DOWNLOAD_ARCHIVE_FILE,
+                 db_path: Union[str, Path] = AppConfig.DOWNLOAD_QUEUE_DB) -> None:
+        self.archive_path = Path(archive_path)
+        self.db_path = Path(db_path)
+        self._ids: Set[str] = set()
+        self._offset = 0  # File chỉ được ghi thêm: đọc tiếp từ vị trí cũ
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _refresh(self) -> None:
+        """Nạp các dòng mới (yt-dlp ghi thêm trong lúc tải)"""
+        try:
+            size = self.archive_path.stat().st_size
+        except OSError:
+            self._ids.clear()
+            self._offset = 0
+            return
+        if size < self._offset:  # File bị sửa/cắt ngắn: đọc lại từ đầu
+            self._ids.clear()
+            self._offset = 0
+        if size == self._offset:
+            return
+        with open(self.archive_path, "rb") as f:
+            f.seek(self._offset)
+            data = f.read()
+        # Dòng cuối chưa có xuống dòng có thể đang được ghi dở: để lần sau
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].decode("utf-8", errors="replace").splitlines():
+            line = line.strip()
+            if line:
+                self._ids.add(line)
+        self._offset += end
+
+    def contains(self, archive_id: Optional[str]) -> bool:
+        if not archive_id:
+            return False
+        with self._lock:
+            self._refresh()
+            return archive_id in self._ids
+
+    def lookup(self, archive_id: str) -> Dict[str, str]:
+        """Các file đã tải của video: {đường dẫn: sha256}"""
+        row = self.conn.execute(
+            "SELECT files FROM archive WHERE archive_id = ?", (archive_id,)).fetchone()
+        if row is None:
+            return {}
+        try:
+            return json.loads(row["files"])
+        except ValueError:
+            return {}
+
+    def record(self, archive_id: str, files: Dict[str, str]) -> None:
+        """Ghi nhận video đã tải (đường dẫn -> sha256); thêm dòng archive nếu yt-dlp chưa ghi"""
+        with self._lock:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO archive (archive_id, files, recorded_at) VALUES (?, ?, ?)",
+                    (archive_id, json.dumps(files, ensure_ascii=False),
+                     datetime.now().isoformat(timespec="seconds")))
+            self._refresh()
+            if archive_id in self._ids:
+                return
+            self.archive_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.archive_path, "a", encoding="utf-8") as f:
+                f.write(archive_id + "\n")
+            self._refresh()
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+# Instance dùng chung
+download_archive = DownloadArchive()
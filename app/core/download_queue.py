@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Download Queue - Hàng đợi tải video lưu trong SQLite
+- Mỗi lần bấm tải là một batch (thư mục đích, tuỳ chọn, danh sách URL)
+- Mỗi video là một job: trạng thái, số lần thử, thư mục tạm, file kết quả
+- App bị tắt/crash giữa chừng: job đang chạy được đưa về pending, video đã xong không tải lại
+- Thư mục tạm của job được giữ nguyên để yt-dlp tải tiếp từ file .part
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from app.core.config import AppConfig
+
+
+# Trạng thái job
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS batches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at TEXT NOT NULL,
+    download_folder TEXT NOT NULL,
+    options TEXT NOT NULL,
+    closed INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    batch_id INTEGER NOT NULL REFERENCES batches(id),
+    position INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    video_index INTEGER NOT NULL,
+    item_index INTEGER,
+    archive_id TEXT,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    staging_dir TEXT,
+    output_files TEXT,
+    error TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_batch_state ON jobs(batch_id, state, position);
+"""
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+class DownloadQueue:
+    """Hàng đợi tải bền vững (một file SQLite)"""
+
+    def __init__(self, db_path: Union[str, Path] = AppConfig.DOWNLOAD_QUEUE_DB) -> None:
+        self.db_path = Path(db_path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Mở database ở lần dùng đầu; job RUNNING còn sót (crash) được đưa về PENDING"""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._migrate(conn)
+            with conn:
+                conn.execute("UPDATE jobs SET state = ?, updated_at = ? WHERE state = ?",
+                             (PENDING, _now(), RUNNING))
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection) -> None:
+        """Thêm cột mới cho database tạo từ bản cũ"""
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+        if "archive_id" not in columns:
+            with conn:
+                conn.execute("ALTER TABLE jobs ADD COLUMN archive_id TEXT")
+
+    def _write(self, sql: str, params: Iterable = ()) -> sqlite3.Cursor:
+        with self._lock, self.conn:
+            return self.conn.execute(sql, tuple(params))
+
+    # ==================== Batch ====================
+
+    def create_batch(self, download_folder: str, options: Dict, tasks: List) -> Tuple[int, List[int]]:
+        """
+        Lưu một batch mới với các task (url, video_index, item_index, job_id, archive_id).
+        Returns: (id batch, id của từng job theo đúng thứ tự tasks)
+        """
+        with self._lock, self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO batches (created_at, download_folder, options) VALUES (?, ?, ?)",
+                (_now(), download_folder, json.dumps(options, ensure_ascii=False)))
+            batch_id = cur.lastrowid
+            now = _now()
+            self.conn.executemany(
+                "INSERT INTO jobs (batch_id, position, url, video_index, item_index, archive_id, state, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(batch_id, pos, t[0], t[1], t[2], t[4], PENDING, now) for pos, t in enumerate(tasks)])
+            rows = self.conn.execute(
+                "SELECT id FROM jobs WHERE batch_id = ? ORDER BY position", (batch_id,)).fetchall()
+        return batch_id, [row["id"] for row in rows]
+
+    def unfinished_batch(self) -> Optional[sqlite3.Row]:
+        """Batch gần nhất chưa đóng còn job chưa xong"""
+        return self.conn.execute(
+            "SELECT b.*, COUNT(j.id) AS remaining FROM batches b "
+            "JOIN jobs j ON j.batch_id = b.id AND j.state IN (?, ?) "
+            "WHERE b.closed = 0 GROUP BY b.id ORDER BY b.id DESC LIMIT 1",
+            (PENDING, RUNNING)).fetchone()
+
+    @staticmethod
+    def batch_options(batch: sqlite3.Row) -> Dict:
+        try:
+            return json.loads(batch["options"])
+        except (TypeError, ValueError):
+            return {}
+
+    def pending_jobs(self, batch_id: int) -> List[sqlite3.Row]:
+        return self.conn.execute(
+            "SELECT * FROM jobs WHERE batch_id = ? AND state = ? ORDER BY position",
+            (batch_id, PENDING)).fetchall()
+
+    def counts(self, batch_id: int) -> Dict[str, int]:
+        rows = self.conn.execute(
+            "SELECT state, COUNT(*) AS n FROM jobs WHERE batch_id = ? GROUP BY state",
+            (batch_id,)).fetchall()
+        return {row["state"]: row["n"] for row in rows}
+
+    def staging_dirs(self, batch_id: int) -> List[str]:
+        rows = self.conn.execute(
+            "SELECT staging_dir FROM jobs WHERE batch_id = ? AND staging_dir IS NOT NULL "
+            "AND state != ?", (batch_id, DONE)).fetchall()
+        return [row["staging_dir"] for row in rows]
+
+    def close_batch(self, batch_id: int) -> None:
+        self._write("UPDATE batches SET closed = 1 WHERE id = ?", (batch_id,))
+
+    # ==================== Job ====================
+
+    def mark_running(self, job_id: int, staging_dir: str) -> None:
+        """Job bắt đầu chạy; chỉ lần chạy lỗi mới được tính là một lần thử (xem mark_failed)"""
+        self._write(
+            "UPDATE jobs SET state = ?, staging_dir = ?, updated_at = ? WHERE id = ?",
+            (RUNNING, staging_dir, _now(), job_id))
+
+    def mark_done(self, job_id: int, output_files: List[str]) -> None:
+        self._write(
+            "UPDATE jobs SET state = ?, output_files = ?, error = NULL, updated_at = ? WHERE id = ?",
+            (DONE, json.dumps(output_files, ensure_ascii=False), _now(), job_id))
+
+    def mark_failed(self, job_id: int, error: str,
+                    max_attempts: int = AppConfig.DOWNLOAD_MAX_ATTEMPTS) -> bool:
+        """Ghi lỗi và tính thêm một lần thử; còn lượt thì đưa về PENDING. Returns: True nếu sẽ thử lại"""
+        with self._lock, self.conn:
+            row = self.conn.execute("SELECT attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            retry = row is not None and row["attempts"] + 1 < max_attempts
+            self.conn.execute(
+                "UPDATE jobs SET state = ?, attempts = attempts + 1, error = ?, updated_at = ? WHERE id = ?",
+                (PENDING if retry else FAILED, error, _now(), job_id))
+        return retry
+
+    def requeue(self, job_id: int) -> None:
+        """Người dùng dừng: job quay về PENDING, không tính là một lần thử (giữ file .part)"""
+        self._write(
+            "UPDATE jobs SET state = ?, updated_at = ? WHERE id = ? AND state = ?",
+            (PENDING, _now(), job_id, RUNNING))
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+# Instance dùng chung
+download_queue = DownloadQueue()
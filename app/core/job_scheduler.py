@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+Job Scheduler - Bộ lập lịch công việc dùng chung cho toàn ứng dụng
+- Một nhóm luồng duy nhất, tổng số luồng không vượt AppConfig.SCHEDULER_MAX_THREADS
+- Hàng đợi có tên (tts, translate, dubbing, download...) với độ ưu tiên và giới hạn riêng
+- Khi có luồng rảnh: chọn hàng đợi ưu tiên cao nhất; cùng ưu tiên thì hàng đợi đang chạy
+  ít việc nhất được chọn (chia đều giữa các tab); trong một hàng đợi các executor luân phiên
+- QueueExecutor là concurrent.futures.Executor nên thay thẳng cho ThreadPoolExecutor
+  (submit/map/shutdown/with, dùng được với as_completed/wait)
+- snapshot()/describe(): xem công việc đang chạy ở một chỗ
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, wait as wait_futures
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import AppConfig
+
+
+_IDLE_EXIT_S = 30.0  # Luồng rảnh quá lâu thì tự thoát
+
+
+class _Job:
+    __slots__ = ("future", "fn", "args", "kwargs")
+
+    def __init__(self, future: Future, fn, args, kwargs) -> None:
+        self.future = future
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+
+
+class _Queue:
+    """Hàng đợi có tên: các executor đang có việc chờ, xếp luân phiên"""
+
+    def __init__(self, name: str, priority: int, limit: int) -> None:
+        self.name = name
+        self.priority = priority
+        self.limit = limit
+        self.running = 0
+        self.executors: "deque[QueueExecutor]" = deque()
+
+    def pending(self) -> int:
+        return sum(len(ex._pending) for ex in self.executors)
+
+    def next_executor(self) -> Optional["QueueExecutor"]:
+        for ex in self.executors:
+            if ex._pending and ex._running < ex.max_workers:
+                return ex
+        return None
+
+
+class QueueExecutor(Executor):
+    """Executor gắn với một hàng đợi của JobScheduler (giới hạn riêng max_workers)"""
+
+    def __init__(self, scheduler: "JobScheduler", queue: str,
+                 max_workers: Optional[int] = None, label: str = "") -> None:
+        self.scheduler = scheduler
+        self.queue = queue
+        self.max_workers = max(1, max_workers or scheduler.max_threads)
+        self.label = label or queue
+        self._pending: "deque[_Job]" = deque()
+        self._running = 0
+        self._futures: "set[Future]" = set()
+        self._shutdown = False
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        if self._shutdown:
+            raise RuntimeError("cannot schedule new futures after shutdown")
+        return self.scheduler._submit(self, fn, args, kwargs)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        with self.scheduler._cond:
+            self._shutdown = True
+            if cancel_futures:
+                while self._pending:
+                    future = self._pending.popleft().future
+                    if future.cancel():
+                        future.set_running_or_notify_cancel()  # Báo cho wait/as_completed
+                    self._futures.discard(future)
+                self.scheduler._detach(self)
+            futures = list(self._futures)
+        if wait and futures:
+            wait_futures(futures)
+
+
+class JobScheduler:
+    """Nhóm luồng dùng chung với ngân sách toàn cục"""
+
+    def __init__(self, max_threads: int = AppConfig.SCHEDULER_MAX_THREADS,
+                 queues: Optional[Dict[str, Tuple[int, int]]] = None) -> None:
+        self.max_threads = max(1, max_threads)
+        self._cond = threading.Condition()
+        self._queues: Dict[str, _Queue] = {}
+        self._threads = 0
+        self._idle = 0
+        self._running: Dict[int, Tuple[str, str, float]] = {}  # thread id -> (queue, label, bắt đầu)
+        for name, (priority, limit) in (queues or AppConfig.SCHEDULER_QUEUES).items():
+            self.configure_queue(name, priority, limit)
+
+    # ==================== Cấu hình ====================
+
+    def configure_queue(self, name: str, priority: int = 0, limit: Optional[int] = None) -> None:
+        """Tạo/cập nhật hàng đợi: ưu tiên lớn chạy trước, limit = số luồng tối đa của hàng đợi"""
+        with self._cond:
+            limit = max(1, min(limit or self.max_threads, self.max_threads))
+            queue = self._queues.get(name)
+            if queue is None:
+                self._queues[name] = _Queue(name, priority, limit)
+            else:
+                queue.priority, queue.limit = priority, limit
+            self._cond.notify_all()
+
+    def executor(self, queue: str, max_workers: Optional[int] = None, label: str = "") -> QueueExecutor:
+        """Executor mới trên hàng đợi queue (thay cho ThreadPoolExecutor(max_workers))"""
+        return QueueExecutor(self, queue, max_workers, label)
+
+    # ==================== Điều phối ====================
+
+    def _detach(self, ex: QueueExecutor) -> None:
+        queue = self._queues.get(ex.queue)
+        if queue is not None and ex in queue.executors:
+            queue.executors.remove(ex)
+
+    def _submit(self, ex: QueueExecutor, fn, args, kwargs) -> Future:
+        future = Future()
+        with self._cond:
+            queue = self._queues.get(ex.queue)
+            if queue is None:
+                queue = self._queues[ex.queue] = _Queue(ex.queue, 0, self.max_threads)
+            ex._pending.append(_Job(future, fn, args, kwargs))
+            ex._futures.add(future)
+            if ex not in queue.executors:
+                queue.executors.append(ex)
+            if self._idle == 0 and self._threads < self.max_threads:
+                self._threads += 1
+                threading.Thread(target=self._worker, name=f"job-{self._threads}", daemon=True).start()
+            else:
+                self._cond.notify()
+        return future
+
+    def _pick(self) -> Optional[Tuple[_Queue, QueueExecutor, _Job]]:
+        """Chọn việc kế tiếp (gọi khi đang giữ _cond)"""
+        best = None
+        for queue in self._queues.values():
+            if queue.running >= queue.limit:
+                continue
+            ex = queue.next_executor()
+            if ex is None:
+                continue
+            key = (-queue.priority, queue.running)
+            if best is None or key < best[0]:
+                best = (key, queue, ex)
+        if best is None:
+            return None
+        _, queue, ex = best
+        job = ex._pending.popleft()
+        # Executor vừa được phục vụ xuống cuối để các executor khác trong hàng đợi tới lượt
+        queue.executors.remove(ex)
+        if ex._pending:
+            queue.executors.append(ex)
+        queue.running += 1
+        ex._running += 1
+        return queue, ex, job
+
+    def _worker(self) -> None:
+        me = threading.get_ident()
+        while True:
+            with self._cond:
+                picked = self._pick()
+                while picked is None:
+                    self._idle += 1
+                    signaled = self._cond.wait(_IDLE_EXIT_S)
+                    self._idle -= 1
+                    picked = self._pick()
+                    if picked is None and not signaled:
+                        self._threads -= 1
+                        return
+                queue, ex, job = picked
+                self._running[me] = (queue.name, ex.label, time.monotonic())
+            try:
+                if job.future.set_running_or_notify_cancel():
+                    try:
+                        job.future.set_result(job.fn(*job.args, **job.kwargs))
+                    except BaseException as e:
+                        job.future.set_exception(e)
+            finally:
+                with self._cond:
+                    self._running.pop(me, None)
+                    queue.running -= 1
+                    ex._running -= 1
+                    ex._futures.discard(job.future)
+                    if ex._pending and ex not in queue.executors:
+                        queue.executors.append(ex)
+                    self._cond.notify()
+
+    # ==================== Theo dõi ====================
+
+    def snapshot(self) -> Dict:
+        """Trạng thái hiện tại: ngân sách, số luồng, từng hàng đợi và việc đang chạy"""
+        now = time.monotonic()
+        with self._cond:
+            return {
+                "budget": self.max_threads,
+                "threads": self._threads,
+                "running": len(self._running),
+                "queues": [
+                    {"name": q.name, "priority": q.priority, "limit": q.limit,
+                     "running": q.running, "pending": q.pending()}
+                    for q in self._queues.values()
+                ],
+                "jobs": [
+                    {"queue": name, "label": label, "seconds": round(now - started, 1)}
+                    for name, label, started in self._running.values()
+                ],
+            }
+
+    def describe(self) -> str:
+        """Một dòng ngắn cho status bar: '⚙️ 6/16 luồng • tts 4 (+20) • download 2'"""
+        snap = self.snapshot()
+        parts: List[str] = [f"⚙️ {snap['running']}/{snap['budget']} luồng"]
+        for q in snap["queues"]:
+            if q["running"] or q["pending"]:
+                extra = f" (+{q['pending']})" if q["pending"] else ""
+                parts.append(f"{q['name']} {q['running']}{extra}")
+        return " • ".join(parts)
+
+
+# Instance dùng chung cho cả ứng dụng
+job_scheduler = JobScheduler()
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+Language Detector - Phát hiện ngôn ngữ có cache và lấy mẫu
+- Văn bản dài chỉ lấy vài cửa sổ (đầu/giữa/cuối) thay vì đưa cả văn bản vào langdetect
+- Seed cố định để cùng một văn bản luôn cho cùng kết quả
+- Nhớ kết quả theo hash văn bản (LRU)
+- Phát hiện theo lô cho từng đoạn (văn bản nhiều ngôn ngữ)
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+
+# Độ dài mỗi cửa sổ mẫu (ký tự) và số cửa sổ tối đa cho văn bản dài
+SAMPLE_WINDOW_CHARS = 400
+SAMPLE_WINDOWS = 3
+
+# Đoạn quá ngắn (ít chữ cái) cho kết quả không ổn định -> lấy theo đoạn lân cận
+MIN_DETECT_LETTERS = 20
+
+# Số kết quả được nhớ
+CACHE_SIZE = 512
+
+DETECT_SEED = 0
+
+# Chuẩn hoá mã của langdetect
+LANG_MAPPING = {
+    "zh-cn": "zh",  # Chinese simplified
+    "zh-tw": "zh",  # Chinese traditional
+}
+
+
+def sample_windows(text: str, window: int = SAMPLE_WINDOW_CHARS,
+                   count: int = SAMPLE_WINDOWS) -> List[str]:
+    """Cắt các cửa sổ cách đều nhau trên văn bản (căn theo khoảng trắng)"""
+    text = text.strip()
+    if len(text) <= window * count:
+        return [text]
+    windows = []
+    step = (len(text) - window) // max(1, count - 1)
+    for i in range(count):
+        start = i * step
+        if start:
+            # Bắt đầu sau khoảng trắng gần nhất để không cắt giữa từ
+            space = text.find(" ", start, start + 50)
+            if space != -1:
+                start = space + 1
+        end = start + window
+        space = text.rfind(" ", end - 50, end)
+        if space > start:
+            end = space
+        windows.append(text[start:end])
+    return windows
+
+
+def _letter_count(text: str) -> int:
+    return sum(1 for ch in text if ch.isalpha())
+
+
+class LanguageDetector:
+    """Bọc langdetect với lấy mẫu, seed cố định và cache LRU theo hash"""
+
+    def __init__(self, cache_size: int = CACHE_SIZE) -> None:
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[bytes, Optional[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._detect_langs = None
+
+    def _backend(self):
+        """Import langdetect ở lần dùng đầu và đặt seed cố định"""
+        if self._detect_langs is None:
+            from langdetect import DetectorFactory, detect_langs
+            DetectorFactory.seed = DETECT_SEED
+            self._detect_langs = detect_langs
+        return self._detect_langs
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+    def _cache_get(self, key: bytes):
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return True, self._cache[key]
+        return False, None
+
+    def _cache_put(self, key: bytes, value: Optional[str]) -> None:
+        with self._lock:
+            self._cache[key] = value
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _detect_uncached(self, text: str) -> Optional[str]:
+        detect_langs = self._backend()
+        scores: Dict[str, float] = {}
+        for window in sample_windows(text):
+            try:
+                candidates = detect_langs(window)
+            except Exception:
+                continue  # Cửa sổ không có đặc trưng ngôn ngữ (số, ký hiệu...)
+            for cand in candidates:
+                code = LANG_MAPPING.get(cand.lang, cand.lang)
+                scores[code] = scores.get(code, 0.0) + cand.prob * len(window)
+        if not scores:
+            return None
+        return max(scores, key=scores.get)
+
+    def detect(self, text: str) -> Optional[str]:
+        """Mã ngôn ngữ của văn bản, None nếu không xác định được"""
+        text = (text or "").strip()
+        if not text:
+            return None
+        key = self._key(text)
+        hit, value = self._cache_get(key)
+        if hit:
+            return value
+        value = self._detect_uncached(text)
+        self._cache_put(key, value)
+        return value
+
+    def detect_batch(self, chunks: List[str], default: Optional[str] = None) -> List[Optional[str]]:
+        """
+        Phát hiện ngôn ngữ cho từng đoạn.
+        Đoạn quá ngắn hoặc không xác định được lấy theo đoạn đứng trước (hoặc sau nếu là đoạn đầu).
+        """
+        results: List[Optional[str]] = [
+            self.detect(chunk) if _letter_count(chunk) >= MIN_DETECT_LETTERS else None
+            for chunk in chunks
+        ]
+        previous = None
+        for i, code in enumerate(results):
+            if code is None:
+                results[i] = previous
+            else:
+                previous = code
+        following = default
+        for i in range(len(results) - 1, -1, -1):
+            if results[i] is None:
+                results[i] = following
+            else:
+                following = results[i]
+        return results
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+# Instance dùng chung
+language_detector = LanguageDetector()
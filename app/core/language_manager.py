@@ -3,89 +3,72 @@ Language Manager - Quản lý ngôn ngữ và voices cho TTS
 """
 
 from typing import List, Dict, Optional, Tuple
-from langdetect import detect
-from .voices_data import voices_data
+from .language_detector import language_detector
+from .voice_catalog import voice_catalog, voice_display_name, AUTO_DETECT_LABEL
 
 
 class LanguageManager:
-    """Quản lý ngôn ngữ và voices cho TTS"""
+    """
+    Quản lý ngôn ngữ và voices cho TTS
+    Dữ liệu và chỉ mục tra cứu nằm trong voice_catalog (nạp lười ở lần dùng đầu).
+    """
     
     def __init__(self):
         """Khởi tạo Language Manager"""
-        pass
+        self.catalog = voice_catalog
+        self._available_languages: Optional[List[Tuple[str, str]]] = None
     
     def get_voices_for_language(self, language_code: str) -> List[Dict]:
         """Lấy danh sách voices cho một ngôn ngữ cụ thể"""
-        if language_code in voices_data:
-            return voices_data[language_code]["voices"]
-        return []
+        return self.catalog.voices(language_code)
     
     def get_language_display_name(self, language_code: str) -> str:
         """Lấy tên hiển thị của ngôn ngữ từ mã ngôn ngữ"""
-        if language_code in voices_data:
-            return voices_data[language_code]["display_name"]
-        return language_code
+        return self.catalog.display_name(language_code) or language_code
     
     def get_default_voice_for_language(self, language_code: str) -> str:
         """Lấy voice mặc định cho một ngôn ngữ cụ thể"""
-        if language_code in voices_data and voices_data[language_code]["voices"]:
+        voices = self.catalog.voices(language_code)
+        if voices:
             # Trả về voice đầu tiên (thường là voice mặc định)
-            return voices_data[language_code]["voices"][0]["shortname"]
+            return voices[0]["shortname"]
         return "vi-VN-HoaiMyNeural"  # Fallback to Vietnamese
     
     def get_available_languages(self) -> List[Tuple[str, str]]:
         """Lấy danh sách tất cả ngôn ngữ có sẵn với mã và tên hiển thị"""
-        return [("Tự phát hiện", "auto")] + [(voices_data[lang]["display_name"], lang) for lang in voices_data.keys()]
+        if self._available_languages is None:
+            self._available_languages = [(AUTO_DETECT_LABEL, "auto")] + [
+                (entry["display_name"], lang) for lang, entry in self.catalog.languages().items()]
+        return list(self._available_languages)
     
     def get_language_by_code(self, code: str) -> Optional[str]:
         """Lấy tên hiển thị của ngôn ngữ từ mã ngôn ngữ"""
         if code == "auto":
-            return "Tự phát hiện"
-        if code in voices_data:
-            return voices_data[code]["display_name"]
-        return None
+            return AUTO_DETECT_LABEL
+        return self.catalog.display_name(code)
     
     def get_voice_info(self, voice_name: str) -> Optional[Dict]:
         """Lấy thông tin chi tiết về một voice cụ thể"""
-        for lang_code, lang_data in voices_data.items():
-            for voice in lang_data["voices"]:
-                if voice["shortname"] == voice_name:
-                    return {
-                        "language": lang_data["display_name"],
-                        "language_code": lang_code,
-                        "gender": voice["gender"],
-                        "shortname": voice["shortname"],
-                        "label": voice["label"]
-                    }
-        return None
+        return self.catalog.voice_info(voice_name)
     
     def get_voices_by_gender(self, language_code: str, gender: str = None) -> List[Dict]:
         """Lấy danh sách voices theo ngôn ngữ và giới tính (nếu có)"""
-        if language_code not in voices_data:
-            return []
-        
-        voices = voices_data[language_code]["voices"]
         if gender:
-            return [v for v in voices if v["gender"] == gender]
-        return voices
+            return list(self.catalog.voices_by_gender(language_code, gender))
+        return self.catalog.voices(language_code)
     
     def get_all_language_codes(self) -> List[str]:
         """Lấy danh sách tất cả mã ngôn ngữ có sẵn"""
-        return list(voices_data.keys())
+        return list(self.catalog.languages().keys())
     
     def get_language_count(self) -> int:
         """Lấy tổng số ngôn ngữ có sẵn"""
-        return len(voices_data)
+        return len(self.catalog.languages())
     
     def get_voice_by_gender(self, language_code: str, gender: str) -> Optional[str]:
         """Lấy voice theo giới tính cho một ngôn ngữ cụ thể"""
-        if language_code not in voices_data:
-            return None
-        
-        for voice in voices_data[language_code]["voices"]:
-            if voice["gender"] == gender:
-                return voice["shortname"]
-        return None
+        voices = self.catalog.voices_by_gender(language_code, gender)
+        return voices[0]["shortname"] if voices else None
     
     def get_male_voice(self, language_code: str) -> Optional[str]:
         """Lấy voice nam cho một ngôn ngữ cụ thể"""
@@ -95,107 +78,75 @@ class LanguageManager:
         """Lấy voice nữ cho một ngôn ngữ cụ thể"""
         return self.get_voice_by_gender(language_code, "Nữ")
     
-    def get_voice_display_name(self, voice_label: str) -> str:
-        """Lấy tên hiển thị ngắn gọn của voice từ label đầy đủ"""
-        try:
-            # Tách phần "Gender - Name" từ "Gender - Name (shortname)"
-            if " (" in voice_label:
-                return voice_label.split(" (")[0]
-            return voice_label
-        except:
-            return voice_label
-    
     def detect_language_from_text(self, text: str) -> str:
-        """Tự động phát hiện ngôn ngữ từ văn bản sử dụng langdetect"""
+        """Tự động phát hiện ngôn ngữ từ văn bản (lấy mẫu + cache, xem language_detector)"""
         try:
-            if not text.strip():
-                return "vi"  # Default to Vietnamese
-            
-            # Sử dụng langdetect để phát hiện ngôn ngữ
-            detected_lang = detect(text)
-            
-            # Mapping một số mã ngôn ngữ phổ biến
-            lang_mapping = {
-                "zh-cn": "zh",  # Chinese simplified
-                "zh-tw": "zh",  # Chinese traditional
-            }
-            
-            detected_lang = lang_mapping.get(detected_lang, detected_lang)
-            
-            # Kiểm tra xem ngôn ngữ có được hỗ trợ không
-            if self.is_language_supported(detected_lang):
-                return detected_lang
-            else:
-                # Fallback to Vietnamese if not supported
-                return "vi"
-                
+            detected_lang = language_detector.detect(text)
         except Exception as e:
             print(f"Error detecting language: {e}")
             return "vi"  # Fallback to Vietnamese
+        
+        # Kiểm tra xem ngôn ngữ có được hỗ trợ không, fallback tiếng Việt
+        if detected_lang and self.is_language_supported(detected_lang):
+            return detected_lang
+        return "vi"
+    
+    def detect_languages_for_chunks(self, chunks: List[str], default: str = "vi") -> List[str]:
+        """Phát hiện ngôn ngữ cho từng đoạn (văn bản nhiều ngôn ngữ)"""
+        try:
+            detected = language_detector.detect_batch(chunks, default)
+        except Exception as e:
+            print(f"Error detecting language: {e}")
+            return [default] * len(chunks)
+        return [code if code and self.is_language_supported(code) else default for code in detected]
+    
+    def voices_for_chunks(self, chunks: List[str], default: str = "vi") -> List[str]:
+        """Chọn voice (ưu tiên giọng nữ) theo ngôn ngữ của từng đoạn"""
+        voices: Dict[str, str] = {}
+        result = []
+        for code in self.detect_languages_for_chunks(chunks, default):
+            if code not in voices:
+                voices[code] = self.get_female_voice(code) or self.get_default_voice_for_language(code)
+            result.append(voices[code])
+        return result
     
     def is_language_supported(self, language_code: str) -> bool:
         """Kiểm tra xem một ngôn ngữ có được hỗ trợ không"""
-        return language_code in voices_data
+        return self.catalog.has_language(language_code)
     
     def get_voice_display_name(self, voice_label: str) -> str:
         """Lấy tên hiển thị ngắn gọn của voice (ví dụ: "Nam - NamMinh")"""
-        if " (" in voice_label:
-            return voice_label.split(" (")[0]
-        return voice_label
+        return voice_display_name(voice_label)
     
     def extract_voice_name_from_label(self, voice_label: str) -> Optional[str]:
         """Trích xuất voice name từ label (ví dụ: "Nam - NamMinh" -> "vi-VN-NamMinhNeural")"""
         try:
             # Nếu là "Tự phát hiện", trả về None để xử lý tự động
-            if voice_label == "Tự phát hiện":
+            if voice_label == AUTO_DETECT_LABEL:
                 return None
             
-            # Tìm trong voices_data bằng cách so sánh phần display name
-            for lang_code, lang_data in voices_data.items():
-                for voice in lang_data["voices"]:
-                    # Lấy phần display name từ label gốc: "Nam - NamMinh (vi-VN-NamMinhNeural)" -> "Nam - NamMinh"
-                    display_name = self.get_voice_display_name(voice["label"])
-                    if display_name == voice_label:
-                        return voice["shortname"]
-            
-            return None
+            # Tra chỉ mục tên hiển thị: "Nam - NamMinh" -> "vi-VN-NamMinhNeural"
+            return self.catalog.shortname_by_display(voice_label)
             
         except Exception as e:
             print(f"Error extracting voice name: {e}")
             return None
     
     def populate_voices_for_language(self, language_code: str, include_auto_detect: bool = True) -> List[str]:
-        """Lấy danh sách tên hiển thị voices cho một ngôn ngữ cụ thể"""
-        voices = []
-        
-        if include_auto_detect:
-            voices.append("Tự phát hiện")
-        
-        if language_code in voices_data:
-            for voice in voices_data[language_code]["voices"]:
-                display_name = self.get_voice_display_name(voice["label"])
-                voices.append(display_name)
-        
-        return voices
+        """Lấy danh sách tên hiển thị voices cho một ngôn ngữ cụ thể (được nhớ lại)"""
+        return list(self.catalog.labels(language_code, include_auto_detect))
     
     def code_by_name(self, name: str) -> str:
         """Lấy mã ngôn ngữ từ tên hiển thị"""
-        if name == "Tự phát hiện":
+        if name == AUTO_DETECT_LABEL:
             return "auto"
-        
-        for lang_code, lang_data in voices_data.items():
-            if lang_data["display_name"] == name:
-                return lang_code
-        return "auto"
+        return self.catalog.code_by_display_name(name) or "auto"
     
     def name_by_code(self, code: str) -> str:
         """Lấy tên hiển thị từ mã ngôn ngữ"""
         if code.lower() == "auto":
-            return "Tự phát hiện"
-        
-        if code.lower() in voices_data:
-            return voices_data[code.lower()]["display_name"]
-        return code
+            return AUTO_DETECT_LABEL
+        return self.catalog.display_name(code.lower()) or code
 
 
 # Tạo instance global để sử dụng
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+Log Sink - Nơi nhận log chung cho toàn ứng dụng
+- Ghi từ thread bất kỳ; bản ghi nằm trong ring buffer cố định (AppConfig.LOG_BUFFER_LINES)
+  nên bộ nhớ không tăng theo thời gian chạy
+- Giao diện lấy các dòng mới theo lô (drain) thay vì vẽ lại cho từng dòng (xem app/ui/log_view.py)
+- Một thread nền ghi file log theo lô, xoay vòng file khi vượt AppConfig.LOG_FILE_MAX_MB;
+  hàng đợi ghi file có giới hạn, đầy thì bỏ dòng mới và ghi lại số dòng đã bỏ
+"""
+
+import os
+import queue
+import threading
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Union
+
+from app.core.config import AppConfig
+
+
+_WRITER_BATCH = 500  # Số dòng tối đa mỗi lần ghi file
+_WRITER_FLUSH_S = 1.0  # Thời gian gom lô tối đa trước khi ghi
+_WRITER_QUEUE_MAX = 20000  # Số dòng tối đa chờ ghi file (đĩa chậm/treo thì bỏ bớt)
+_STOP = None
+
+
+class LogRecord(NamedTuple):
+    timestamp: str  # HH:MM:SS
+    level: str  # "" | info | warning | error | blue
+    message: str
+
+    def text(self) -> str:
+        return f"[{self.timestamp}] {self.message}"
+
+
+class _LogFileWriter(threading.Thread):
+    """Thread nền ghi log ra file theo lô, xoay vòng app.log -> app.log.1 -> ..."""
+
+    def __init__(self, path: Path, max_bytes: int, backups: int) -> None:
+        super().__init__(name="log-file-writer", daemon=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.queue: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=_WRITER_QUEUE_MAX)
+        self._file = None
+        self._dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def offer(self, line: str) -> bool:
+        """Đưa một dòng vào hàng đợi (không chặn); False nếu hàng đợi đầy và dòng bị bỏ"""
+        try:
+            self.queue.put_nowait(line)
+            return True
+        except queue.Full:
+            with self._dropped_lock:
+                self._dropped += 1
+            return False
+
+    def _take_dropped(self) -> int:
+        with self._dropped_lock:
+            dropped, self._dropped = self._dropped, 0
+        return dropped
+
+    def run(self) -> None:
+        running = True
+        while running:
+            try:
+                line = self.queue.get(timeout=_WRITER_FLUSH_S)
+            except queue.Empty:
+                continue
+            batch = []
+            while line is not _STOP:
+                batch.append(line)
+                if len(batch) >= _WRITER_BATCH:
+                    break
+                try:
+                    line = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            running = line is not _STOP
+            dropped = self._take_dropped()
+            if dropped:
+                batch.append(f"{datetime.now():%Y-%m-%d %H:%M:%S} [WARNING] "
+                             f"Bỏ {dropped} dòng log vì hàng đợi ghi file đầy\n")
+            if batch:
+                self._write(batch)
+        self._close_file()
+
+    def _write(self, lines: List[str]) -> None:
+        try:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write("".join(lines))
+            self._file.flush()
+            if self._file.tell() >= self.max_bytes:
+                self._rotate()
+        except OSError as e:
+            print(f"[LOG FILE ERROR] {e}")
+
+    def _rotate(self) -> None:
+        self._close_file()
+        for i in range(self.backups - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+
+class LogSink:
+    """Ring buffer log dùng chung + ghi file nền"""
+
+    def __init__(self, capacity: int = AppConfig.LOG_BUFFER_LINES,
+                 log_file: Union[str, Path, None] = AppConfig.LOG_FILE,
+                 max_bytes: int = AppConfig.LOG_FILE_MAX_MB * 1024 * 1024,
+                 backups: int = AppConfig.LOG_FILE_BACKUPS) -> None:
+        self.capacity = capacity
+        self.records: "deque[LogRecord]" = deque(maxlen=capacity)
+        self._pending: "deque[LogRecord]" = deque(maxlen=capacity)  # Chưa đưa lên giao diện
+        self._lock = threading.Lock()
+        self.log_file = Path(log_file) if log_file else None
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._writer: Optional[_LogFileWriter] = None
+
+    def write(self, message: str, level: str = "", to_file: bool = True) -> LogRecord:
+        """Thêm một dòng log (an toàn khi gọi từ thread bất kỳ)"""
+        now = datetime.now()
+        record = LogRecord(now.strftime("%H:%M:%S"), level, message)
+        with self._lock:
+            self._pending.append(record)
+        if to_file:
+            self._to_file(now, level, message)
+        return record
+
+    def write_to_file(self, message: str, level: str = "") -> None:
+        """Chỉ ghi file, không hiện trên giao diện"""
+        self._to_file(datetime.now(), level, message)
+
+    def _to_file(self, now: datetime, level: str, message: str) -> None:
+        if self.log_file is None:
+            return
+        if self._writer is None:
+            with self._lock:
+                if self._writer is None:
+                    self._writer = _LogFileWriter(self.log_file, self.max_bytes, self.backups)
+                    self._writer.start()
+        tag = f" [{level.upper()}]" if level else ""
+        self._writer.offer(f"{now:%Y-%m-%d %H:%M:%S}{tag} {message}\n")
+
+    def drain(self) -> List[LogRecord]:
+        """Lấy các dòng mới từ lần drain trước (chỉ gọi từ GUI thread)"""
+        with self._lock:
+            if not self._pending:
+                return []
+            new = list(self._pending)
+            self._pending.clear()
+        self.records.extend(new)
+        return new
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending.clear()
+        self.records.clear()
+
+    def close(self) -> None:
+        """Ghi nốt log còn trong hàng đợi rồi dừng thread ghi file"""
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            try:
+                writer.queue.put(_STOP, timeout=5)
+            except queue.Full:
+                return
+            writer.join(timeout=5)
+
+
+# Instance dùng chung cho cả ứng dụng
+log_sink = LogSink()
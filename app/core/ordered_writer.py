@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Ordered Writer - Ghi file MP3 đầu ra theo thứ tự đoạn, ngay trong lúc đang sinh
+- Đoạn k được nối vào file đích ngay khi k và mọi đoạn trước đã xong (cách đoạn trước một khoảng lặng gap)
+- Nối trực tiếp frame MP3 (không giải mã lại), file đích phát được ngay khi đang chạy
+- Đoạn trung gian bị xóa ngay sau khi ghi, nên chỉ các đoạn về sớm (chờ đoạn trước) còn giữ lại
+- An toàn khi gọi add()/skip() từ nhiều luồng
+"""
+
+import threading
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional, Union
+
+from app.core.segment_store import segment_store
+from app.core.temp_workspace import temp_workspace
+from app.utils.mp3_stream import Mp3Format, silence_frames, split_frames
+
+
+class WriterStats(NamedTuple):
+    parts_written: int
+    parts_skipped: int
+    duration_ms: int
+    bytes_written: int
+    high_water: int  # Số đoạn tối đa từng phải giữ chờ đoạn trước
+
+
+class OrderedMp3Writer:
+    """Nối các đoạn MP3 (đánh số từ 1) vào out_path theo đúng thứ tự"""
+
+    def __init__(self, out_path: Union[str, Path], gap_ms: int = 0, discard_parts: bool = True) -> None:
+        self.out_path = str(out_path)
+        self.gap_ms = max(0, gap_ms)
+        self.discard_parts = discard_parts
+        self._lock = threading.Lock()
+        self._ready: Dict[int, Optional[str]] = {}  # index1 -> đường dẫn đoạn (None = bỏ qua)
+        self._next = 1
+        self._file = open(self.out_path, "wb")
+        self._fmt: Optional[Mp3Format] = None
+        self._written = 0
+        self._skipped = 0
+        self._duration_ms = 0
+        self._bytes = 0
+        self._high_water = 0
+
+    @property
+    def next_index(self) -> int:
+        """Đoạn kế tiếp đang chờ để ghi"""
+        return self._next
+
+    def add(self, index1: int, part_path: str) -> int:
+        """Đoạn index1 đã sẵn sàng; trả về số đoạn đã ghi liên tục tính tới hiện tại"""
+        return self._put(index1, part_path)
+
+    def skip(self, index1: int) -> int:
+        """Đoạn index1 lỗi - bỏ qua để các đoạn sau không phải chờ"""
+        return self._put(index1, None)
+
+    def _put(self, index1: int, part_path: Optional[str]) -> int:
+        with self._lock:
+            if self._file is None:
+                if part_path and self.discard_parts:
+                    temp_workspace.discard(part_path)
+                raise RuntimeError("Writer đã đóng")
+            self._ready[index1] = part_path
+            self._high_water = max(self._high_water, len(self._ready))
+            appended = False
+            while self._next in self._ready:
+                path = self._ready.pop(self._next)
+                if path is None:
+                    self._skipped += 1
+                else:
+                    self._append(path)
+                    appended = True
+                self._next += 1
+            if appended:
+                self._file.flush()
+            return self._next - 1
+
+    def _append(self, part_path: str) -> None:
+        try:
+            with segment_store.open(part_path) as f:
+                part = split_frames(f.read())
+        finally:
+            if self.discard_parts:
+                temp_workspace.discard(part_path)
+        if not part.frames:
+            self._skipped += 1
+            return
+        self._fmt = self._fmt or part.fmt
+        if self.gap_ms and self._written:
+            # Khoảng lặng chỉ nằm giữa hai đoạn, không thừa ở cuối file
+            gap = silence_frames(self.gap_ms, self._fmt)
+            self._write(gap.data, gap.duration_ms)
+        self._write(part.data, part.duration_ms)
+        self._written += 1
+
+    def _write(self, data: bytes, duration_ms: int) -> None:
+        self._file.write(data)
+        self._bytes += len(data)
+        self._duration_ms += duration_ms
+
+    def stats(self) -> WriterStats:
+        with self._lock:
+            return WriterStats(self._written, self._skipped, self._duration_ms, self._bytes, self._high_water)
+
+    def close(self) -> WriterStats:
+        """Đóng file; các đoạn về sớm nhưng thiếu đoạn trước (khi bị dừng) được dọn"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            leftovers = [p for p in self._ready.values() if p]
+            self._ready.clear()
+        if self.discard_parts:
+            for path in leftovers:
+                temp_workspace.discard(path)
+        return self.stats()
+
+    def __enter__(self) -> "OrderedMp3Writer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+"""
+Reorder Window - Emit kết quả theo đúng thứ tự với cửa sổ có giới hạn
+- Chỉ được gửi đoạn i khi i < đoạn đầu chưa xong + capacity: kết quả về sớm giữ lại
+  tối đa capacity - 1 đoạn, bộ nhớ không tăng theo số đoạn
+- Cửa sổ đầy thì việc gửi bị chặn (backpressure) thay vì tiếp tục dồn việc mới
+- Đoạn đầu chờ quá hedge_after giây được gửi thêm một lần (hedge), kết quả về trước được dùng
+- Đoạn lỗi (mọi lần thử đều lỗi) được bỏ qua để các đoạn sau không bị kẹt
+- Kết quả không được emit (lần thử thua khi hedge, kết quả còn giữ khi close()) được trả cho on_drop
+  để bên gọi dọn tài nguyên (ví dụ file tạm)
+- Số liệu: độ đầy cửa sổ (hiện tại/đỉnh/trung bình), thời gian bị chặn, số lần hedge
+"""
+
+import threading
+import time
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional, Sequence, Set
+
+from app.core.config import AppConfig
+
+
+class WindowMetrics(NamedTuple):
+    capacity: int
+    occupancy: int  # Số kết quả đang giữ chờ đoạn đầu
+    peak: int
+    mean_occupancy: float
+    emitted: int
+    skipped: int
+    blocked_s: float  # Tổng thời gian việc gửi bị chặn vì cửa sổ đầy
+    hedges: int
+    hedge_wins: int
+    head: int
+    head_wait_s: float  # Đoạn đầu đã chờ bao lâu (0 nếu chưa gửi)
+
+    def describe(self) -> str:
+        text = (f"🪟 Cửa sổ {self.occupancy}/{self.capacity} (đỉnh {self.peak}, TB {self.mean_occupancy:.1f})"
+                f" • chặn {self.blocked_s:.1f}s")
+        if self.hedges:
+            text += f" • hedge {self.hedges} (thắng {self.hedge_wins})"
+        if self.skipped:
+            text += f" • bỏ qua {self.skipped}"
+        return text
+
+
+class ReorderWindow:
+    """
+    Cửa sổ sắp xếp lại (chỉ số từ start, an toàn khi gọi từ nhiều luồng)
+
+    on_emit(index, value) / on_skip(index, error) được gọi lần lượt theo thứ tự chỉ số,
+    từ luồng vừa đưa kết quả vào (không giữ khóa của cửa sổ); on_drop(index, value) nhận
+    các kết quả bị bỏ (không bao giờ được emit)
+    """
+
+    def __init__(self, on_emit: Callable[[int, Any], None],
+                 on_skip: Optional[Callable[[int, str], None]] = None,
+                 capacity: int = AppConfig.REORDER_WINDOW, start: int = 1,
+                 on_drop: Optional[Callable[[int, Any], None]] = None) -> None:
+        self.capacity = max(1, capacity)
+        self.on_emit = on_emit
+        self.on_skip = on_skip
+        self.on_drop = on_drop
+        self._closed = False
+        self._cond = threading.Condition()
+        self._emit_lock = threading.Lock()  # Giữ thứ tự emit giữa các luồng
+        self.head = start
+        self._ready: Dict[int, tuple] = {}  # index -> (ok, value/error)
+        self._attempts: Dict[int, int] = {}  # index -> số lần thử đang chạy
+        self._since: Dict[int, float] = {}  # index -> thời điểm gửi lần đầu
+        self._hedged: Set[int] = set()
+        self._peak = 0
+        self._occupancy_sum = 0
+        self._samples = 0
+        self._emitted = 0
+        self._skipped = 0
+        self._blocked_s = 0.0
+        self._hedges = 0
+        self._hedge_wins = 0
+
+    # ==================== Gửi việc ====================
+
+    def has_slot(self, index: int) -> bool:
+        return index < self.head + self.capacity
+
+    def wait_slot(self, index: int, timeout: Optional[float] = None) -> bool:
+        """Chờ tới khi index nằm trong cửa sổ (backpressure); False nếu hết timeout"""
+        with self._cond:
+            if self.has_slot(index):
+                return True
+            started = time.monotonic()
+            ok = self._cond.wait_for(lambda: self.has_slot(index), timeout)
+            self._blocked_s += time.monotonic() - started
+            return ok
+
+    def add_blocked(self, seconds: float) -> None:
+        """Cộng thời gian bị chặn khi người gửi tự chờ (ví dụ event loop của engine dịch)"""
+        with self._cond:
+            self._blocked_s += seconds
+
+    def wait_head(self, index: int, timeout: Optional[float] = None) -> bool:
+        """Chờ tới khi mọi đoạn <= index đã được emit/bỏ qua"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.head > index, timeout)
+
+    def submitted(self, index: int) -> None:
+        """Ghi nhận đoạn index vừa được gửi (lần thử đầu)"""
+        with self._cond:
+            self._attempts[index] = self._attempts.get(index, 0) + 1
+            self._since.setdefault(index, time.monotonic())
+
+    def hedge_due(self, after_s: float) -> Optional[int]:
+        """Đoạn đầu cần gửi thêm (mỗi đoạn hedge tối đa một lần), đã được tính là một lần thử"""
+        with self._cond:
+            index = self.head
+            since = self._since.get(index)
+            if (since is None or index in self._hedged or index in self._ready
+                    or time.monotonic() - since < after_s):
+                return None
+            self._hedged.add(index)
+            self._attempts[index] = self._attempts.get(index, 0) + 1
+            self._hedges += 1
+            return index
+
+    # ==================== Nhận kết quả ====================
+
+    def put(self, index: int, value: Any, hedge: bool = False) -> bool:
+        """
+        Kết quả của đoạn index; False nếu đoạn đã có kết quả (lần thử khác về trước)
+        hoặc cửa sổ đã đóng - khi đó value được trả cho on_drop
+        """
+        with self._cond:
+            accepted = not self._closed and index >= self.head and index not in self._ready
+            if accepted:
+                self._attempts[index] = self._attempts.get(index, 1) - 1
+                if hedge:
+                    self._hedge_wins += 1
+                self._store(index, (True, value))
+            elif index in self._attempts:
+                self._attempts[index] -= 1
+        if not accepted:
+            if self.on_drop:
+                self.on_drop(index, value)
+            return False
+        self._drain()
+        return True
+
+    def fail(self, index: int, error: str) -> bool:
+        """Một lần thử lỗi; đoạn chỉ bị bỏ qua khi không còn lần thử nào đang chạy"""
+        with self._cond:
+            if self._closed or index < self.head:
+                return False
+            remaining = self._attempts.get(index, 1) - 1
+            self._attempts[index] = remaining
+            if remaining > 0 or index in self._ready:
+                return False
+            self._store(index, (False, error))
+        self._drain()
+        return True
+
+    def close(self) -> None:
+        """Ngừng nhận kết quả (khi bị dừng): kết quả đang giữ và kết quả về sau đi vào on_drop"""
+        with self._cond:
+            self._closed = True
+            held = [(index, value) for index, (ok, value) in self._ready.items() if ok]
+            self._ready.clear()
+            self._cond.notify_all()
+        if self.on_drop:
+            for index, value in held:
+                self.on_drop(index, value)
+
+    def _store(self, index: int, item: tuple) -> None:
+        self._ready[index] = item
+        occupancy = len(self._ready)
+        self._peak = max(self._peak, occupancy)
+        self._occupancy_sum += occupancy
+        self._samples += 1
+
+    def _drain(self) -> None:
+        with self._emit_lock:
+            run = []
+            with self._cond:
+                while self.head in self._ready:
+                    index = self.head
+                    run.append((index, self._ready.pop(index)))
+                    self._attempts.pop(index, None)
+                    self._since.pop(index, None)
+                    self._hedged.discard(index)
+                    self.head += 1
+                if not run:
+                    return
+                self._cond.notify_all()
+            for index, (ok, value) in run:
+                if ok:
+                    self._emitted += 1
+                    self.on_emit(index, value)
+                else:
+                    self._skipped += 1
+                    if self.on_skip:
+                        self.on_skip(index, value)
+
+    # ==================== Số liệu ====================
+
+    def metrics(self) -> WindowMetrics:
+        with self._cond:
+            since = self._since.get(self.head)
+            return WindowMetrics(
+                self.capacity, len(self._ready), self._peak,
+                self._occupancy_sum / self._samples if self._samples else 0.0,
+                self._emitted, self._skipped, self._blocked_s, self._hedges, self._hedge_wins,
+                self.head, time.monotonic() - since if since is not None else 0.0,
+            )
+
+
+class OrderedSubmitter:
+    """
+    Gửi job(index, item) vào executor theo ReorderWindow:
+    chặn khi cửa sổ đầy, hedge đoạn đầu bị kẹt, kết quả/lỗi tự đưa vào cửa sổ
+    """
+
+    def __init__(self, executor: Executor, window: ReorderWindow,
+                 job: Callable[[int, Any], Any], items: Sequence[Any],
+                 should_stop: Callable[[], bool] = lambda: False,
+                 hedge_after: Optional[float] = AppConfig.REORDER_HEDGE_AFTER_S,
+                 on_hedge: Optional[Callable[[int], None]] = None,
+                 poll_s: float = 0.2) -> None:
+        self.executor = executor
+        self.window = window
+        self.job = job
+        self.items = items  # items[index - 1]
+        self.should_stop = should_stop
+        self.hedge_after = hedge_after
+        self.on_hedge = on_hedge
+        self.poll_s = poll_s
+
+    def _submit(self, index: int, hedge: bool) -> None:
+        future = self.executor.submit(self.job, index, self.items[index - 1])
+        future.add_done_callback(lambda f: self._done(index, hedge, f))
+
+    def _done(self, index: int, hedge: bool, future: Future) -> None:
+        try:
+            value = future.result()
+        except BaseException as e:  # Gồm cả CancelledError khi dừng
+            self.window.fail(index, str(e) or e.__class__.__name__)
+            return
+        self.window.put(index, value, hedge)
+
+    def maybe_hedge(self) -> None:
+        """Gửi thêm đoạn đầu nếu bị kẹt quá hedge_after (cho bên gửi tự chạy vòng lặp chờ)"""
+        if not self.hedge_after or self.should_stop():
+            return
+        index = self.window.hedge_due(self.hedge_after)
+        if index is not None:
+            if self.on_hedge:
+                self.on_hedge(index)
+            self._submit(index, True)
+
+    def submit(self, indices: Iterable[int]) -> bool:
+        """Gửi lần lượt các đoạn; False nếu bị dừng giữa chừng"""
+        for index in indices:
+            while not self.window.wait_slot(index, self.poll_s):
+                if self.should_stop():
+                    return False
+                self.maybe_hedge()
+            if self.should_stop():
+                return False
+            self.window.submitted(index)
+            self._submit(index, False)
+        return True
+
+    def wait(self, last_index: int) -> bool:
+        """Chờ tới khi mọi đoạn <= last_index đã emit/bỏ qua (vẫn hedge nếu kẹt)"""
+        while not self.window.wait_head(last_index, self.poll_s):
+            if self.should_stop():
+                return False
+            self.maybe_hedge()
+        return True
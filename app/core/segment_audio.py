@@ -3,11 +3,12 @@ from __future__ import annotations
 
 from typing import Tuple, List, Optional
 import os
-import shutil
-
-from pydub import AudioSegment  # type: ignore
 
+from app.utils.lazy_import import lazy_import
 from app.utils.audio_helpers import prepare_pydub_ffmpeg, get_mp3_duration_ms
+from app.core.segment_store import segment_store, KIND_GAP
+
+pydub = lazy_import("pydub")
 
 
 class SegmentAudio:
@@ -43,13 +44,13 @@ class SegmentAudio:
 		exported = 0
 		for idx, src in enumerate(paths, start=1):
 			try:
-				if not os.path.exists(src):
+				if not segment_store.exists(src):
 					continue
 				base = os.path.basename(src)
 				name, ext = os.path.splitext(base)
 				dst_name = f"{idx:0{width}d}_{name}{ext}"
 				dst_path = os.path.join(dest_folder, dst_name)
-				shutil.copy2(src, dst_path)
+				segment_store.copy_to(src, dst_path)
 				exported += 1
 			except Exception:
 				continue
@@ -65,17 +66,17 @@ class SegmentAudio:
 		if not parts:
 			return None, None, 0
 		prepare_pydub_ffmpeg()
-		final = AudioSegment.silent(duration=0)
+		final = pydub.AudioSegment.silent(duration=0)
 		merged = 0
 		for i, p in enumerate(parts):
 			try:
-				seg = AudioSegment.from_file(p)
+				seg = segment_store.load_audio(p)
 				final += seg
 				# optional gap between segments (skip after last)
 				if gap_ms and i < len(parts) - 1:
 					next_path = parts[i + 1] if i + 1 < len(parts) else None
-					if not (next_path and 'gap_' in next_path):
-						final += AudioSegment.silent(duration=gap_ms)
+					if segment_store.kind(next_path) != KIND_GAP:
+						final += pydub.AudioSegment.silent(duration=gap_ms)
 				merged += 1
 			except Exception:
 				continue
@@ -9,14 +9,14 @@ from PySide6.QtCore import QObject, Signal, Qt, QTimer
 from typing import List, Optional, Tuple
 import os
 from pathlib import Path
-import tempfile
-from datetime import datetime
 
-from app.core.config import AppConfig
 from app.utils.audio_helpers import ms_to_mmss, get_mp3_duration_ms
-from app.utils.helps import hide_directory_on_windows
-from pydub import AudioSegment  # type: ignore
-import uuid
+from app.core.temp_workspace import temp_workspace
+from app.core.segment_store import segment_store, KIND_GAP, KIND_MERGED, KIND_SPLIT, KIND_VIDEO
+from app.utils.lazy_import import lazy_import
+
+pydub = lazy_import("pydub")
+
 
 class ListRow(QWidget):
 	"""Custom row widget với 3 cột sử dụng QGridLayout"""
@@ -107,6 +107,8 @@ class SegmentManager(QObject):
 		self.audio_player = None
 		# Debounce timer for display updates to avoid UI freeze when many segments update rapidly
 		self._update_timer: Optional[QTimer] = None
+		# File tạm đang giữ tham chiếu trong temp_workspace (không bị dọn khi còn trong danh sách)
+		self._held_paths: set = set()
 		
 	def set_ui_components(self, list_widget: QListWidget, audio_player, enable_context_menu: bool = True) -> None:
 		"""Set UI components từ TTS/SRT Tab"""
@@ -250,7 +252,7 @@ class SegmentManager(QObject):
 				if 0 <= idx < len(self.segment_paths):
 					p = self.segment_paths[idx]
 					d = self.segment_durations[idx]
-					if p and os.path.exists(p) and d and d > 0:
+					if p and segment_store.exists(p) and d and d > 0:
 						merge_paths.append(p)
 						total_duration_ms += d
 					else:
@@ -262,26 +264,13 @@ class SegmentManager(QObject):
 				return
 			
 			# Tạo audio gộp bằng pydub
-			final_audio = AudioSegment.silent(duration=0)
+			final_audio = pydub.AudioSegment.silent(duration=0)
 			for p in merge_paths:
-				seg = AudioSegment.from_file(p)
+				seg = segment_store.load_audio(p)
 				final_audio += seg
 			
-			# Tạo file tạm cho kết quả gộp
-			temp_dir = Path(tempfile.mkdtemp(prefix=AppConfig.TEMP_PREFIX))
-			temp_dir.mkdir(parents=True, exist_ok=True)
-			hide_directory_on_windows(temp_dir)
-
-			# tạo thư mục con với UUID
-			temp_dir = temp_dir / str(uuid.uuid4())
-			temp_dir.mkdir(parents=True, exist_ok=True)
-			hide_directory_on_windows(temp_dir)
-			# timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-
-			merged_path = str(temp_dir / f"merged-{uuid.uuid4()}.mp3")
-			final_audio.export(merged_path, format="mp3")
-			
-			# Lấy thời lượng chính xác sau khi export
+			# Lưu kết quả gộp (trong bộ nhớ nếu còn ngân sách)
+			merged_path = segment_store.put_audio(final_audio, tag=KIND_MERGED, hold=True)
 			merged_duration = get_mp3_duration_ms(merged_path) or total_duration_ms
 			
 			# Cập nhật danh sách:
@@ -426,7 +415,7 @@ class SegmentManager(QObject):
 				return False
 				
 			path = self.segment_paths[index]
-			if not path or not os.path.exists(path):
+			if not segment_store.exists(path):
 				return False
 				
 			# Nếu không có export_path, tạo tên file mặc định
@@ -436,8 +425,7 @@ class SegmentManager(QObject):
 				export_path = f"exported_{base_name}.mp3"
 				
 			# Copy file
-			import shutil
-			shutil.copy2(path, export_path)
+			segment_store.copy_to(path, export_path)
 			
 			return True
 			
@@ -499,21 +487,9 @@ class SegmentManager(QObject):
 		try:
 			duration_ms = 3000  # Fixed 3 seconds
 			
-			# Create silent audio segment for video
-			temp_dir = Path(tempfile.mkdtemp(prefix=AppConfig.TEMP_PREFIX))
-			temp_dir.mkdir(parents=True, exist_ok=True)
-			hide_directory_on_windows(temp_dir)
-			# tạo thư mục con với UUID
-			temp_dir = temp_dir / str(uuid.uuid4())
-			temp_dir.mkdir(parents=True, exist_ok=True)
-			hide_directory_on_windows(temp_dir)
-			
-			# timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-			video_audio_path = str(temp_dir / f"{uuid.uuid4()}.mp3")
-			
 			# Create silent audio for video (3 seconds)
-			video_audio = AudioSegment.silent(duration=duration_ms)
-			video_audio.export(video_audio_path, format="mp3")
+			video_audio = pydub.AudioSegment.silent(duration=duration_ms)
+			video_audio_path = segment_store.put_audio(video_audio, tag=KIND_VIDEO, hold=True)
 			
 			self.add_segment(video_audio_path, duration_ms)
 			return True
@@ -526,23 +502,10 @@ class SegmentManager(QObject):
 		"""Thêm khoảng nghỉ (gap) vào segments"""
 		try:
 			# Create silent gap with specified duration
-			gap = AudioSegment.silent(duration=duration_ms)
-			
-			# Create temporary file for gap
-			temp_dir = Path(tempfile.mkdtemp(prefix=AppConfig.TEMP_PREFIX))
-			temp_dir.mkdir(parents=True, exist_ok=True)
-			hide_directory_on_windows(temp_dir)
-
-			# tạo thư mục con với UUID
-			temp_dir = temp_dir / str(uuid.uuid4())
-			temp_dir.mkdir(parents=True, exist_ok=True)
-			hide_directory_on_windows(temp_dir)
+			gap = pydub.AudioSegment.silent(duration=duration_ms)
 			
-			# timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-			gap_path = str(temp_dir / f"gap-{uuid.uuid4()}.mp3")
-			
-			# Export gap
-			gap.export(gap_path, format="mp3")
+			# Lưu gap (trong bộ nhớ nếu còn ngân sách)
+			gap_path = segment_store.put_audio(gap, tag=KIND_GAP, hold=True)
 			
 			# Insert gap at specified position
 			if break_position == "trước":
@@ -639,14 +602,15 @@ class SegmentManager(QObject):
 				
 				
 				# Xác định loại segment
+				kind = segment_store.kind(path)
 				segment_type = "Audio"
-				if "gap-" in path:
+				if kind == KIND_GAP:
 					segment_type = "Khoảng nghỉ"
-				elif "split-" in path or "part2_" in path:
+				elif kind == KIND_SPLIT:
 					segment_type = "Phần được chia"
-				elif "merged" in path:
+				elif kind == KIND_MERGED:
 					segment_type = "Gộp Video"
-				elif "video_audio_" in path:
+				elif kind == KIND_VIDEO:
 					segment_type = "Video placeholder"
 				
 				# Format thời gian
@@ -668,9 +632,9 @@ class SegmentManager(QObject):
 					'cumulative_formatted': cumulative_formatted,
 					'file_size': file_size,
 					'segment_type': segment_type,
-					'is_gap': 'gap_' in path,
-					'is_part': 'part1_' in path or 'part2_' in path,
-					'is_video': 'video_audio_' in path,
+					'is_gap': kind == KIND_GAP,
+					'is_part': kind == KIND_SPLIT,
+					'is_video': kind == KIND_VIDEO,
 					'full_path': os.path.abspath(path) if path else None
 				}
 		return None
@@ -678,8 +642,9 @@ class SegmentManager(QObject):
 	def get_segments_statistics(self) -> dict:
 		"""Lấy thống kê về segments"""
 		total_segments = len([d for d in self.segment_durations if d])
-		gap_count = sum(1 for p in self.segment_paths if p and "gap_" in p)
-		broken_count = sum(1 for p in self.segment_paths if p and ("part1_" in p or "part2_" in p))
+		kinds = [segment_store.kind(p) for p in self.segment_paths if p]
+		gap_count = kinds.count(KIND_GAP)
+		broken_count = kinds.count(KIND_SPLIT)
 		tts_count = total_segments - gap_count - broken_count
 		
 		return {
@@ -694,8 +659,23 @@ class SegmentManager(QObject):
 		"""Cập nhật tổng thời lượng"""
 		self.total_known_ms = sum(d or 0 for d in self.segment_durations)
 		
+	def _sync_workspace_refs(self) -> None:
+		"""
+		Đồng bộ tham chiếu file tạm với danh sách segment hiện tại:
+		giữ file mới xuất hiện, trả file đã bị xóa/thay thế cho temp_workspace
+		"""
+		current = {p for p in self.segment_paths if p}
+		if current == self._held_paths:
+			return
+		for path in self._held_paths - current:
+			temp_workspace.release(path)
+		for path in current - self._held_paths:
+			temp_workspace.acquire(path)
+		self._held_paths = current
+
 	def _update_display(self) -> None:
 		"""Cập nhật hiển thị segments với custom row widget"""
+		self._sync_workspace_refs()
 		if not self.list_widget:
 			return
 			
@@ -744,7 +724,7 @@ class SegmentManager(QObject):
 								  cumulative_ms: int, total_ms: int, file_path: str) -> QWidget:
 		"""Tạo custom row widget cho segment với 3 cột"""
 		# Format text cho 3 cột
-		left_text = self._format_segment_name(index, filename, duration_ms)
+		left_text = self._format_segment_name(index, file_path, duration_ms)
 		# Hiển thị thời gian theo dạng: start->end/total với định dạng m:ss
 		start_ms = max(0, (cumulative_ms or 0) - (duration_ms or 0))
 		end_ms = cumulative_ms or 0
@@ -764,16 +744,17 @@ class SegmentManager(QObject):
 		# Tạo ListRow widget
 		return ListRow(left_text, center_text, right_text)
 		
-	def _format_segment_name(self, index: int, filename: str, duration_ms: int) -> str:
-		"""Format tên segment cho cột đầu tiên"""
+	def _format_segment_name(self, index: int, file_path: str, duration_ms: int) -> str:
+		"""Format tên segment cho cột đầu tiên (loại segment lấy từ segment_store)"""
 		# Xử lý các trường hợp đặc biệt
 		segment_time = ms_to_mmss(duration_ms)
-		if filename.startswith("gap-"):
+		kind = segment_store.kind(file_path)
+		if kind == KIND_GAP:
 			# Khoảng nghỉ
 			return f"{index:03d}. [KHOẢNG NGHỈ] — {segment_time}"
-		elif "split-1" in filename or "split-2" in filename:
+		elif kind == KIND_SPLIT:
 			return f"{index:03d}. part_{index:04d}[split] — {segment_time}"
-		elif "merged" in filename:
+		elif kind == KIND_MERGED:
 			return f"{index:03d}. part_{index:04d}[merged] — {segment_time}"
 		else:
 			return f"{index:03d}. part_{index:04d} — {segment_time}"
@@ -791,8 +772,8 @@ class SegmentManager(QObject):
 	def _get_file_size(self, file_path: str) -> str:
 		"""Lấy kích thước file và format thành KB/MB"""
 		try:
-			if file_path and os.path.exists(file_path):
-				size_bytes = os.path.getsize(file_path)
+			if segment_store.exists(file_path):
+				size_bytes = segment_store.size(file_path)
 				
 				# Format kích thước
 				if size_bytes < 1024:
@@ -812,31 +793,20 @@ class SegmentManager(QObject):
 		"""Cắt audio file thành 2 phần"""
 		try:
 			# Load audio
-			audio = AudioSegment.from_file(audio_path)
+			audio = segment_store.load_audio(audio_path)
 			
 			# Split audio
 			part1 = audio[:split_position_ms]
 			part2 = audio[split_position_ms:]
 			
-			# Create temporary files
-			temp_dir = Path(tempfile.mkdtemp(prefix=AppConfig.TEMP_PREFIX))
-			temp_dir.mkdir(parents=True, exist_ok=True)
-			hide_directory_on_windows(temp_dir)
-
-			# tạo thư mục con với UUID
-			temp_dir = temp_dir / str(uuid.uuid4())
-			temp_dir.mkdir(parents=True, exist_ok=True)
-			hide_directory_on_windows(temp_dir)
-			
-			timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-			base_name = os.path.splitext(os.path.basename(audio_path))[0]
-			
-			part1_path = str(temp_dir / f"split-1-{uuid.uuid4()}.mp3")
-			part2_path = str(temp_dir / f"split-2-{uuid.uuid4()}.mp3")
-			
-			# Export parts
-			part1.export(part1_path, format="mp3")
-			part2.export(part2_path, format="mp3")
+			# Lưu 2 phần (trong bộ nhớ nếu còn ngân sách); giữ cho tới khi
+			# _sync_workspace_refs acquire, tránh bị quota dọn trước
+			part1_path = segment_store.put_audio(part1, tag=KIND_SPLIT, hold=True)
+			try:
+				part2_path = segment_store.put_audio(part2, tag=KIND_SPLIT, hold=True)
+			except Exception:
+				temp_workspace.discard(part1_path)
+				raise
 			
 			return part1_path, part2_path
 			
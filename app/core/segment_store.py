@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+Segment Store - Lưu audio segment trong bộ nhớ, ghi ra đĩa khi vượt ngân sách
+- Đoạn TTS ngắn, khoảng nghỉ (gap), phần cắt... được giữ dạng bytes trong RAM
+- Tổng dung lượng trong RAM giới hạn bởi AppConfig.SEGMENT_MEMORY_MB; vượt quá thì
+  đoạn ít dùng nhất (LRU) được ghi ra file trong temp_workspace
+- Mỗi segment vẫn được định danh bằng một đường dẫn trong workspace, nên
+  SegmentManager, lịch sử... không phải đổi; nơi nào cần file thật thì gọi materialize()
+- AudioPlayer phát trực tiếp từ bộ nhớ qua QBuffer (xem memory_view)
+"""
+
+import io
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from typing import BinaryIO, Dict, List, Optional, Set, Tuple
+
+from app.core.config import AppConfig
+from app.core.temp_workspace import TempWorkspace, temp_workspace
+from app.utils.lazy_import import lazy_import
+
+pydub = lazy_import("pydub")
+
+# Loại segment = tag lúc tạo; dùng kind() để phân loại thay vì dò tên file
+KIND_GAP = "gap"
+KIND_SPLIT = "split"
+KIND_MERGED = "merged"
+KIND_VIDEO = "video"
+
+
+class SegmentStore:
+    """Kho audio segment: RAM trước, đĩa khi vượt ngân sách"""
+
+    def __init__(self, workspace: TempWorkspace = temp_workspace,
+                 budget_bytes: int = AppConfig.SEGMENT_MEMORY_MB * 1024 * 1024,
+                 inline_max_bytes: int = AppConfig.SEGMENT_INLINE_MAX_KB * 1024) -> None:
+        self.workspace = workspace
+        self.budget_bytes = budget_bytes
+        self.inline_max_bytes = inline_max_bytes
+        self._blobs: "OrderedDict[str, bytes]" = OrderedDict()  # thứ tự LRU
+        self._durations: Dict[str, int] = {}
+        self._kinds: Dict[str, str] = {}  # path -> tag lúc tạo
+        self._memory = 0
+        self._spilling: Set[str] = set()  # đang ghi ra đĩa ngoài khóa
+        self._spill_pending = 0
+        self._lock = threading.RLock()
+        workspace.add_remove_listener(self._forget)
+
+    # ==================== Ghi ====================
+
+    def put(self, data: bytes, suffix: str = ".mp3", tag: str = "seg",
+            duration_ms: Optional[int] = None, hold: bool = False) -> str:
+        """
+        Lưu audio đã mã hoá, trả về đường dẫn định danh segment.
+        hold=True: segment được giữ cho tới khi bên nhận acquire() hoặc discard()
+        (kết quả worker chưa kịp tới SegmentManager không bị quota/cleanup dọn mất)
+        """
+        path = str(self.workspace.new_file(suffix, tag=tag, handoff=hold))
+        size = len(data)
+        with self._lock:
+            self._kinds[path] = tag
+            if duration_ms is not None:
+                self._durations[path] = int(duration_ms)
+            if size <= self.inline_max_bytes and size <= self.budget_bytes:
+                self._blobs[path] = bytes(data)
+                self._memory += size
+                victims = self._pick_spill()
+            else:
+                victims = None
+        if victims is None:
+            self._write(path, data)
+            self.workspace.account(path)
+            return path
+        self._spill(victims)
+        return path
+
+    def put_audio(self, segment, tag: str = "seg", fmt: str = "mp3", hold: bool = False) -> str:
+        """Mã hoá pydub.AudioSegment vào bộ nhớ rồi lưu như put()"""
+        buf = io.BytesIO()
+        segment.export(buf, format=fmt)
+        return self.put(buf.getvalue(), f".{fmt}", tag=tag, duration_ms=len(segment), hold=hold)
+
+    @staticmethod
+    def _write(path: str, data: bytes) -> None:
+        with open(path, "wb") as f:
+            f.write(data)
+
+    # ==================== Đọc ====================
+
+    def kind(self, path: Optional[str]) -> str:
+        """Loại segment (tag truyền vào put), "" nếu không phải segment của store"""
+        return self._kinds.get(path, "") if path else ""
+
+    def in_memory(self, path: str) -> bool:
+        return path in self._blobs
+
+    def exists(self, path: Optional[str]) -> bool:
+        """Segment còn dữ liệu (trong RAM hoặc trên đĩa)"""
+        if not path:
+            return False
+        return path in self._blobs or os.path.isfile(path)
+
+    def size(self, path: str) -> int:
+        """Kích thước dữ liệu đã mã hoá (bytes)"""
+        data = self._blobs.get(path)
+        if data is not None:
+            return len(data)
+        return os.path.getsize(path)
+
+    def memory_view(self, path: str) -> Optional[memoryview]:
+        """Dữ liệu trong RAM (không sao chép), None nếu segment nằm trên đĩa"""
+        with self._lock:
+            data = self._blobs.get(path)
+            if data is None:
+                return None
+            self._blobs.move_to_end(path)
+            return memoryview(data)
+
+    def open(self, path: str) -> BinaryIO:
+        """Mở segment để đọc (BytesIO nếu trong RAM)"""
+        view = self.memory_view(path)
+        if view is not None:
+            return io.BytesIO(view)
+        return open(path, "rb")
+
+    def load_audio(self, path: str):
+        """Giải mã segment thành pydub.AudioSegment"""
+        view = self.memory_view(path)
+        if view is None:
+            return pydub.AudioSegment.from_file(path)
+        fmt = os.path.splitext(path)[1].lstrip(".") or None
+        return pydub.AudioSegment.from_file(io.BytesIO(view), format=fmt)
+
+    def duration_ms(self, path: str) -> int:
+        """Thời lượng segment (nhớ sẵn khi biết lúc ghi), 0 nếu lỗi"""
+        cached = self._durations.get(path)
+        if cached is not None:
+            return cached
+        try:
+            seg = self.load_audio(path)
+        except Exception:
+            return 0
+        duration = int(seg.duration_seconds * 1000)
+        if path in self._blobs:
+            self._durations[path] = duration
+        return duration
+
+    # ==================== Ghi ra đĩa ====================
+
+    def materialize(self, path: str) -> str:
+        """Bảo đảm segment có file thật trên đĩa (cho ffmpeg, copy...) và trả về đường dẫn"""
+        with self._lock:
+            data = self._blobs.get(path)
+        if data is None:
+            return path
+        self._write(path, data)
+        with self._lock:
+            if self._blobs.get(path) is data:
+                del self._blobs[path]
+                self._memory -= len(data)
+        self.workspace.account(path)
+        return path
+
+    def copy_to(self, path: str, dst: str) -> None:
+        """Sao chép segment ra file đích"""
+        view = self.memory_view(path)
+        if view is None:
+            shutil.copy2(path, dst)
+        else:
+            self._write(dst, view)
+
+    def _pick_spill(self) -> List[Tuple[str, bytes]]:
+        """(Giữ khóa) Chọn các segment ít dùng nhất cần ghi ra đĩa để RAM về dưới ngân sách"""
+        excess = self._memory - self._spill_pending - self.budget_bytes
+        victims = []
+        for path, data in self._blobs.items():
+            if excess <= 0:
+                break
+            if path in self._spilling:
+                continue
+            self._spilling.add(path)
+            self._spill_pending += len(data)
+            excess -= len(data)
+            victims.append((path, data))
+        return victims
+
+    def _spill(self, victims: List[Tuple[str, bytes]]) -> None:
+        """
+        Ghi segment ra đĩa ngoài khóa (memory_view/open không phải chờ I/O).
+        Blob chỉ rời RAM khi file đã ghi xong; ghi lỗi thì giữ nguyên trong RAM và dừng.
+        """
+        for i, (path, data) in enumerate(victims):
+            try:
+                self._write(path, data)
+            except OSError:
+                with self._lock:
+                    for rest_path, rest_data in victims[i:]:
+                        self._spilling.discard(rest_path)
+                        self._spill_pending -= len(rest_data)
+                return
+            with self._lock:
+                self._spilling.discard(path)
+                self._spill_pending -= len(data)
+                if self._blobs.get(path) is data:
+                    del self._blobs[path]
+                    self._memory -= len(data)
+            # Ghi nhận dung lượng ngoài khóa (workspace gọi ngược _forget khi dọn)
+            if self.workspace.owns(path):
+                self.workspace.account(path)
+            else:
+                # Artifact đã bị dọn trong lúc đang ghi -> không để lại file mồ côi
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    # ==================== Dọn dẹp ====================
+
+    def _forget(self, path: str) -> None:
+        """temp_workspace đã xóa artifact -> bỏ dữ liệu trong RAM"""
+        with self._lock:
+            data = self._blobs.pop(path, None)
+            if data is not None:
+                self._memory -= len(data)
+            self._durations.pop(path, None)
+            self._kinds.pop(path, None)
+
+    def memory_bytes(self) -> int:
+        return self._memory
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "in_memory": len(self._blobs),
+                "memory_bytes": self._memory,
+                "budget_bytes": self.budget_bytes,
+            }
+
+
+# Instance dùng chung cho cả ứng dụng
+segment_store = SegmentStore()
@@ -7,6 +7,7 @@ from PySide6.QtCore import QObject, Signal
 
 from app.core.audio_player import AudioPlayer
 from app.core.segment_manager import SegmentManager
+from app.core.subtitle_engine import CueList, CueIndex
 from app.workers.TTS_workers import MTProducerWorker
 
 
@@ -24,6 +25,8 @@ class SRTPlaybackController(QObject):
     status_signal = Signal(str)
     playback_finished = Signal()
     segments_changed = Signal()
+    # Cue (dòng phụ đề) đang phát thay đổi, -1 khi không có cue nào
+    cue_changed = Signal(int)
 
     def __init__(
         self,
@@ -42,8 +45,13 @@ class SRTPlaybackController(QObject):
         self.segment_manager = SegmentManager()
         self.worker: Optional[MTProducerWorker] = None
 
+        # Chỉ mục thời gian của phụ đề để đồng bộ vị trí phát với dòng cue
+        self.cue_index = CueIndex()
+        self._cues: Optional[CueList] = None
+        self._current_cue = -1
+
         # Kết nối player → controller
-        self.audio_player.position_changed.connect(self.position_changed.emit)
+        self.audio_player.position_changed.connect(self._on_position_changed)
         self.audio_player.segment_changed.connect(self._on_segment_changed)
         self.audio_player.playback_state_changed.connect(self.playback_state_changed.emit)
         self.audio_player.status_signal.connect(self.status_signal.emit)
@@ -104,6 +112,21 @@ class SRTPlaybackController(QObject):
     def seek_to(self, position_ms: int) -> None:
         self.audio_player.seek_to(max(0, int(position_ms)))
 
+    def set_cues(self, cues: Optional[CueList]) -> None:
+        """Gắn danh sách cue (dựng lại chỉ mục; gọi lại khi thời gian cue bị sửa)"""
+        self._cues = cues
+        self.cue_index = CueIndex(cues) if cues is not None else CueIndex()
+        self._current_cue = -1
+
+    def cue_at(self, position_ms: int) -> int:
+        """Dòng cue tại vị trí phát (O(log n)), -1 nếu nằm giữa các cue"""
+        return self.cue_index.find(position_ms)
+
+    def seek_to_cue(self, row: int) -> None:
+        """Tua tới thời điểm bắt đầu của cue"""
+        if self._cues is not None and 0 <= row < len(self._cues):
+            self.seek_to(self._cues.starts[row])
+
     def start_tts(
         self,
         text: str,
@@ -189,6 +212,16 @@ class SRTPlaybackController(QObject):
     def _on_segments_changed(self) -> None:
         self._sync_player_segments()
 
+    def _on_position_changed(self, position_ms: int) -> None:
+        self.position_changed.emit(position_ms)
+        if not len(self.cue_index):
+            return
+        # Chỉ báo khi sang cue khác; giữa 2 cue thì giữ nguyên dòng đang chọn
+        row = self.cue_index.find(position_ms)
+        if row >= 0 and row != self._current_cue:
+            self._current_cue = row
+            self.cue_changed.emit(row)
+
     def _on_segment_changed(self, idx: int) -> None:
         # Relay và đồng bộ list selection nếu có
         self.segment_changed.emit(idx)
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+Subtitle Engine - Đọc/ghi phụ đề SRT và WebVTT
+Phân tích trong một lượt duyệt từng dòng (streaming), chịu được BOM, CRLF,
+số thứ tự bị nhảy/thiếu. Thời gian lưu dạng int (ms) trong mảng gọn (array).
+"""
+
+import heapq
+import re
+from array import array
+from bisect import bisect_right
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+
+# "00:01:02,345 --> 00:01:04,000" (SRT) hoặc "01:02.345 --> 01:04.000 align:start" (VTT)
+_TIMING_RE = re.compile(
+    r"(?:(\d+):)?(\d{1,2}):(\d{1,2})[,.](\d{1,3})\s*-->\s*"
+    r"(?:(\d+):)?(\d{1,2}):(\d{1,2})[,.](\d{1,3})"
+)
+
+# Các block VTT không phải cue
+_VTT_SKIP_BLOCKS = ("NOTE", "STYLE", "REGION")
+
+FORMAT_SRT = "srt"
+FORMAT_VTT = "vtt"
+
+
+class Cue(NamedTuple):
+    """Một cue phụ đề"""
+    start_ms: int
+    end_ms: int
+    text: str
+
+
+def _to_ms(h: Optional[str], m: str, s: str, frac: str) -> int:
+    # Phần lẻ "5" = 500ms, "05" = 50ms, "005" = 5ms
+    return ((int(h or 0) * 60 + int(m)) * 60 + int(s)) * 1000 + int(frac.ljust(3, "0"))
+
+
+def parse_timestamp(value: str) -> int:
+    """Chuyển "HH:MM:SS,mmm" / "MM:SS.mmm" sang ms"""
+    m = re.fullmatch(r"\s*(?:(\d+):)?(\d{1,2}):(\d{1,2})[,.](\d{1,3})\s*", value)
+    if not m:
+        raise ValueError(f"Thời gian không hợp lệ: {value!r}")
+    return _to_ms(*m.groups())
+
+
+def format_timestamp(ms: int, fmt: str = FORMAT_SRT) -> str:
+    """Chuyển ms sang "HH:MM:SS,mmm" (SRT) hoặc "HH:MM:SS.mmm" (VTT)"""
+    ms = max(0, int(ms))
+    s, milli = divmod(ms, 1000)
+    m, s = divmod(s, 60)
+    h, m = divmod(m, 60)
+    sep = "," if fmt == FORMAT_SRT else "."
+    return f"{h:02d}:{m:02d}:{s:02d}{sep}{milli:03d}"
+
+
+def parse_timing_line(line: str) -> Optional[Tuple[int, int]]:
+    """Trả về (start_ms, end_ms) nếu là dòng thời gian, ngược lại None"""
+    if "-->" not in line:
+        return None
+    m = _TIMING_RE.search(line)
+    if not m:
+        return None
+    g = m.groups()
+    return _to_ms(*g[:4]), _to_ms(*g[4:])
+
+
+class CueList:
+    """
+    Danh sách cue lưu dạng cột: starts/ends là array('q') (ms), texts là list[str].
+    Truy cập theo index trả về Cue; có thể sửa text (ví dụ bản dịch) theo chỉ số.
+    """
+
+    __slots__ = ("starts", "ends", "texts", "format")
+
+    def __init__(self, fmt: str = FORMAT_SRT) -> None:
+        self.starts = array("q")
+        self.ends = array("q")
+        self.texts: List[str] = []
+        self.format = fmt
+
+    def append(self, start_ms: int, end_ms: int, text: str) -> None:
+        self.starts.append(start_ms)
+        self.ends.append(end_ms)
+        self.texts.append(text)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __getitem__(self, i: int) -> Cue:
+        return Cue(self.starts[i], self.ends[i], self.texts[i])
+
+    def __iter__(self) -> Iterator[Cue]:
+        return map(Cue, self.starts, self.ends, self.texts)
+
+    def duration_ms(self) -> int:
+        """Thời điểm kết thúc lớn nhất"""
+        return max(self.ends) if self.ends else 0
+
+    def timestamp(self, i: int, fmt: Optional[str] = None) -> str:
+        """Chuỗi thời gian dạng "start --> end" cho cue thứ i"""
+        fmt = fmt or FORMAT_SRT
+        return f"{format_timestamp(self.starts[i], fmt)} --> {format_timestamp(self.ends[i], fmt)}"
+
+    def to_srt(self, texts: Optional[List[str]] = None) -> str:
+        """Xuất SRT; texts (nếu có) thay cho nội dung gốc theo từng index"""
+        return "".join(iter_srt_blocks(self, texts))
+
+    def to_vtt(self, texts: Optional[List[str]] = None) -> str:
+        """Xuất WebVTT"""
+        return "".join(iter_vtt_blocks(self, texts))
+
+
+class CueIndex:
+    """
+    Chỉ mục khoảng thời gian của CueList để tra cue theo vị trí phát (ms).
+    Các mốc start/end chia trục thời gian thành các khoảng mà tập cue đang hiện không đổi;
+    cue hiển thị của từng khoảng được tính sẵn khi dựng (quét một lượt, O(n log n)),
+    nên find() chỉ cần một lần bisect O(log n), kể cả khi cue chồng lấn hoặc không theo thứ tự.
+    """
+
+    __slots__ = ("_order", "_starts", "_breaks", "_active")
+
+    def __init__(self, cues: Optional[CueList] = None) -> None:
+        self._order = array("q")
+        self._starts = array("q")
+        self._breaks = array("q")
+        self._active = array("q")
+        if cues is not None:
+            self.rebuild(cues)
+
+    def rebuild(self, cues: CueList) -> None:
+        """Dựng lại chỉ mục (gọi khi nạp cue mới hoặc sửa thời gian)"""
+        starts, ends = cues.starts, cues.ends
+        order = sorted(range(len(starts)), key=starts.__getitem__)
+        self._order = array("q", order)
+        self._starts = array("q", (starts[i] for i in order))
+        self._breaks = array("q", sorted(set(starts) | set(ends)))
+        self._active = array("q")
+        # Quét các mốc: heap các cue đã bắt đầu, ưu tiên cue đứng sau trong thứ tự start
+        # (bắt đầu muộn nhất); cue đã kết thúc được bỏ khi nổi lên đỉnh
+        heap: List[int] = []
+        pos = 0
+        for ms in self._breaks:
+            while pos < len(order) and self._starts[pos] <= ms:
+                heapq.heappush(heap, -pos)
+                pos += 1
+            while heap and ends[order[-heap[0]]] <= ms:
+                heapq.heappop(heap)
+            self._active.append(order[-heap[0]] if heap else -1)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def find(self, ms: int) -> int:
+        """Chỉ số cue đang hiển thị tại ms (cue bắt đầu muộn nhất nếu chồng lấn), -1 nếu không có"""
+        k = bisect_right(self._breaks, ms) - 1
+        return self._active[k] if k >= 0 else -1
+
+    def find_last_started(self, ms: int) -> int:
+        """Chỉ số cue bắt đầu gần nhất trước hoặc tại ms, -1 nếu chưa có cue nào bắt đầu"""
+        pos = bisect_right(self._starts, ms) - 1
+        return self._order[pos] if pos >= 0 else -1
+
+
+def iter_srt_blocks(cues: CueList, texts: Optional[List[str]] = None) -> Iterator[str]:
+    """Sinh từng block SRT (đánh số lại liên tục từ 1)"""
+    texts = texts if texts is not None else cues.texts
+    for i in range(len(cues)):
+        yield f"{i + 1}\n{cues.timestamp(i, FORMAT_SRT)}\n{texts[i]}\n\n"
+
+
+def iter_vtt_blocks(cues: CueList, texts: Optional[List[str]] = None) -> Iterator[str]:
+    """Sinh header và từng cue WebVTT"""
+    texts = texts if texts is not None else cues.texts
+    yield "WEBVTT\n\n"
+    for i in range(len(cues)):
+        yield f"{cues.timestamp(i, FORMAT_VTT)}\n{texts[i]}\n\n"
+
+
+def iter_cues(lines: Iterable[str]) -> Iterator[Cue]:
+    """
+    Phân tích SRT/VTT theo từng dòng (không cần đọc hết file vào bộ nhớ).
+    Bỏ qua số thứ tự / cue id, header WEBVTT và các block NOTE/STYLE/REGION.
+    """
+    start = end = None
+    text_lines: List[str] = []
+    skipping = False
+    first = True
+
+    for raw in lines:
+        line = raw.rstrip("\r\n")
+        if first:
+            line = line.lstrip("\ufeff")
+            first = False
+            if line.startswith("WEBVTT"):
+                skipping = True  # Header block
+                continue
+
+        if not line.strip():
+            # Dòng trống kết thúc cue / block
+            if start is not None:
+                yield Cue(start, end, "\n".join(text_lines))
+                start = None
+                text_lines = []
+            skipping = False
+            continue
+
+        if skipping:
+            continue
+
+        timing = parse_timing_line(line)
+        if timing is not None:
+            if start is not None:
+                # Thiếu dòng trống giữa 2 cue: dòng cuối (số thứ tự / id) thuộc cue sau
+                if text_lines and text_lines[-1].strip().isdigit():
+                    text_lines.pop()
+                yield Cue(start, end, "\n".join(text_lines))
+                text_lines = []
+            start, end = timing
+            continue
+
+        if start is None:
+            # Ngoài cue: số thứ tự, cue id hoặc block VTT đặc biệt
+            if line.split(" ", 1)[0] in _VTT_SKIP_BLOCKS:
+                skipping = True
+            continue
+
+        text_lines.append(line.strip())
+
+    if start is not None:
+        yield Cue(start, end, "\n".join(text_lines))
+
+
+def parse_subtitles(source: Union[str, Iterable[str]]) -> CueList:
+    """Phân tích chuỗi hoặc iterable các dòng thành CueList"""
+    if isinstance(source, str):
+        fmt = FORMAT_VTT if source.lstrip("\ufeff").startswith("WEBVTT") else FORMAT_SRT
+        lines: Iterable[str] = source.splitlines()
+    else:
+        fmt = FORMAT_SRT
+        lines = source
+    cues = CueList(fmt)
+    append = cues.append
+    for start, end, text in iter_cues(lines):
+        append(start, end, text)
+    return cues
+
+
+def load_subtitles(path: str) -> CueList:
+    """Đọc file SRT/VTT (UTF-8, có/không BOM; fallback cp1252)"""
+    fmt = FORMAT_VTT if str(path).lower().endswith(".vtt") else FORMAT_SRT
+    try:
+        with open(path, "r", encoding="utf-8-sig") as f:
+            cues = parse_subtitles(f)
+    except UnicodeDecodeError:
+        with open(path, "r", encoding="cp1252", errors="replace") as f:
+            cues = parse_subtitles(f)
+    cues.format = fmt
+    return cues
+
+
+def save_subtitles(cues: CueList, path: str, texts: Optional[List[str]] = None,
+                   fmt: Optional[str] = None) -> None:
+    """Ghi CueList ra file (định dạng theo đuôi file nếu không chỉ định)"""
+    fmt = fmt or (FORMAT_VTT if str(path).lower().endswith(".vtt") else FORMAT_SRT)
+    blocks = iter_vtt_blocks(cues, texts) if fmt == FORMAT_VTT else iter_srt_blocks(cues, texts)
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(blocks)
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Subtitle Table Model - Model cho bảng phụ đề (QTableView)
+Đọc trực tiếp từ CueList (mảng thời gian ms + list text), không tạo item cho từng ô.
+Cập nhật bản dịch theo lô để chỉ phát một dataChanged cho nhiều dòng.
+"""
+
+from typing import Dict, List
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+from app.core.subtitle_engine import CueList, parse_timing_line
+
+
+COL_TIME = 0
+COL_TEXT = 1
+COL_TRANSLATION = 2
+
+
+class SubtitleTableModel(QAbstractTableModel):
+    """Model 3 cột: Thời gian, Nội dung, Dịch"""
+
+    HEADERS = ["Thời gian", "Nội dung", "Dịch"]
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self.cues: CueList = CueList()
+        self.translations: List[str] = []
+
+    # ==================== Dữ liệu ====================
+
+    def set_cues(self, cues: CueList) -> None:
+        """Nạp danh sách cue mới (một lần reset thay vì tạo từng ô)"""
+        self.beginResetModel()
+        self.cues = cues
+        self.translations = [""] * len(cues)
+        self.endResetModel()
+
+    def clear(self) -> None:
+        self.set_cues(CueList())
+
+    def texts(self) -> List[str]:
+        """Nội dung gốc của tất cả cue"""
+        return self.cues.texts
+
+    def display_text(self, row: int) -> str:
+        """Nội dung gốc trên một dòng (như cách hiển thị cũ)"""
+        return self.cues.texts[row].replace("\n", " ")
+
+    def timestamp(self, row: int) -> str:
+        return self.cues.timestamp(row)
+
+    def set_translations(self, updates: Dict[int, str]) -> None:
+        """Cập nhật bản dịch theo lô {row: text}, phát một dataChanged cho cả khoảng"""
+        if not updates:
+            return
+        n = len(self.translations)
+        rows = [r for r in updates if 0 <= r < n]
+        if not rows:
+            return
+        for r in rows:
+            self.translations[r] = updates[r]
+        top = self.index(min(rows), COL_TRANSLATION)
+        bottom = self.index(max(rows), COL_TRANSLATION)
+        self.dataChanged.emit(top, bottom, [Qt.DisplayRole, Qt.EditRole])
+
+    def clear_translations(self) -> None:
+        if not self.translations:
+            return
+        self.translations = [""] * len(self.translations)
+        self.dataChanged.emit(self.index(0, COL_TRANSLATION),
+                              self.index(len(self.translations) - 1, COL_TRANSLATION))
+
+    def output_texts(self) -> List[str]:
+        """Nội dung để xuất: bản dịch nếu có, ngược lại nội dung gốc"""
+        return [(t or "").strip() or self.display_text(i) for i, t in enumerate(self.translations)]
+
+    def rows_data(self) -> List[List[str]]:
+        """Dữ liệu dạng [timestamp, content, trans] cho từng dòng"""
+        return [[self.timestamp(i), self.display_text(i), self.translations[i]]
+                for i in range(len(self.translations))]
+
+    # ==================== QAbstractTableModel ====================
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.cues)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+        row, col = index.row(), index.column()
+        if col == COL_TIME:
+            return self.timestamp(row)
+        if col == COL_TEXT:
+            return self.display_text(row)
+        return self.translations[row]
+
+    def setData(self, index: QModelIndex, value, role: int = Qt.EditRole) -> bool:
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        row, col = index.row(), index.column()
+        value = str(value)
+        if col == COL_TIME:
+            timing = parse_timing_line(value)
+            if timing is None:
+                return False
+            self.cues.starts[row], self.cues.ends[row] = timing
+        elif col == COL_TEXT:
+            self.cues.texts[row] = value
+        else:
+            self.translations[row] = value
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        return True
+
+    def flags(self, index: QModelIndex):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
+
+    def headerData(self, section: int, orientation, role: int = Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.HEADERS[section] if 0 <= section < len(self.HEADERS) else None
+        return section + 1
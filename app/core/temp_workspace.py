@@ -0,0 +1,334 @@
+# -*- coding: utf-8 -*-
+"""
+Temp Workspace - Thư mục tạm theo phiên làm việc
+- Mỗi phiên (tiến trình) có một thư mục gốc duy nhất, tạo một lần khi cần
+- Mọi thư mục/file tạm được cấp phát đều được ghi nhận (registry)
+- Đếm tham chiếu: file còn được SegmentManager giữ thì không bị xóa
+- File do worker vừa ghi có thể được giữ sẵn (handoff) cho tới khi bên nhận acquire(),
+  nên quota/cleanup không xóa mất file trong lúc nó đang được chuyển sang giao diện
+- Giới hạn dung lượng (quota): vượt quá thì xóa artifact ít dùng nhất (LRU) không còn tham chiếu
+- Khi khởi động: dọn thư mục của các phiên đã chết (crash) mà không phải quét lại trong phiên
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+from app.core.config import AppConfig
+from app.utils.helps import hide_directory_on_windows
+
+
+SESSION_MARK = "session_"
+LOCK_NAME = ".lock"
+
+PathLike = Union[str, Path]
+
+
+class _Artifact:
+    """Một thư mục hoặc file tạm đã cấp phát"""
+
+    __slots__ = ("path", "is_dir", "refs", "handoff", "size", "files", "last_used")
+
+    def __init__(self, path: Path, is_dir: bool, refs: int = 0, handoff: bool = False) -> None:
+        self.path = path
+        self.is_dir = is_dir
+        self.refs = refs
+        self.handoff = handoff  # refs đang gồm 1 hold của bên tạo, chờ bên nhận tiếp quản
+        self.size = 0
+        self.files: Dict[str, int] = {}  # file đã tính dung lượng -> size
+        self.last_used = time.monotonic()
+
+
+def _lock_is_held(lock_path: Path) -> bool:
+    """Phiên sở hữu lock còn sống không (file lock đang bị giữ)"""
+    if not lock_path.exists():
+        return False
+    if os.name == "nt":
+        # File đang được mở bởi tiến trình khác thì không xóa được
+        try:
+            os.remove(lock_path)
+            return False
+        except PermissionError:
+            return True
+        except OSError:
+            return False
+    import fcntl
+    try:
+        with open(lock_path, "a") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        return False
+    except BlockingIOError:
+        return True
+    except OSError:
+        return False
+
+
+class TempWorkspace:
+    """Quản lý thư mục tạm của một phiên"""
+
+    def __init__(self, base_dir: Optional[PathLike] = None, prefix: str = AppConfig.TEMP_PREFIX,
+                 quota_bytes: int = AppConfig.TEMP_QUOTA_MB * 1024 * 1024) -> None:
+        self.base_dir = Path(base_dir or tempfile.gettempdir())
+        self.prefix = prefix
+        self.quota_bytes = quota_bytes
+        self._root: Optional[Path] = None
+        self._files_dir: Optional[Path] = None
+        self._lock_file = None
+        self._lock = threading.RLock()
+        self._artifacts: "OrderedDict[str, _Artifact]" = OrderedDict()  # thứ tự LRU
+        self._usage = 0
+        self._counter = 0
+        self._remove_listeners: List[Callable[[str], None]] = []
+
+    # ==================== Thư mục gốc ====================
+
+    @property
+    def root(self) -> Path:
+        """Thư mục gốc của phiên (tạo ở lần dùng đầu)"""
+        with self._lock:
+            if self._root is None:
+                name = f"{self.prefix}{SESSION_MARK}{os.getpid()}_{uuid.uuid4().hex[:8]}"
+                root = self.base_dir / name
+                root.mkdir(parents=True, exist_ok=True)
+                self._hold_lock(root / LOCK_NAME)
+                try:
+                    hide_directory_on_windows(root)
+                except OSError:
+                    pass
+                self._root = root
+            return self._root
+
+    def _hold_lock(self, lock_path: Path) -> None:
+        """Giữ file lock suốt phiên để phiên khác biết thư mục này còn được dùng"""
+        self._lock_file = open(lock_path, "w")
+        self._lock_file.write(str(os.getpid()))
+        self._lock_file.flush()
+        if os.name != "nt":
+            import fcntl
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def _next_name(self, tag: str) -> str:
+        self._counter += 1
+        return f"{tag}_{self._counter:05d}"
+
+    def add_remove_listener(self, callback: Callable[[str], None]) -> None:
+        """Đăng ký hàm được gọi với đường dẫn mỗi khi một artifact bị xóa"""
+        self._remove_listeners.append(callback)
+
+    def _notify_removed(self, path: Path) -> None:
+        for callback in self._remove_listeners:
+            try:
+                callback(str(path))
+            except Exception:
+                pass
+
+    # ==================== Cấp phát ====================
+
+    def new_dir(self, tag: str = "job", hold: bool = True) -> Path:
+        """
+        Tạo thư mục tạm trong phiên (một lần mkdir).
+        hold=True: người gọi giữ 1 tham chiếu, nhớ release() khi xong.
+        """
+        with self._lock:
+            path = self.root / self._next_name(tag)
+            path.mkdir()
+            self._artifacts[str(path)] = _Artifact(path, True, 1 if hold else 0)
+            return path
+
+    def new_file(self, suffix: str = ".mp3", tag: str = "file", hold: bool = False,
+                 handoff: bool = False) -> Path:
+        """
+        Cấp đường dẫn file tạm (chưa tạo file) trong thư mục files chung của phiên.
+        handoff=True: giữ 1 tham chiếu cho tới khi bên nhận acquire() (tiếp quản tham chiếu đó)
+        hoặc file bị discard() - dùng cho kết quả worker gửi sang luồng khác.
+        """
+        with self._lock:
+            if self._files_dir is None:
+                self._files_dir = self.root / "files"
+                self._files_dir.mkdir(exist_ok=True)
+            path = self._files_dir / f"{self._next_name(tag)}{suffix}"
+            self._artifacts[str(path)] = _Artifact(path, False, 1 if (hold or handoff) else 0, handoff)
+            return path
+
+    # ==================== Tham chiếu ====================
+
+    def _owner(self, path: PathLike) -> Optional[_Artifact]:
+        """Artifact chứa path (chính nó hoặc thư mục cha đã đăng ký)"""
+        if self._root is None:
+            return None
+        p = Path(path)
+        art = self._artifacts.get(str(p))
+        if art is not None:
+            return art
+        for parent in p.parents:
+            if parent == self._root:
+                break
+            art = self._artifacts.get(str(parent))
+            if art is not None:
+                return art
+        return None
+
+    def owns(self, path: PathLike) -> bool:
+        with self._lock:
+            return self._owner(path) is not None
+
+    def acquire(self, path: PathLike) -> bool:
+        """Tăng tham chiếu cho file/thư mục thuộc phiên; file ngoài phiên bị bỏ qua"""
+        with self._lock:
+            art = self._owner(path)
+            if art is None:
+                return False
+            if art.handoff:
+                art.handoff = False  # Tiếp quản hold của bên tạo
+            else:
+                art.refs += 1
+            self._touch(art)
+            self._account(art, path)
+            return True
+
+    def release(self, path: PathLike) -> None:
+        """Giảm tham chiếu; artifact không còn tham chiếu có thể bị dọn khi cần"""
+        with self._lock:
+            art = self._owner(path)
+            if art is not None and art.refs > 0:
+                art.refs -= 1
+
+    def touch(self, path: PathLike) -> None:
+        """Đánh dấu vừa được dùng (LRU)"""
+        with self._lock:
+            art = self._owner(path)
+            if art is not None:
+                self._touch(art)
+
+    def _touch(self, art: _Artifact) -> None:
+        art.last_used = time.monotonic()
+        self._artifacts.move_to_end(str(art.path))
+
+    # ==================== Dung lượng ====================
+
+    def account(self, path: PathLike) -> None:
+        """Ghi nhận dung lượng file vừa ghi xong rồi áp quota"""
+        with self._lock:
+            art = self._owner(path)
+            if art is not None:
+                self._account(art, path)
+
+    def _account(self, art: _Artifact, path: PathLike) -> None:
+        key = str(path)
+        try:
+            size = os.path.getsize(key) if os.path.isfile(key) else 0
+        except OSError:
+            size = 0
+        old = art.files.get(key, 0)
+        if size != old:
+            art.files[key] = size
+            art.size += size - old
+            self._usage += size - old
+            self._enforce_quota()
+
+    def usage_bytes(self) -> int:
+        return self._usage
+
+    def _enforce_quota(self) -> None:
+        """Xóa artifact không còn tham chiếu, ít dùng nhất trước, cho tới khi dưới quota"""
+        if self._usage <= self.quota_bytes:
+            return
+        for key in list(self._artifacts.keys()):
+            if self._usage <= self.quota_bytes:
+                break
+            art = self._artifacts[key]
+            if art.refs == 0 and art.size > 0:
+                self._remove(art)
+
+    def _remove(self, art: _Artifact) -> None:
+        self._artifacts.pop(str(art.path), None)
+        self._usage -= art.size
+        self._notify_removed(art.path)
+        try:
+            if art.is_dir:
+                shutil.rmtree(art.path, ignore_errors=True)
+            elif art.path.exists():
+                art.path.unlink()
+        except OSError:
+            pass
+
+    # ==================== Dọn dẹp ====================
+
+    def discard(self, path: PathLike) -> bool:
+        """Xóa ngay artifact (nếu không còn tham chiếu); hold handoff chưa ai nhận được bỏ luôn"""
+        with self._lock:
+            art = self._owner(path)
+            if art is None:
+                return False
+            if art.handoff and art.path == Path(path):
+                art.handoff = False
+                art.refs -= 1
+            if art.refs > 0:
+                return False
+            self._remove(art)
+            return True
+
+    def cleanup(self) -> int:
+        """Xóa mọi artifact không còn tham chiếu, trả về số artifact đã xóa"""
+        with self._lock:
+            idle = [art for art in self._artifacts.values() if art.refs == 0]
+            for art in idle:
+                self._remove(art)
+            return len(idle)
+
+    def close(self) -> None:
+        """Kết thúc phiên: xóa toàn bộ thư mục gốc"""
+        with self._lock:
+            root, self._root = self._root, None
+            self._files_dir = None
+            for art in self._artifacts.values():
+                self._notify_removed(art.path)
+            self._artifacts.clear()
+            self._usage = 0
+            if self._lock_file is not None:
+                try:
+                    self._lock_file.close()
+                except OSError:
+                    pass
+                self._lock_file = None
+            if root is not None:
+                shutil.rmtree(root, ignore_errors=True)
+
+    def reclaim_orphans(self) -> int:
+        """
+        Dọn thư mục tạm của các phiên đã chết (crash/kill) và thư mục kiểu cũ (mkdtemp).
+        Chỉ chạy khi khởi động; thư mục của phiên khác còn sống (lock bị giữ) được giữ lại.
+        """
+        cleaned = 0
+        own = self._root.name if self._root is not None else None
+        try:
+            entries = list(os.scandir(self.base_dir))
+        except OSError:
+            return 0
+        for entry in entries:
+            name = entry.name
+            if not name.startswith(self.prefix) or name == own:
+                continue
+            try:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+            except OSError:
+                continue
+            path = Path(entry.path)
+            if name.startswith(self.prefix + SESSION_MARK) and _lock_is_held(path / LOCK_NAME):
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            if not path.exists():
+                cleaned += 1
+        return cleaned
+
+
+# Instance dùng chung cho cả ứng dụng
+temp_workspace = TempWorkspace()
@@ -0,0 +1,455 @@
+# -*- coding: utf-8 -*-
+"""
+Translate Clients - Lớp client dùng lại cho các dịch vụ dịch thuật
+Mỗi (service, api_key, cặp ngôn ngữ) chỉ tạo một client cho mỗi pool,
+dùng lại HTTP session (keep-alive) và an toàn khi gọi từ nhiều luồng.
+Các SDK provider được import lười: chỉ nạp khi client của provider đó được dùng.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import inspect
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+from app.core.config import AppConfig
+from app.utils.lazy_import import lazy_import
+
+requests = lazy_import("requests")
+deep_translator = lazy_import("deep_translator")
+genai = lazy_import("google.generativeai")
+glm = lazy_import("google.ai.generativelanguage")
+openai = lazy_import("openai")
+
+
+# Tên service (trùng với lựa chọn trong TranslateTab)
+SERVICE_GOOGLE = "Google Translate"
+SERVICE_GEMINI = "Google Gemini"
+SERVICE_OPENAI = "OpenAI (ChatGPT)"
+
+# Endpoint Google dạng JSON (không chính thức), chỉ dùng khi bật AppConfig.GOOGLE_GTX_FAST_PATH
+GOOGLE_GTX_URL = "https://translate.googleapis.com/translate_a/single"
+HTTP_TIMEOUT = 30  # Giây
+
+# Executor cho translate() đồng bộ trong translate_async (None = executor mặc định của loop).
+# AsyncTranslateEngine đặt giá trị này cho mỗi lượt dịch (xem job_scheduler)
+blocking_executor: contextvars.ContextVar = contextvars.ContextVar("translate_blocking_executor", default=None)
+
+
+def build_translation_prompt(text: str, source_lang: str, target_lang: str,
+                             custom_prompt: str = "") -> str:
+    """Tạo prompt dịch cho các AI models"""
+    return f"""
+            Bạn là một dịch giả chuyên nghiệp. Hãy dịch văn bản sau từ {source_lang} sang {target_lang}.
+
+            {custom_prompt if custom_prompt else "Hãy dịch chính xác và tự nhiên, giữ nguyên ý nghĩa và ngữ cảnh."}
+
+            Văn bản cần dịch:
+            {text}
+
+            Chỉ trả về bản dịch, không có giải thích thêm.
+            """
+
+
+class BaseTranslateClient:
+    """Client cơ sở - mỗi instance gắn với một service và một cặp ngôn ngữ"""
+
+    def __init__(self, source_lang: str, target_lang: str) -> None:
+        self.source_lang = source_lang
+        self.target_lang = target_lang
+
+    def translate(self, text: str, custom_prompt: str = "") -> str:
+        raise NotImplementedError
+
+    async def translate_async(self, text: str, custom_prompt: str = "") -> str:
+        """
+        Bản async - mặc định chạy translate() trên blocking_executor (hoặc executor của event loop).
+        Client có SDK async sẽ override để không tốn luồng.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(blocking_executor.get(), self.translate, text, custom_prompt)
+
+    def supports_streaming(self) -> bool:
+        """Client có trả kết quả từng phần (streaming) hay không"""
+        return False
+
+    async def translate_stream_async(self, text: str, custom_prompt: str = "",
+                                     on_partial: Optional[Callable[[str], None]] = None) -> str:
+        """
+        Dịch dạng streaming: gọi on_partial(văn bản đã nhận đến hiện tại) mỗi khi có thêm dữ liệu.
+        Mặc định không streaming -> trả kết quả đầy đủ một lần.
+        """
+        return await self.translate_async(text, custom_prompt)
+
+    async def aclose(self) -> None:
+        """Giải phóng tài nguyên async gắn với event loop hiện tại (nếu có)"""
+        pass
+
+    def close(self) -> None:
+        """Giải phóng kết nối (nếu có)"""
+        pass
+
+
+class GoogleTranslateClient(BaseTranslateClient):
+    """
+    Google Translate qua GoogleTranslator (deep_translator).
+    GoogleTranslator không thread-safe nên dùng pool instance: mỗi lần dịch mượn một instance
+    rồi trả lại, số instance tối đa bằng số luồng dịch cùng lúc.
+    AppConfig.GOOGLE_GTX_FAST_PATH bật thêm đường gọi thẳng endpoint JSON (gtx) qua session
+    giữ kết nối; endpoint lỗi mạng hoặc đổi định dạng thì quay về GoogleTranslator.
+    """
+
+    def __init__(self, source_lang: str, target_lang: str) -> None:
+        super().__init__(source_lang, target_lang)
+        self._idle: list = []  # GoogleTranslator đang rảnh
+        self._pool_lock = threading.Lock()
+        self._local = threading.local()
+        self._sessions: list = []
+        self._sessions_lock = threading.Lock()
+
+    def _acquire_translator(self) -> deep_translator.GoogleTranslator:
+        with self._pool_lock:
+            if self._idle:
+                return self._idle.pop()
+        return deep_translator.GoogleTranslator(source=self.source_lang, target=self.target_lang)
+
+    def _release_translator(self, translator: deep_translator.GoogleTranslator) -> None:
+        with self._pool_lock:
+            self._idle.append(translator)
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4)
+            session.mount("https://", adapter)
+            self._local.session = session
+            with self._sessions_lock:
+                self._sessions.append(session)
+        return session
+
+    def _translate_gtx(self, text: str) -> str:
+        params = {
+            "client": "gtx",
+            "sl": self.source_lang or "auto",
+            "tl": self.target_lang,
+            "dt": "t",
+            "q": text,
+        }
+        resp = self._session().get(GOOGLE_GTX_URL, params=params, timeout=HTTP_TIMEOUT)
+        resp.raise_for_status()
+        data = resp.json()
+        return "".join(part[0] for part in (data[0] or []) if part and part[0])
+
+    def translate(self, text: str, custom_prompt: str = "") -> str:
+        if not text or not text.strip():
+            return text
+        if AppConfig.GOOGLE_GTX_FAST_PATH:
+            try:
+                result = self._translate_gtx(text)
+                if result:
+                    return result
+            except (requests.RequestException, ValueError, LookupError, TypeError):
+                pass  # Lỗi mạng / JSON không đúng định dạng -> dùng GoogleTranslator
+        translator = self._acquire_translator()
+        try:
+            return translator.translate(text)
+        except Exception as e:
+            raise Exception(f"Lỗi Google Translate: {str(e)}")
+        finally:
+            self._release_translator(translator)
+
+    def close(self) -> None:
+        with self._pool_lock:
+            self._idle = []
+        with self._sessions_lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            try:
+                session.close()
+            except Exception:
+                pass
+
+
+class GeminiClient(BaseTranslateClient):
+    """
+    Google Gemini - mỗi client có GenerativeServiceClient riêng mang api_key của nó
+    (client_options), không dùng genai.configure toàn cục nên nhiều key chạy song song được.
+    SDK không cho gắn client riêng thì quay về genai.configure và tuần tự hoá theo key.
+    Client async (grpc.aio) gắn với event loop tạo ra nó -> mỗi loop một model + client async,
+    bỏ đi trong aclose(); không tạo được thì dùng đường executor.
+    """
+
+    MODEL = "gemini-pro"
+
+    # genai.configure là trạng thái toàn cục -> khóa chung cho đường dự phòng
+    _configure_lock = threading.Lock()
+    _configured_key: Optional[str] = None
+
+    def __init__(self, api_key: str, source_lang: str, target_lang: str) -> None:
+        super().__init__(source_lang, target_lang)
+        if not api_key:
+            raise Exception("Thiếu Gemini API Key")
+        self.api_key = api_key
+        self.model = genai.GenerativeModel(self.MODEL)
+        self._dedicated = self._attach_client(self.model)
+        self._async_models: Dict[int, object] = {}
+        self._async_lock = threading.Lock()
+
+    def _client_options(self) -> dict:
+        return {"api_key": self.api_key}
+
+    def _attach_client(self, model) -> bool:
+        """Gắn GenerativeServiceClient riêng vào model; False nếu SDK không hỗ trợ"""
+        if not hasattr(model, "_client"):
+            return False
+        try:
+            model._client = glm.GenerativeServiceClient(client_options=self._client_options())
+        except (ImportError, AttributeError):
+            return False
+        return True
+
+    def _generate(self, prompt: str):
+        if self._dedicated:
+            return self.model.generate_content(prompt)
+        # Đường dự phòng: configure + gọi trong cùng khóa để key không bị client khác đổi giữa chừng
+        cls = GeminiClient
+        with cls._configure_lock:
+            if cls._configured_key != self.api_key:
+                genai.configure(api_key=self.api_key)
+                cls._configured_key = self.api_key
+            return self.model.generate_content(prompt)
+
+    def translate(self, text: str, custom_prompt: str = "") -> str:
+        try:
+            prompt = build_translation_prompt(text, self.source_lang, self.target_lang, custom_prompt)
+            response = self._generate(prompt)
+            return response.text.strip()
+        except Exception as e:
+            raise Exception(f"Lỗi Google Gemini: {str(e)}")
+
+    def _async_model(self):
+        """GenerativeModel có client async riêng cho event loop hiện tại (None nếu SDK không hỗ trợ)"""
+        if not self._dedicated:
+            return None
+        loop_id = id(asyncio.get_running_loop())
+        with self._async_lock:
+            model = self._async_models.get(loop_id)
+            if model is None:
+                model = genai.GenerativeModel(self.MODEL)
+                if not hasattr(model, "_async_client") or not hasattr(model, "generate_content_async"):
+                    return None
+                try:
+                    model._async_client = glm.GenerativeServiceAsyncClient(client_options=self._client_options())
+                except (ImportError, AttributeError):
+                    return None
+                self._async_models[loop_id] = model
+        return model
+
+    async def translate_async(self, text: str, custom_prompt: str = "") -> str:
+        model = self._async_model()
+        if model is None:
+            return await super().translate_async(text, custom_prompt)
+        try:
+            prompt = build_translation_prompt(text, self.source_lang, self.target_lang, custom_prompt)
+            response = await model.generate_content_async(prompt)
+            return response.text.strip()
+        except Exception as e:
+            raise Exception(f"Lỗi Google Gemini: {str(e)}")
+
+    def supports_streaming(self) -> bool:
+        return self._dedicated and hasattr(self.model, "generate_content_async")
+
+    async def translate_stream_async(self, text: str, custom_prompt: str = "",
+                                     on_partial: Optional[Callable[[str], None]] = None) -> str:
+        model = self._async_model()
+        if model is None:
+            return await super().translate_stream_async(text, custom_prompt, on_partial)
+        try:
+            prompt = build_translation_prompt(text, self.source_lang, self.target_lang, custom_prompt)
+            response = await model.generate_content_async(prompt, stream=True)
+            parts = []
+            async for chunk in response:
+                piece = getattr(chunk, "text", "") or ""
+                if piece:
+                    parts.append(piece)
+                    if on_partial:
+                        on_partial("".join(parts).lstrip())
+            return "".join(parts).strip()
+        except Exception as e:
+            raise Exception(f"Lỗi Google Gemini: {str(e)}")
+
+    async def aclose(self) -> None:
+        loop_id = id(asyncio.get_running_loop())
+        with self._async_lock:
+            model = self._async_models.pop(loop_id, None)
+        transport = getattr(getattr(model, "_async_client", None), "transport", None)
+        if transport is not None:
+            try:
+                result = transport.close()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                pass
+
+    def close(self) -> None:
+        client = getattr(self.model, "_client", None) if self._dedicated else None
+        transport = getattr(client, "transport", None)
+        if transport is not None:
+            try:
+                transport.close()
+            except Exception:
+                pass
+
+
+class OpenAIClient(BaseTranslateClient):
+    """
+    OpenAI ChatGPT - dùng một client cho mỗi API key thay vì gán openai.api_key toàn cục.
+    Hỗ trợ cả SDK mới (openai.OpenAI) lẫn SDK cũ (openai.ChatCompletion).
+    """
+
+    MODEL = "gpt-3.5-turbo"
+
+    def __init__(self, api_key: str, source_lang: str, target_lang: str) -> None:
+        super().__init__(source_lang, target_lang)
+        if not api_key:
+            raise Exception("Thiếu OpenAI API Key")
+        self.api_key = api_key
+        # SDK >= 1.0: client có connection pool riêng và thread-safe
+        self._client = openai.OpenAI(api_key=api_key) if hasattr(openai, "OpenAI") else None
+        # Client async gắn với từng event loop (httpx.AsyncClient không dùng chéo loop)
+        self._async_clients: Dict[int, object] = {}
+        self._async_lock = threading.Lock()
+
+    def _messages(self, text: str, custom_prompt: str) -> list:
+        prompt = build_translation_prompt(text, self.source_lang, self.target_lang, custom_prompt)
+        return [
+            {"role": "system", "content": "Bạn là một dịch giả chuyên nghiệp."},
+            {"role": "user", "content": prompt}
+        ]
+
+    def translate(self, text: str, custom_prompt: str = "") -> str:
+        try:
+            messages = self._messages(text, custom_prompt)
+            if self._client is not None:
+                response = self._client.chat.completions.create(
+                    model=self.MODEL, messages=messages, max_tokens=1000, temperature=0.3
+                )
+            else:
+                response = openai.ChatCompletion.create(
+                    model=self.MODEL, messages=messages, max_tokens=1000, temperature=0.3,
+                    api_key=self.api_key
+                )
+            return response.choices[0].message.content.strip()
+        except Exception as e:
+            raise Exception(f"Lỗi OpenAI: {str(e)}")
+
+    def _async_client(self):
+        loop_id = id(asyncio.get_running_loop())
+        with self._async_lock:
+            client = self._async_clients.get(loop_id)
+            if client is None:
+                client = openai.AsyncOpenAI(api_key=self.api_key)
+                self._async_clients[loop_id] = client
+        return client
+
+    async def translate_async(self, text: str, custom_prompt: str = "") -> str:
+        if not hasattr(openai, "AsyncOpenAI"):
+            return await super().translate_async(text, custom_prompt)
+        try:
+            response = await self._async_client().chat.completions.create(
+                model=self.MODEL, messages=self._messages(text, custom_prompt),
+                max_tokens=1000, temperature=0.3
+            )
+            return response.choices[0].message.content.strip()
+        except Exception as e:
+            raise Exception(f"Lỗi OpenAI: {str(e)}")
+
+    def supports_streaming(self) -> bool:
+        return hasattr(openai, "AsyncOpenAI")
+
+    async def translate_stream_async(self, text: str, custom_prompt: str = "",
+                                     on_partial: Optional[Callable[[str], None]] = None) -> str:
+        if not self.supports_streaming():
+            return await super().translate_stream_async(text, custom_prompt, on_partial)
+        try:
+            stream = await self._async_client().chat.completions.create(
+                model=self.MODEL, messages=self._messages(text, custom_prompt),
+                max_tokens=1000, temperature=0.3, stream=True
+            )
+            parts = []
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                piece = chunk.choices[0].delta.content or ""
+                if piece:
+                    parts.append(piece)
+                    if on_partial:
+                        on_partial("".join(parts).lstrip())
+            return "".join(parts).strip()
+        except Exception as e:
+            raise Exception(f"Lỗi OpenAI: {str(e)}")
+
+    async def aclose(self) -> None:
+        loop_id = id(asyncio.get_running_loop())
+        with self._async_lock:
+            client = self._async_clients.pop(loop_id, None)
+        if client is not None:
+            try:
+                await client.close()
+            except Exception:
+                pass
+
+    def close(self) -> None:
+        if self._client is not None:
+            try:
+                self._client.close()
+            except Exception:
+                pass
+
+
+class TranslateClientPool:
+    """
+    Cache client theo (service, api_key, source_lang, target_lang).
+    Một pool dùng chung cho một lượt dịch (hoặc một batch nhiều file).
+    """
+
+    def __init__(self) -> None:
+        self._clients: Dict[Tuple[str, str, str, str], BaseTranslateClient] = {}
+        self._lock = threading.Lock()
+
+    def get(self, service: str, api_key: str, source_lang: str, target_lang: str) -> BaseTranslateClient:
+        """Lấy (hoặc tạo) client cho service và cặp ngôn ngữ"""
+        key = (service, api_key or "", source_lang, target_lang)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._create(service, api_key, source_lang, target_lang)
+                self._clients[key] = client
+        return client
+
+    def _create(self, service: str, api_key: str, source_lang: str, target_lang: str) -> BaseTranslateClient:
+        if service == SERVICE_GOOGLE:
+            return GoogleTranslateClient(source_lang, target_lang)
+        elif service == SERVICE_GEMINI:
+            return GeminiClient(api_key, source_lang, target_lang)
+        elif service == SERVICE_OPENAI:
+            return OpenAIClient(api_key, source_lang, target_lang)
+        raise Exception(f"Không hỗ trợ service: {service}")
+
+    def clients(self) -> list:
+        """Danh sách client đang được cache"""
+        with self._lock:
+            return list(self._clients.values())
+
+    def close(self) -> None:
+        """Đóng tất cả client và session"""
+        with self._lock:
+            clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            client.close()
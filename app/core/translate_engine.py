@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+Translate Engine - Engine dịch bất đồng bộ (asyncio)
+Một event loop cho mỗi lượt dịch, giới hạn số request đồng thời theo từng provider,
+kết quả được trả về ngay khi xong (không chờ theo batch).
+"""
+
+import asyncio
+import random
+from typing import Callable, List, Optional
+
+from app.core.config import AppConfig
+from app.core.job_scheduler import job_scheduler
+from app.core.reorder_window import ReorderWindow
+from app.core.translate_clients import (
+    BaseTranslateClient, SERVICE_GOOGLE, SERVICE_GEMINI, SERVICE_OPENAI, blocking_executor
+)
+
+
+# Số request đồng thời tối đa cho mỗi provider
+PROVIDER_CONCURRENCY = {
+    SERVICE_GOOGLE: 16,
+    SERVICE_GEMINI: 8,
+    SERVICE_OPENAI: 16,
+}
+DEFAULT_CONCURRENCY = 8
+
+# Nghỉ ngẫu nhiên giữa các request của một slot để tránh rate limit (giây)
+REQUEST_JITTER = (0.5, 1.5)
+
+# Khoảng cách tối thiểu giữa 2 lần báo kết quả từng phần của một đoạn (giây)
+PARTIAL_INTERVAL = 0.1
+
+
+def provider_concurrency(service: str, workers: int) -> int:
+    """
+    Số request đồng thời cho một lượt dịch.
+    Google chạy qua luồng (SDK không có async) nên bị giới hạn bởi số workers,
+    Gemini/OpenAI dùng SDK async nên chỉ bị giới hạn bởi provider.
+    """
+    limit = PROVIDER_CONCURRENCY.get(service, DEFAULT_CONCURRENCY)
+    if service == SERVICE_GOOGLE:
+        return max(1, min(limit, workers))
+    return max(1, limit)
+
+
+class AsyncTranslateEngine:
+    """
+    Chạy dịch các đoạn trên một event loop duy nhất.
+    Đoạn kế tiếp được gửi ngay khi semaphore của provider còn slot,
+    nên đoạn chậm không chặn các đoạn phía sau (không có barrier theo batch).
+
+    Callbacks được gọi trên luồng chạy engine:
+        on_result(index1, original, translated)
+        on_error(index1, message)
+        on_partial(index1, partial_text)  - chỉ với client hỗ trợ streaming (Gemini/OpenAI)
+
+    Khi có window (ReorderWindow): chỉ gửi đoạn nằm trong cửa sổ, kết quả/lỗi đi vào window
+    (window.on_emit nhận (original, translated) theo thứ tự) và đoạn đầu bị kẹt quá
+    hedge_after giây được gửi thêm một lần; on_result/on_error không được dùng.
+    """
+
+    def __init__(self, client: BaseTranslateClient, service: str, workers: int,
+                 custom_prompt: str = "",
+                 should_stop: Optional[Callable[[], bool]] = None,
+                 jitter: tuple = REQUEST_JITTER,
+                 window: Optional[ReorderWindow] = None,
+                 hedge_after: Optional[float] = AppConfig.REORDER_HEDGE_AFTER_S,
+                 on_hedge: Optional[Callable[[int], None]] = None) -> None:
+        self.client = client
+        self.service = service
+        self.workers = max(1, workers)
+        self.concurrency = provider_concurrency(service, self.workers)
+        self.custom_prompt = custom_prompt
+        self.should_stop = should_stop or (lambda: False)
+        self.jitter = jitter
+        self.window = window
+        self.hedge_after = hedge_after
+        self.on_hedge = on_hedge
+
+    def run(self, chunks: List[str],
+            on_result: Optional[Callable[[int, str, str], None]] = None,
+            on_error: Optional[Callable[[int, str], None]] = None,
+            on_partial: Optional[Callable[[int, str], None]] = None) -> None:
+        """Chạy đồng bộ (block) cho tới khi dịch xong hoặc bị dừng"""
+        loop = asyncio.new_event_loop()
+        # Executor cho client không có SDK async (bị chặn bởi semaphore), lấy luồng từ job_scheduler
+        executor = job_scheduler.executor("translate", self.workers, label=f"translate {self.service}")
+        try:
+            loop.run_until_complete(self._run_with_executor(executor, chunks, on_result, on_error, on_partial))
+        finally:
+            try:
+                loop.run_until_complete(self.client.aclose())
+                loop.run_until_complete(loop.shutdown_asyncgens())
+            finally:
+                loop.close()
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def _partial_reporter(self, index1: int, on_partial: Callable[[int, str], None]) -> Callable[[str], None]:
+        """Giới hạn tần suất báo kết quả từng phần (~10 lần/giây mỗi đoạn)"""
+        loop = asyncio.get_running_loop()
+        last = [0.0]
+
+        def report(partial: str) -> None:
+            now = loop.time()
+            if now - last[0] >= PARTIAL_INTERVAL:
+                last[0] = now
+                on_partial(index1, partial)
+        return report
+
+    async def _run_with_executor(self, executor, *args) -> None:
+        # Context của task này được copy cho các task con tạo trong _run
+        blocking_executor.set(executor)
+        await self._run(*args)
+
+    async def _run(self, chunks, on_result, on_error, on_partial=None) -> None:
+        # Semaphore theo provider: chỉ tạo task mới khi còn slot trống
+        semaphore = asyncio.Semaphore(self.concurrency)
+        pending = set()
+        window = self.window
+        loop = asyncio.get_running_loop()
+
+        async def translate_one(index1: int, content: str, hedge: bool = False) -> None:
+            try:
+                if on_partial and self.client.supports_streaming():
+                    translated = await self.client.translate_stream_async(
+                        content, self.custom_prompt, self._partial_reporter(index1, on_partial))
+                else:
+                    translated = await self.client.translate_async(content, self.custom_prompt)
+                if window is not None:
+                    window.put(index1, (content, translated), hedge)
+                else:
+                    on_result(index1, content, translated)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                message = f"Lỗi xử lý đoạn {index1}: {str(e)}"
+                if window is not None:
+                    window.fail(index1, message)
+                else:
+                    on_error(index1, message)
+            finally:
+                semaphore.release()
+
+        def start(index1: int, hedge: bool = False) -> None:
+            task = asyncio.ensure_future(translate_one(index1, chunks[index1 - 1], hedge))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+
+        async def wait_some() -> None:
+            """Chờ một request xong (hoặc 0.1s), gửi hedge nếu đoạn đầu cửa sổ bị kẹt"""
+            if pending:
+                await asyncio.wait(list(pending), timeout=0.1, return_when=asyncio.FIRST_COMPLETED)
+            else:
+                await asyncio.sleep(0.1)
+            if window is None or not self.hedge_after or self.should_stop() or semaphore.locked():
+                return
+            index1 = window.hedge_due(self.hedge_after)
+            if index1 is not None:
+                await semaphore.acquire()
+                if self.on_hedge:
+                    self.on_hedge(index1)
+                start(index1, hedge=True)
+
+        try:
+            for i, content in enumerate(chunks):
+                # Backpressure: chờ tới khi đoạn nằm trong cửa sổ
+                if window is not None and not window.has_slot(i + 1):
+                    blocked_at = loop.time()
+                    while not window.has_slot(i + 1) and not self.should_stop():
+                        await wait_some()
+                    window.add_blocked(loop.time() - blocked_at)
+                if self.jitter and i:
+                    # Giãn cách giữa các lần gửi (tránh rate limit) trước khi lấy slot,
+                    # không giữ slot trong lúc nghỉ: trung bình mỗi slot nghỉ một khoảng jitter
+                    await asyncio.sleep(random.uniform(*self.jitter) / self.concurrency)
+                await semaphore.acquire()
+                if self.should_stop():
+                    semaphore.release()
+                    break
+                if window is not None:
+                    window.submitted(i + 1)
+                start(i + 1)
+
+            # Chờ các request còn lại, kiểm tra cờ dừng định kỳ
+            while pending:
+                if self.should_stop():
+                    for task in list(pending):
+                        task.cancel()
+                    await asyncio.gather(*pending, return_exceptions=True)
+                    break
+                await wait_some()
+        finally:
+            for task in list(pending):
+                task.cancel()
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Voice Catalog - Danh mục voices cho TTS
+Dữ liệu nằm trong voices.json (dạng gọn), chỉ được đọc ở lần dùng đầu tiên.
+Các chỉ mục shortname -> voice, (ngôn ngữ, giới tính) -> voices, tên hiển thị -> mã
+được dựng một lần nên mọi tra cứu là O(1).
+"""
+
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+VOICES_FILE = Path(__file__).with_name("voices.json")
+
+AUTO_DETECT_LABEL = "Tự phát hiện"
+
+
+def voice_display_name(voice_label: str) -> str:
+    """Tên hiển thị ngắn gọn của voice (ví dụ: "Nam - NamMinh") từ label đầy đủ"""
+    if " (" in voice_label:
+        return voice_label.split(" (")[0]
+    return voice_label
+
+
+class VoiceCatalog:
+    """Danh mục voices nạp lười với các chỉ mục tra cứu"""
+
+    def __init__(self, path: Path = VOICES_FILE) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._languages: Dict[str, Dict] = {}
+        self._by_shortname: Dict[str, Dict] = {}
+        self._by_lang_gender: Dict[Tuple[str, str], List[Dict]] = {}
+        self._shortname_by_display: Dict[str, str] = {}
+        self._code_by_name: Dict[str, str] = {}
+        self._label_cache: Dict[Tuple[str, bool], Tuple[str, ...]] = {}
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            with open(self.path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+
+            for code, entry in raw.items():
+                display_name = entry["display_name"]
+                voices = [{"gender": g, "shortname": s, "label": l} for g, s, l in entry["voices"]]
+                self._languages[code] = {"display_name": display_name, "voices": voices}
+                self._code_by_name.setdefault(display_name, code)
+                for voice in voices:
+                    self._by_lang_gender.setdefault((code, voice["gender"]), []).append(voice)
+                    self._by_shortname.setdefault(voice["shortname"], {
+                        "language": display_name,
+                        "language_code": code,
+                        "gender": voice["gender"],
+                        "shortname": voice["shortname"],
+                        "label": voice["label"],
+                    })
+                    # Giữ voice đầu tiên nếu trùng tên hiển thị (như cách duyệt tuần tự cũ)
+                    self._shortname_by_display.setdefault(
+                        voice_display_name(voice["label"]), voice["shortname"])
+            self._loaded = True
+
+    # ==================== Ngôn ngữ ====================
+
+    def languages(self) -> Dict[str, Dict]:
+        """{code: {"display_name", "voices"}} theo thứ tự trong file"""
+        self._ensure_loaded()
+        return self._languages
+
+    def has_language(self, code: str) -> bool:
+        self._ensure_loaded()
+        return code in self._languages
+
+    def display_name(self, code: str) -> Optional[str]:
+        self._ensure_loaded()
+        entry = self._languages.get(code)
+        return entry["display_name"] if entry else None
+
+    def code_by_display_name(self, name: str) -> Optional[str]:
+        self._ensure_loaded()
+        return self._code_by_name.get(name)
+
+    # ==================== Voices ====================
+
+    def voices(self, code: str) -> List[Dict]:
+        self._ensure_loaded()
+        entry = self._languages.get(code)
+        return entry["voices"] if entry else []
+
+    def voices_by_gender(self, code: str, gender: str) -> List[Dict]:
+        self._ensure_loaded()
+        return self._by_lang_gender.get((code, gender), [])
+
+    def voice_info(self, shortname: str) -> Optional[Dict]:
+        self._ensure_loaded()
+        info = self._by_shortname.get(shortname)
+        return dict(info) if info else None
+
+    def shortname_by_display(self, display: str) -> Optional[str]:
+        self._ensure_loaded()
+        return self._shortname_by_display.get(display)
+
+    def labels(self, code: str, include_auto_detect: bool = True) -> Tuple[str, ...]:
+        """Danh sách tên hiển thị cho combobox (được nhớ lại theo ngôn ngữ)"""
+        key = (code, include_auto_detect)
+        cached = self._label_cache.get(key)
+        if cached is None:
+            head = (AUTO_DETECT_LABEL,) if include_auto_detect else ()
+            cached = head + tuple(voice_display_name(v["label"]) for v in self.voices(code))
+            self._label_cache[key] = cached
+        return cached
+
+
+# Instance dùng chung
+voice_catalog = VoiceCatalog()
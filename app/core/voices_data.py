@@ -1,1987 +1,14 @@
-voices_data = {
-  "af": {
-    "display_name": "Tiếng Afrikaans",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "af-ZA-WillemNeural",
-        "label": "Nam - Willem (af-ZA-WillemNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "af-ZA-AdriNeural",
-        "label": "Nữ - Adri (af-ZA-AdriNeural)"
-      }
-    ]
-  },
-  "am": {
-    "display_name": "Tiếng Amharic",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "am-ET-AmehaNeural",
-        "label": "Nam - Ameha (am-ET-AmehaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "am-ET-MekdesNeural",
-        "label": "Nữ - Mekdes (am-ET-MekdesNeural)"
-      }
-    ]
-  },
-  "ar": {
-    "display_name": "Tiếng Ả Rập",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "ar-AE-HamdanNeural",
-        "label": "Nam - Hamdan (ar-AE-HamdanNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "ar-BH-AliNeural",
-        "label": "Nam - Ali (ar-BH-AliNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "ar-DZ-IsmaelNeural",
-        "label": "Nam - Ismael (ar-DZ-IsmaelNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "ar-EG-ShakirNeural",
-        "label": "Nam - Shakir (ar-EG-ShakirNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "ar-IQ-BasselNeural",
-        "label": "Nam - Bassel (ar-IQ-BasselNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "ar-JO-TaimNeural",
-        "label": "Nam - Taim (ar-JO-TaimNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "ar-KW-FahedNeural",
-        "label": "Nam - Fahed (ar-KW-FahedNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "ar-LB-RamiNeural",
-        "label": "Nam - Rami (ar-LB-RamiNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "ar-LY-OmarNeural",
-        "label": "Nam - Omar (ar-LY-OmarNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "ar-MA-JamalNeural",
-        "label": "Nam - Jamal (ar-MA-JamalNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "ar-OM-AbdullahNeural",
-        "label": "Nam - Abdullah (ar-OM-AbdullahNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "ar-QA-MoazNeural",
-        "label": "Nam - Moaz (ar-QA-MoazNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "ar-SA-HamedNeural",
-        "label": "Nam - Hamed (ar-SA-HamedNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "ar-SY-LaithNeural",
-        "label": "Nam - Laith (ar-SY-LaithNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "ar-TN-HediNeural",
-        "label": "Nam - Hedi (ar-TN-HediNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "ar-YE-SalehNeural",
-        "label": "Nam - Saleh (ar-YE-SalehNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "ar-AE-FatimaNeural",
-        "label": "Nữ - Fatima (ar-AE-FatimaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "ar-BH-LailaNeural",
-        "label": "Nữ - Laila (ar-BH-LailaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "ar-DZ-AminaNeural",
-        "label": "Nữ - Amina (ar-DZ-AminaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "ar-EG-SalmaNeural",
-        "label": "Nữ - Salma (ar-EG-SalmaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "ar-IQ-RanaNeural",
-        "label": "Nữ - Rana (ar-IQ-RanaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "ar-JO-SanaNeural",
-        "label": "Nữ - Sana (ar-JO-SanaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "ar-KW-NouraNeural",
-        "label": "Nữ - Noura (ar-KW-NouraNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "ar-LB-LaylaNeural",
-        "label": "Nữ - Layla (ar-LB-LaylaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "ar-LY-ImanNeural",
-        "label": "Nữ - Iman (ar-LY-ImanNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "ar-MA-MounaNeural",
-        "label": "Nữ - Mouna (ar-MA-MounaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "ar-OM-AyshaNeural",
-        "label": "Nữ - Aysha (ar-OM-AyshaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "ar-QA-AmalNeural",
-        "label": "Nữ - Amal (ar-QA-AmalNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "ar-SA-ZariyahNeural",
-        "label": "Nữ - Zariyah (ar-SA-ZariyahNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "ar-SY-AmanyNeural",
-        "label": "Nữ - Amany (ar-SY-AmanyNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "ar-TN-ReemNeural",
-        "label": "Nữ - Reem (ar-TN-ReemNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "ar-YE-MaryamNeural",
-        "label": "Nữ - Maryam (ar-YE-MaryamNeural)"
-      }
-    ]
-  },
-  "az": {
-    "display_name": "Tiếng Azerbaijan",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "az-AZ-BabekNeural",
-        "label": "Nam - Babek (az-AZ-BabekNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "az-AZ-BanuNeural",
-        "label": "Nữ - Banu (az-AZ-BanuNeural)"
-      }
-    ]
-  },
-  "bg": {
-    "display_name": "Tiếng Bulgaria",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "bg-BG-BorislavNeural",
-        "label": "Nam - Borislav (bg-BG-BorislavNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "bg-BG-KalinaNeural",
-        "label": "Nữ - Kalina (bg-BG-KalinaNeural)"
-      }
-    ]
-  },
-  "bn": {
-    "display_name": "Tiếng Bengali",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "bn-BD-PradeepNeural",
-        "label": "Nam - Pradeep (bn-BD-PradeepNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "bn-IN-BashkarNeural",
-        "label": "Nam - Bashkar (bn-IN-BashkarNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "bn-BD-NabanitaNeural",
-        "label": "Nữ - Nabanita (bn-BD-NabanitaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "bn-IN-TanishaaNeural",
-        "label": "Nữ - Tanishaa (bn-IN-TanishaaNeural)"
-      }
-    ]
-  },
-  "bs": {
-    "display_name": "Tiếng Bosnia",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "bs-BA-GoranNeural",
-        "label": "Nam - Goran (bs-BA-GoranNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "bs-BA-VesnaNeural",
-        "label": "Nữ - Vesna (bs-BA-VesnaNeural)"
-      }
-    ]
-  },
-  "ca": {
-    "display_name": "Tiếng Catalan",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "ca-ES-EnricNeural",
-        "label": "Nam - Enric (ca-ES-EnricNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "ca-ES-JoanaNeural",
-        "label": "Nữ - Joana (ca-ES-JoanaNeural)"
-      }
-    ]
-  },
-  "cs": {
-    "display_name": "Tiếng Séc",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "cs-CZ-AntoninNeural",
-        "label": "Nam - Antonin (cs-CZ-AntoninNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "cs-CZ-VlastaNeural",
-        "label": "Nữ - Vlasta (cs-CZ-VlastaNeural)"
-      }
-    ]
-  },
-  "cy": {
-    "display_name": "Tiếng Wales",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "cy-GB-AledNeural",
-        "label": "Nam - Aled (cy-GB-AledNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "cy-GB-NiaNeural",
-        "label": "Nữ - Nia (cy-GB-NiaNeural)"
-      }
-    ]
-  },
-  "da": {
-    "display_name": "Tiếng Đan Mạch",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "da-DK-JeppeNeural",
-        "label": "Nam - Jeppe (da-DK-JeppeNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "da-DK-ChristelNeural",
-        "label": "Nữ - Christel (da-DK-ChristelNeural)"
-      }
-    ]
-  },
-  "de": {
-    "display_name": "Tiếng Đức",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "de-AT-JonasNeural",
-        "label": "Nam - Jonas (de-AT-JonasNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "de-CH-JanNeural",
-        "label": "Nam - Jan (de-CH-JanNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "de-DE-ConradNeural",
-        "label": "Nam - Conrad (de-DE-ConradNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "de-DE-FlorianMultilingualNeural",
-        "label": "Nam - FlorianMultilingual (de-DE-FlorianMultilingualNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "de-DE-KillianNeural",
-        "label": "Nam - Killian (de-DE-KillianNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "de-AT-IngridNeural",
-        "label": "Nữ - Ingrid (de-AT-IngridNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "de-CH-LeniNeural",
-        "label": "Nữ - Leni (de-CH-LeniNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "de-DE-AmalaNeural",
-        "label": "Nữ - Amala (de-DE-AmalaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "de-DE-KatjaNeural",
-        "label": "Nữ - Katja (de-DE-KatjaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "de-DE-SeraphinaMultilingualNeural",
-        "label": "Nữ - SeraphinaMultilingual (de-DE-SeraphinaMultilingualNeural)"
-      }
-    ]
-  },
-  "el": {
-    "display_name": "Tiếng Hy Lạp",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "el-GR-NestorasNeural",
-        "label": "Nam - Nestoras (el-GR-NestorasNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "el-GR-AthinaNeural",
-        "label": "Nữ - Athina (el-GR-AthinaNeural)"
-      }
-    ]
-  },
-  "en": {
-    "display_name": "Tiếng Anh",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "en-AU-WilliamMultilingualNeural",
-        "label": "Nam - WilliamMultilingual (en-AU-WilliamMultilingualNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "en-CA-LiamNeural",
-        "label": "Nam - Liam (en-CA-LiamNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "en-GB-RyanNeural",
-        "label": "Nam - Ryan (en-GB-RyanNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "en-GB-ThomasNeural",
-        "label": "Nam - Thomas (en-GB-ThomasNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "en-HK-SamNeural",
-        "label": "Nam - Sam (en-HK-SamNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "en-IE-ConnorNeural",
-        "label": "Nam - Connor (en-IE-ConnorNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "en-IN-PrabhatNeural",
-        "label": "Nam - Prabhat (en-IN-PrabhatNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "en-KE-ChilembaNeural",
-        "label": "Nam - Chilemba (en-KE-ChilembaNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "en-NG-AbeoNeural",
-        "label": "Nam - Abeo (en-NG-AbeoNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "en-NZ-MitchellNeural",
-        "label": "Nam - Mitchell (en-NZ-MitchellNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "en-PH-JamesNeural",
-        "label": "Nam - James (en-PH-JamesNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "en-SG-WayneNeural",
-        "label": "Nam - Wayne (en-SG-WayneNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "en-TZ-ElimuNeural",
-        "label": "Nam - Elimu (en-TZ-ElimuNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "en-US-AndrewMultilingualNeural",
-        "label": "Nam - AndrewMultilingual (en-US-AndrewMultilingualNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "en-US-AndrewNeural",
-        "label": "Nam - Andrew (en-US-AndrewNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "en-US-BrianMultilingualNeural",
-        "label": "Nam - BrianMultilingual (en-US-BrianMultilingualNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "en-US-BrianNeural",
-        "label": "Nam - Brian (en-US-BrianNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "en-US-ChristopherNeural",
-        "label": "Nam - Christopher (en-US-ChristopherNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "en-US-EricNeural",
-        "label": "Nam - Eric (en-US-EricNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "en-US-GuyNeural",
-        "label": "Nam - Guy (en-US-GuyNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "en-US-RogerNeural",
-        "label": "Nam - Roger (en-US-RogerNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "en-US-SteffanNeural",
-        "label": "Nam - Steffan (en-US-SteffanNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "en-ZA-LukeNeural",
-        "label": "Nam - Luke (en-ZA-LukeNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "en-AU-NatashaNeural",
-        "label": "Nữ - Natasha (en-AU-NatashaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "en-CA-ClaraNeural",
-        "label": "Nữ - Clara (en-CA-ClaraNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "en-GB-LibbyNeural",
-        "label": "Nữ - Libby (en-GB-LibbyNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "en-GB-MaisieNeural",
-        "label": "Nữ - Maisie (en-GB-MaisieNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "en-GB-SoniaNeural",
-        "label": "Nữ - Sonia (en-GB-SoniaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "en-HK-YanNeural",
-        "label": "Nữ - Yan (en-HK-YanNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "en-IE-EmilyNeural",
-        "label": "Nữ - Emily (en-IE-EmilyNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "en-IN-NeerjaExpressiveNeural",
-        "label": "Nữ - NeerjaExpressive (en-IN-NeerjaExpressiveNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "en-IN-NeerjaNeural",
-        "label": "Nữ - Neerja (en-IN-NeerjaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "en-KE-AsiliaNeural",
-        "label": "Nữ - Asilia (en-KE-AsiliaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "en-NG-EzinneNeural",
-        "label": "Nữ - Ezinne (en-NG-EzinneNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "en-NZ-MollyNeural",
-        "label": "Nữ - Molly (en-NZ-MollyNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "en-PH-RosaNeural",
-        "label": "Nữ - Rosa (en-PH-RosaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "en-SG-LunaNeural",
-        "label": "Nữ - Luna (en-SG-LunaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "en-TZ-ImaniNeural",
-        "label": "Nữ - Imani (en-TZ-ImaniNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "en-US-AnaNeural",
-        "label": "Nữ - Ana (en-US-AnaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "en-US-AriaNeural",
-        "label": "Nữ - Aria (en-US-AriaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "en-US-AvaMultilingualNeural",
-        "label": "Nữ - AvaMultilingual (en-US-AvaMultilingualNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "en-US-AvaNeural",
-        "label": "Nữ - Ava (en-US-AvaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "en-US-EmmaMultilingualNeural",
-        "label": "Nữ - EmmaMultilingual (en-US-EmmaMultilingualNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "en-US-EmmaNeural",
-        "label": "Nữ - Emma (en-US-EmmaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "en-US-JennyNeural",
-        "label": "Nữ - Jenny (en-US-JennyNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "en-US-MichelleNeural",
-        "label": "Nữ - Michelle (en-US-MichelleNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "en-ZA-LeahNeural",
-        "label": "Nữ - Leah (en-ZA-LeahNeural)"
-      }
-    ]
-  },
-  "es": {
-    "display_name": "Tiếng Tây Ban Nha",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "es-AR-TomasNeural",
-        "label": "Nam - Tomas (es-AR-TomasNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "es-BO-MarceloNeural",
-        "label": "Nam - Marcelo (es-BO-MarceloNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "es-CL-LorenzoNeural",
-        "label": "Nam - Lorenzo (es-CL-LorenzoNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "es-CO-GonzaloNeural",
-        "label": "Nam - Gonzalo (es-CO-GonzaloNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "es-CR-JuanNeural",
-        "label": "Nam - Juan (es-CR-JuanNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "es-CU-ManuelNeural",
-        "label": "Nam - Manuel (es-CU-ManuelNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "es-DO-EmilioNeural",
-        "label": "Nam - Emilio (es-DO-EmilioNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "es-EC-LuisNeural",
-        "label": "Nam - Luis (es-EC-LuisNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "es-ES-AlvaroNeural",
-        "label": "Nam - Alvaro (es-ES-AlvaroNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "es-GQ-JavierNeural",
-        "label": "Nam - Javier (es-GQ-JavierNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "es-GT-AndresNeural",
-        "label": "Nam - Andres (es-GT-AndresNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "es-HN-CarlosNeural",
-        "label": "Nam - Carlos (es-HN-CarlosNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "es-MX-JorgeNeural",
-        "label": "Nam - Jorge (es-MX-JorgeNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "es-NI-FedericoNeural",
-        "label": "Nam - Federico (es-NI-FedericoNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "es-PA-RobertoNeural",
-        "label": "Nam - Roberto (es-PA-RobertoNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "es-PE-AlexNeural",
-        "label": "Nam - Alex (es-PE-AlexNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "es-PR-VictorNeural",
-        "label": "Nam - Victor (es-PR-VictorNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "es-PY-MarioNeural",
-        "label": "Nam - Mario (es-PY-MarioNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "es-SV-RodrigoNeural",
-        "label": "Nam - Rodrigo (es-SV-RodrigoNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "es-US-AlonsoNeural",
-        "label": "Nam - Alonso (es-US-AlonsoNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "es-UY-MateoNeural",
-        "label": "Nam - Mateo (es-UY-MateoNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "es-VE-SebastianNeural",
-        "label": "Nam - Sebastian (es-VE-SebastianNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "es-AR-ElenaNeural",
-        "label": "Nữ - Elena (es-AR-ElenaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "es-BO-SofiaNeural",
-        "label": "Nữ - Sofia (es-BO-SofiaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "es-CL-CatalinaNeural",
-        "label": "Nữ - Catalina (es-CL-CatalinaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "es-CO-SalomeNeural",
-        "label": "Nữ - Salome (es-CO-SalomeNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "es-CR-MariaNeural",
-        "label": "Nữ - Maria (es-CR-MariaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "es-CU-BelkysNeural",
-        "label": "Nữ - Belkys (es-CU-BelkysNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "es-DO-RamonaNeural",
-        "label": "Nữ - Ramona (es-DO-RamonaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "es-EC-AndreaNeural",
-        "label": "Nữ - Andrea (es-EC-AndreaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "es-ES-ElviraNeural",
-        "label": "Nữ - Elvira (es-ES-ElviraNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "es-ES-XimenaNeural",
-        "label": "Nữ - Ximena (es-ES-XimenaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "es-GQ-TeresaNeural",
-        "label": "Nữ - Teresa (es-GQ-TeresaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "es-GT-MartaNeural",
-        "label": "Nữ - Marta (es-GT-MartaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "es-HN-KarlaNeural",
-        "label": "Nữ - Karla (es-HN-KarlaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "es-MX-DaliaNeural",
-        "label": "Nữ - Dalia (es-MX-DaliaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "es-NI-YolandaNeural",
-        "label": "Nữ - Yolanda (es-NI-YolandaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "es-PA-MargaritaNeural",
-        "label": "Nữ - Margarita (es-PA-MargaritaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "es-PE-CamilaNeural",
-        "label": "Nữ - Camila (es-PE-CamilaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "es-PR-KarinaNeural",
-        "label": "Nữ - Karina (es-PR-KarinaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "es-PY-TaniaNeural",
-        "label": "Nữ - Tania (es-PY-TaniaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "es-SV-LorenaNeural",
-        "label": "Nữ - Lorena (es-SV-LorenaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "es-US-PalomaNeural",
-        "label": "Nữ - Paloma (es-US-PalomaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "es-UY-ValentinaNeural",
-        "label": "Nữ - Valentina (es-UY-ValentinaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "es-VE-PaolaNeural",
-        "label": "Nữ - Paola (es-VE-PaolaNeural)"
-      }
-    ]
-  },
-  "et": {
-    "display_name": "Tiếng Estonia",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "et-EE-KertNeural",
-        "label": "Nam - Kert (et-EE-KertNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "et-EE-AnuNeural",
-        "label": "Nữ - Anu (et-EE-AnuNeural)"
-      }
-    ]
-  },
-  "fa": {
-    "display_name": "Tiếng Ba Tư",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "fa-IR-FaridNeural",
-        "label": "Nam - Farid (fa-IR-FaridNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "fa-IR-DilaraNeural",
-        "label": "Nữ - Dilara (fa-IR-DilaraNeural)"
-      }
-    ]
-  },
-  "fi": {
-    "display_name": "Tiếng Phần Lan",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "fi-FI-HarriNeural",
-        "label": "Nam - Harri (fi-FI-HarriNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "fi-FI-NooraNeural",
-        "label": "Nữ - Noora (fi-FI-NooraNeural)"
-      }
-    ]
-  },
-  "fil": {
-    "display_name": "Tiếng Filipino",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "fil-PH-AngeloNeural",
-        "label": "Nam - Angelo (fil-PH-AngeloNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "fil-PH-BlessicaNeural",
-        "label": "Nữ - Blessica (fil-PH-BlessicaNeural)"
-      }
-    ]
-  },
-  "fr": {
-    "display_name": "Tiếng Pháp",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "fr-BE-GerardNeural",
-        "label": "Nam - Gerard (fr-BE-GerardNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "fr-CA-AntoineNeural",
-        "label": "Nam - Antoine (fr-CA-AntoineNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "fr-CA-JeanNeural",
-        "label": "Nam - Jean (fr-CA-JeanNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "fr-CA-ThierryNeural",
-        "label": "Nam - Thierry (fr-CA-ThierryNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "fr-CH-FabriceNeural",
-        "label": "Nam - Fabrice (fr-CH-FabriceNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "fr-FR-HenriNeural",
-        "label": "Nam - Henri (fr-FR-HenriNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "fr-FR-RemyMultilingualNeural",
-        "label": "Nam - RemyMultilingual (fr-FR-RemyMultilingualNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "fr-BE-CharlineNeural",
-        "label": "Nữ - Charline (fr-BE-CharlineNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "fr-CA-SylvieNeural",
-        "label": "Nữ - Sylvie (fr-CA-SylvieNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "fr-CH-ArianeNeural",
-        "label": "Nữ - Ariane (fr-CH-ArianeNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "fr-FR-DeniseNeural",
-        "label": "Nữ - Denise (fr-FR-DeniseNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "fr-FR-EloiseNeural",
-        "label": "Nữ - Eloise (fr-FR-EloiseNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "fr-FR-VivienneMultilingualNeural",
-        "label": "Nữ - VivienneMultilingual (fr-FR-VivienneMultilingualNeural)"
-      }
-    ]
-  },
-  "ga": {
-    "display_name": "Tiếng Ireland",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "ga-IE-ColmNeural",
-        "label": "Nam - Colm (ga-IE-ColmNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "ga-IE-OrlaNeural",
-        "label": "Nữ - Orla (ga-IE-OrlaNeural)"
-      }
-    ]
-  },
-  "gl": {
-    "display_name": "Tiếng Galicia",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "gl-ES-RoiNeural",
-        "label": "Nam - Roi (gl-ES-RoiNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "gl-ES-SabelaNeural",
-        "label": "Nữ - Sabela (gl-ES-SabelaNeural)"
-      }
-    ]
-  },
-  "gu": {
-    "display_name": "Tiếng Gujarati",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "gu-IN-NiranjanNeural",
-        "label": "Nam - Niranjan (gu-IN-NiranjanNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "gu-IN-DhwaniNeural",
-        "label": "Nữ - Dhwani (gu-IN-DhwaniNeural)"
-      }
-    ]
-  },
-  "he": {
-    "display_name": "Tiếng Hebrew",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "he-IL-AvriNeural",
-        "label": "Nam - Avri (he-IL-AvriNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "he-IL-HilaNeural",
-        "label": "Nữ - Hila (he-IL-HilaNeural)"
-      }
-    ]
-  },
-  "hi": {
-    "display_name": "Tiếng Hindi",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "hi-IN-MadhurNeural",
-        "label": "Nam - Madhur (hi-IN-MadhurNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "hi-IN-SwaraNeural",
-        "label": "Nữ - Swara (hi-IN-SwaraNeural)"
-      }
-    ]
-  },
-  "hr": {
-    "display_name": "Tiếng Croatia",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "hr-HR-SreckoNeural",
-        "label": "Nam - Srecko (hr-HR-SreckoNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "hr-HR-GabrijelaNeural",
-        "label": "Nữ - Gabrijela (hr-HR-GabrijelaNeural)"
-      }
-    ]
-  },
-  "hu": {
-    "display_name": "Tiếng Hungary",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "hu-HU-TamasNeural",
-        "label": "Nam - Tamas (hu-HU-TamasNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "hu-HU-NoemiNeural",
-        "label": "Nữ - Noemi (hu-HU-NoemiNeural)"
-      }
-    ]
-  },
-  "id": {
-    "display_name": "Tiếng Indonesia",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "id-ID-ArdiNeural",
-        "label": "Nam - Ardi (id-ID-ArdiNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "id-ID-GadisNeural",
-        "label": "Nữ - Gadis (id-ID-GadisNeural)"
-      }
-    ]
-  },
-  "is": {
-    "display_name": "Tiếng Iceland",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "is-IS-GunnarNeural",
-        "label": "Nam - Gunnar (is-IS-GunnarNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "is-IS-GudrunNeural",
-        "label": "Nữ - Gudrun (is-IS-GudrunNeural)"
-      }
-    ]
-  },
-  "it": {
-    "display_name": "Tiếng Ý",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "it-IT-DiegoNeural",
-        "label": "Nam - Diego (it-IT-DiegoNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "it-IT-GiuseppeMultilingualNeural",
-        "label": "Nam - GiuseppeMultilingual (it-IT-GiuseppeMultilingualNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "it-IT-ElsaNeural",
-        "label": "Nữ - Elsa (it-IT-ElsaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "it-IT-IsabellaNeural",
-        "label": "Nữ - Isabella (it-IT-IsabellaNeural)"
-      }
-    ]
-  },
-  "iu": {
-    "display_name": "Tiếng Inuktitut",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "iu-Cans-CA-TaqqiqNeural",
-        "label": "Nam - Taqqiq (iu-Cans-CA-TaqqiqNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "iu-Latn-CA-TaqqiqNeural",
-        "label": "Nam - Taqqiq (iu-Latn-CA-TaqqiqNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "iu-Cans-CA-SiqiniqNeural",
-        "label": "Nữ - Siqiniq (iu-Cans-CA-SiqiniqNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "iu-Latn-CA-SiqiniqNeural",
-        "label": "Nữ - Siqiniq (iu-Latn-CA-SiqiniqNeural)"
-      }
-    ]
-  },
-  "ja": {
-    "display_name": "Tiếng Nhật",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "ja-JP-KeitaNeural",
-        "label": "Nam - Keita (ja-JP-KeitaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "ja-JP-NanamiNeural",
-        "label": "Nữ - Nanami (ja-JP-NanamiNeural)"
-      }
-    ]
-  },
-  "jv": {
-    "display_name": "Tiếng Java",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "jv-ID-DimasNeural",
-        "label": "Nam - Dimas (jv-ID-DimasNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "jv-ID-SitiNeural",
-        "label": "Nữ - Siti (jv-ID-SitiNeural)"
-      }
-    ]
-  },
-  "ka": {
-    "display_name": "Tiếng Georgia",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "ka-GE-GiorgiNeural",
-        "label": "Nam - Giorgi (ka-GE-GiorgiNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "ka-GE-EkaNeural",
-        "label": "Nữ - Eka (ka-GE-EkaNeural)"
-      }
-    ]
-  },
-  "kk": {
-    "display_name": "Tiếng Kazakh",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "kk-KZ-DauletNeural",
-        "label": "Nam - Daulet (kk-KZ-DauletNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "kk-KZ-AigulNeural",
-        "label": "Nữ - Aigul (kk-KZ-AigulNeural)"
-      }
-    ]
-  },
-  "km": {
-    "display_name": "Tiếng Khmer",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "km-KH-PisethNeural",
-        "label": "Nam - Piseth (km-KH-PisethNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "km-KH-SreymomNeural",
-        "label": "Nữ - Sreymom (km-KH-SreymomNeural)"
-      }
-    ]
-  },
-  "kn": {
-    "display_name": "Tiếng Kannada",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "kn-IN-GaganNeural",
-        "label": "Nam - Gagan (kn-IN-GaganNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "kn-IN-SapnaNeural",
-        "label": "Nữ - Sapna (kn-IN-SapnaNeural)"
-      }
-    ]
-  },
-  "ko": {
-    "display_name": "Tiếng Hàn",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "ko-KR-HyunsuMultilingualNeural",
-        "label": "Nam - HyunsuMultilingual (ko-KR-HyunsuMultilingualNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "ko-KR-InJoonNeural",
-        "label": "Nam - InJoon (ko-KR-InJoonNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "ko-KR-SunHiNeural",
-        "label": "Nữ - SunHi (ko-KR-SunHiNeural)"
-      }
-    ]
-  },
-  "lo": {
-    "display_name": "Tiếng Lào",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "lo-LA-ChanthavongNeural",
-        "label": "Nam - Chanthavong (lo-LA-ChanthavongNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "lo-LA-KeomanyNeural",
-        "label": "Nữ - Keomany (lo-LA-KeomanyNeural)"
-      }
-    ]
-  },
-  "lt": {
-    "display_name": "Tiếng Lithuania",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "lt-LT-LeonasNeural",
-        "label": "Nam - Leonas (lt-LT-LeonasNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "lt-LT-OnaNeural",
-        "label": "Nữ - Ona (lt-LT-OnaNeural)"
-      }
-    ]
-  },
-  "lv": {
-    "display_name": "Tiếng Latvia",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "lv-LV-NilsNeural",
-        "label": "Nam - Nils (lv-LV-NilsNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "lv-LV-EveritaNeural",
-        "label": "Nữ - Everita (lv-LV-EveritaNeural)"
-      }
-    ]
-  },
-  "mk": {
-    "display_name": "Tiếng Macedonia",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "mk-MK-AleksandarNeural",
-        "label": "Nam - Aleksandar (mk-MK-AleksandarNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "mk-MK-MarijaNeural",
-        "label": "Nữ - Marija (mk-MK-MarijaNeural)"
-      }
-    ]
-  },
-  "ml": {
-    "display_name": "Tiếng Malayalam",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "ml-IN-MidhunNeural",
-        "label": "Nam - Midhun (ml-IN-MidhunNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "ml-IN-SobhanaNeural",
-        "label": "Nữ - Sobhana (ml-IN-SobhanaNeural)"
-      }
-    ]
-  },
-  "mn": {
-    "display_name": "Tiếng Mông Cổ",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "mn-MN-BataaNeural",
-        "label": "Nam - Bataa (mn-MN-BataaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "mn-MN-YesuiNeural",
-        "label": "Nữ - Yesui (mn-MN-YesuiNeural)"
-      }
-    ]
-  },
-  "mr": {
-    "display_name": "Tiếng Marathi",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "mr-IN-ManoharNeural",
-        "label": "Nam - Manohar (mr-IN-ManoharNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "mr-IN-AarohiNeural",
-        "label": "Nữ - Aarohi (mr-IN-AarohiNeural)"
-      }
-    ]
-  },
-  "ms": {
-    "display_name": "Tiếng Malaysia",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "ms-MY-OsmanNeural",
-        "label": "Nam - Osman (ms-MY-OsmanNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "ms-MY-YasminNeural",
-        "label": "Nữ - Yasmin (ms-MY-YasminNeural)"
-      }
-    ]
-  },
-  "mt": {
-    "display_name": "Tiếng Malta",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "mt-MT-JosephNeural",
-        "label": "Nam - Joseph (mt-MT-JosephNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "mt-MT-GraceNeural",
-        "label": "Nữ - Grace (mt-MT-GraceNeural)"
-      }
-    ]
-  },
-  "my": {
-    "display_name": "Tiếng Myanmar",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "my-MM-ThihaNeural",
-        "label": "Nam - Thiha (my-MM-ThihaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "my-MM-NilarNeural",
-        "label": "Nữ - Nilar (my-MM-NilarNeural)"
-      }
-    ]
-  },
-  "nb": {
-    "display_name": "Tiếng Na Uy",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "nb-NO-FinnNeural",
-        "label": "Nam - Finn (nb-NO-FinnNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "nb-NO-PernilleNeural",
-        "label": "Nữ - Pernille (nb-NO-PernilleNeural)"
-      }
-    ]
-  },
-  "ne": {
-    "display_name": "Tiếng Nepal",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "ne-NP-SagarNeural",
-        "label": "Nam - Sagar (ne-NP-SagarNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "ne-NP-HemkalaNeural",
-        "label": "Nữ - Hemkala (ne-NP-HemkalaNeural)"
-      }
-    ]
-  },
-  "nl": {
-    "display_name": "Tiếng Hà Lan",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "nl-BE-ArnaudNeural",
-        "label": "Nam - Arnaud (nl-BE-ArnaudNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "nl-NL-MaartenNeural",
-        "label": "Nam - Maarten (nl-NL-MaartenNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "nl-BE-DenaNeural",
-        "label": "Nữ - Dena (nl-BE-DenaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "nl-NL-ColetteNeural",
-        "label": "Nữ - Colette (nl-NL-ColetteNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "nl-NL-FennaNeural",
-        "label": "Nữ - Fenna (nl-NL-FennaNeural)"
-      }
-    ]
-  },
-  "pl": {
-    "display_name": "Tiếng Ba Lan",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "pl-PL-MarekNeural",
-        "label": "Nam - Marek (pl-PL-MarekNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "pl-PL-ZofiaNeural",
-        "label": "Nữ - Zofia (pl-PL-ZofiaNeural)"
-      }
-    ]
-  },
-  "ps": {
-    "display_name": "Tiếng Pashto",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "ps-AF-GulNawazNeural",
-        "label": "Nam - GulNawaz (ps-AF-GulNawazNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "ps-AF-LatifaNeural",
-        "label": "Nữ - Latifa (ps-AF-LatifaNeural)"
-      }
-    ]
-  },
-  "pt": {
-    "display_name": "Tiếng Bồ Đào Nha",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "pt-BR-AntonioNeural",
-        "label": "Nam - Antonio (pt-BR-AntonioNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "pt-PT-DuarteNeural",
-        "label": "Nam - Duarte (pt-PT-DuarteNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "pt-BR-FranciscaNeural",
-        "label": "Nữ - Francisca (pt-BR-FranciscaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "pt-BR-ThalitaMultilingualNeural",
-        "label": "Nữ - ThalitaMultilingual (pt-BR-ThalitaMultilingualNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "pt-PT-RaquelNeural",
-        "label": "Nữ - Raquel (pt-PT-RaquelNeural)"
-      }
-    ]
-  },
-  "ro": {
-    "display_name": "Tiếng Romania",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "ro-RO-EmilNeural",
-        "label": "Nam - Emil (ro-RO-EmilNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "ro-RO-AlinaNeural",
-        "label": "Nữ - Alina (ro-RO-AlinaNeural)"
-      }
-    ]
-  },
-  "ru": {
-    "display_name": "Tiếng Nga",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "ru-RU-DmitryNeural",
-        "label": "Nam - Dmitry (ru-RU-DmitryNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "ru-RU-SvetlanaNeural",
-        "label": "Nữ - Svetlana (ru-RU-SvetlanaNeural)"
-      }
-    ]
-  },
-  "si": {
-    "display_name": "Tiếng Sinhala",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "si-LK-SameeraNeural",
-        "label": "Nam - Sameera (si-LK-SameeraNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "si-LK-ThiliniNeural",
-        "label": "Nữ - Thilini (si-LK-ThiliniNeural)"
-      }
-    ]
-  },
-  "sk": {
-    "display_name": "Tiếng Slovakia",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "sk-SK-LukasNeural",
-        "label": "Nam - Lukas (sk-SK-LukasNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "sk-SK-ViktoriaNeural",
-        "label": "Nữ - Viktoria (sk-SK-ViktoriaNeural)"
-      }
-    ]
-  },
-  "sl": {
-    "display_name": "Tiếng Slovenia",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "sl-SI-RokNeural",
-        "label": "Nam - Rok (sl-SI-RokNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "sl-SI-PetraNeural",
-        "label": "Nữ - Petra (sl-SI-PetraNeural)"
-      }
-    ]
-  },
-  "so": {
-    "display_name": "Tiếng Somali",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "so-SO-MuuseNeural",
-        "label": "Nam - Muuse (so-SO-MuuseNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "so-SO-UbaxNeural",
-        "label": "Nữ - Ubax (so-SO-UbaxNeural)"
-      }
-    ]
-  },
-  "sq": {
-    "display_name": "Tiếng Albania",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "sq-AL-IlirNeural",
-        "label": "Nam - Ilir (sq-AL-IlirNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "sq-AL-AnilaNeural",
-        "label": "Nữ - Anila (sq-AL-AnilaNeural)"
-      }
-    ]
-  },
-  "sr": {
-    "display_name": "Tiếng Serbia",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "sr-RS-NicholasNeural",
-        "label": "Nam - Nicholas (sr-RS-NicholasNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "sr-RS-SophieNeural",
-        "label": "Nữ - Sophie (sr-RS-SophieNeural)"
-      }
-    ]
-  },
-  "su": {
-    "display_name": "Tiếng Sunda",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "su-ID-JajangNeural",
-        "label": "Nam - Jajang (su-ID-JajangNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "su-ID-TutiNeural",
-        "label": "Nữ - Tuti (su-ID-TutiNeural)"
-      }
-    ]
-  },
-  "sv": {
-    "display_name": "Tiếng Thụy Điển",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "sv-SE-MattiasNeural",
-        "label": "Nam - Mattias (sv-SE-MattiasNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "sv-SE-SofieNeural",
-        "label": "Nữ - Sofie (sv-SE-SofieNeural)"
-      }
-    ]
-  },
-  "sw": {
-    "display_name": "Tiếng Swahili",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "sw-KE-RafikiNeural",
-        "label": "Nam - Rafiki (sw-KE-RafikiNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "sw-TZ-DaudiNeural",
-        "label": "Nam - Daudi (sw-TZ-DaudiNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "sw-KE-ZuriNeural",
-        "label": "Nữ - Zuri (sw-KE-ZuriNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "sw-TZ-RehemaNeural",
-        "label": "Nữ - Rehema (sw-TZ-RehemaNeural)"
-      }
-    ]
-  },
-  "ta": {
-    "display_name": "Tiếng Tamil",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "ta-IN-ValluvarNeural",
-        "label": "Nam - Valluvar (ta-IN-ValluvarNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "ta-LK-KumarNeural",
-        "label": "Nam - Kumar (ta-LK-KumarNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "ta-MY-SuryaNeural",
-        "label": "Nam - Surya (ta-MY-SuryaNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "ta-SG-AnbuNeural",
-        "label": "Nam - Anbu (ta-SG-AnbuNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "ta-IN-PallaviNeural",
-        "label": "Nữ - Pallavi (ta-IN-PallaviNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "ta-LK-SaranyaNeural",
-        "label": "Nữ - Saranya (ta-LK-SaranyaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "ta-MY-KaniNeural",
-        "label": "Nữ - Kani (ta-MY-KaniNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "ta-SG-VenbaNeural",
-        "label": "Nữ - Venba (ta-SG-VenbaNeural)"
-      }
-    ]
-  },
-  "te": {
-    "display_name": "Tiếng Telugu",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "te-IN-MohanNeural",
-        "label": "Nam - Mohan (te-IN-MohanNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "te-IN-ShrutiNeural",
-        "label": "Nữ - Shruti (te-IN-ShrutiNeural)"
-      }
-    ]
-  },
-  "th": {
-    "display_name": "Tiếng Thái",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "th-TH-NiwatNeural",
-        "label": "Nam - Niwat (th-TH-NiwatNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "th-TH-PremwadeeNeural",
-        "label": "Nữ - Premwadee (th-TH-PremwadeeNeural)"
-      }
-    ]
-  },
-  "tr": {
-    "display_name": "Tiếng Thổ Nhĩ Kỳ",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "tr-TR-AhmetNeural",
-        "label": "Nam - Ahmet (tr-TR-AhmetNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "tr-TR-EmelNeural",
-        "label": "Nữ - Emel (tr-TR-EmelNeural)"
-      }
-    ]
-  },
-  "uk": {
-    "display_name": "Tiếng Ukraine",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "uk-UA-OstapNeural",
-        "label": "Nam - Ostap (uk-UA-OstapNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "uk-UA-PolinaNeural",
-        "label": "Nữ - Polina (uk-UA-PolinaNeural)"
-      }
-    ]
-  },
-  "ur": {
-    "display_name": "Tiếng Urdu",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "ur-IN-SalmanNeural",
-        "label": "Nam - Salman (ur-IN-SalmanNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "ur-PK-AsadNeural",
-        "label": "Nam - Asad (ur-PK-AsadNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "ur-IN-GulNeural",
-        "label": "Nữ - Gul (ur-IN-GulNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "ur-PK-UzmaNeural",
-        "label": "Nữ - Uzma (ur-PK-UzmaNeural)"
-      }
-    ]
-  },
-  "uz": {
-    "display_name": "Tiếng Uzbek",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "uz-UZ-SardorNeural",
-        "label": "Nam - Sardor (uz-UZ-SardorNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "uz-UZ-MadinaNeural",
-        "label": "Nữ - Madina (uz-UZ-MadinaNeural)"
-      }
-    ]
-  },
-  "vi": {
-    "display_name": "Việt Nam",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "vi-VN-NamMinhNeural",
-        "label": "Nam - NamMinh (vi-VN-NamMinhNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "vi-VN-HoaiMyNeural",
-        "label": "Nữ - HoaiMy (vi-VN-HoaiMyNeural)"
-      }
-    ]
-  },
-  "zh": {
-    "display_name": "Tiếng Trung",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "zh-CN-YunjianNeural",
-        "label": "Nam - Yunjian (zh-CN-YunjianNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "zh-CN-YunxiNeural",
-        "label": "Nam - Yunxi (zh-CN-YunxiNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "zh-CN-YunxiaNeural",
-        "label": "Nam - Yunxia (zh-CN-YunxiaNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "zh-CN-YunyangNeural",
-        "label": "Nam - Yunyang (zh-CN-YunyangNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "zh-HK-WanLungNeural",
-        "label": "Nam - WanLung (zh-HK-WanLungNeural)"
-      },
-      {
-        "gender": "Nam",
-        "shortname": "zh-TW-YunJheNeural",
-        "label": "Nam - YunJhe (zh-TW-YunJheNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "zh-CN-XiaoxiaoNeural",
-        "label": "Nữ - Xiaoxiao (zh-CN-XiaoxiaoNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "zh-CN-XiaoyiNeural",
-        "label": "Nữ - Xiaoyi (zh-CN-XiaoyiNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "zh-CN-liaoning-XiaobeiNeural",
-        "label": "Nữ - Xiaobei (zh-CN-liaoning-XiaobeiNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "zh-CN-shaanxi-XiaoniNeural",
-        "label": "Nữ - Xiaoni (zh-CN-shaanxi-XiaoniNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "zh-HK-HiuGaaiNeural",
-        "label": "Nữ - HiuGaai (zh-HK-HiuGaaiNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "zh-HK-HiuMaanNeural",
-        "label": "Nữ - HiuMaan (zh-HK-HiuMaanNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "zh-TW-HsiaoChenNeural",
-        "label": "Nữ - HsiaoChen (zh-TW-HsiaoChenNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "zh-TW-HsiaoYuNeural",
-        "label": "Nữ - HsiaoYu (zh-TW-HsiaoYuNeural)"
-      }
-    ]
-  },
-  "zu": {
-    "display_name": "Tiếng Zulu",
-    "voices": [
-      {
-        "gender": "Nam",
-        "shortname": "zu-ZA-ThembaNeural",
-        "label": "Nam - Themba (zu-ZA-ThembaNeural)"
-      },
-      {
-        "gender": "Nữ",
-        "shortname": "zu-ZA-ThandoNeural",
-        "label": "Nữ - Thando (zu-ZA-ThandoNeural)"
-      }
-    ]
-  }
-}
+# -*- coding: utf-8 -*-
+"""
+Dữ liệu voices (tương thích ngược)
+Dữ liệu thật nằm trong voices.json và được nạp lười qua voice_catalog;
+`from app.core.voices_data import voices_data` vẫn trả về dict dạng cũ.
+"""
+
+from .voice_catalog import voice_catalog
+
+
+def __getattr__(name):
+    if name == "voices_data":
+        return voice_catalog.languages()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -10,15 +10,24 @@ from app.uiToolbarTab import UIToolbarTab
 
 from app.core.config import AppConfig
 from app.core.language_manager import language_manager
+from app.core.download_queue import download_queue
+from app.core.download_archive import download_archive
+from app.core.job_scheduler import job_scheduler
 
 from pathlib import Path
 
-from app.workers.download_Worker import DownloadRunnable
+from app.workers.download_Worker import DownloadRunnable, DownloadTask, PlaylistExpandRunnable
+from app.utils.file_ops import remove_tree
+from app.utils.ytdlp_progress import format_bytes
 import os
 from datetime import datetime
 
 import subprocess
 
+# Chu kỳ cập nhật thanh tiến trình tổng (ms)
+STATUS_REFRESH_MS = 100
+
+
 class DownloadVideoTab(UIToolbarTab):
     """
     Tab Convert đơn giản để minh họa việc áp dụng HistoryPanel cho mỗi tab
@@ -38,14 +47,28 @@ class DownloadVideoTab(UIToolbarTab):
         self.max_workers = 4
         self.running = 0
         self.stopped = False
-
-        # Thread pool for QRunnable-based downloads
+        # Danh sách task sau khi mở rộng playlist (DownloadTask)
+        self.download_tasks = []
+        self._expander = None
+        # Batch đang chạy trong download_queue (lưu SQLite để tải tiếp sau khi tắt app)
+        self.batch_id = None
+        # Trạng thái gọn của từng lượt tải đang chạy (DownloadProgress), gộp lên UI theo timer
+        self._task_status = {}
+        self._finished_tasks = 0
+        self._status_dirty = False
+        self._status_timer = QTimer(self)
+        self._status_timer.setInterval(STATUS_REFRESH_MS)
+        self._status_timer.timeout.connect(self._refresh_status)
+
+        # Thread pool for the playlist expander
         self.thread_pool = QThreadPool.globalInstance()
         # Upper bound; actual concurrency is controlled by self.max_workers and self.running
         try:
             self.thread_pool.setMaxThreadCount(8)
         except Exception:
             pass
+        # Downloads run on the shared job scheduler ("download" queue, global thread budget)
+        self.download_executor = job_scheduler.executor("download", label="video-download")
         
         # Language management
         self.languages = language_manager.get_available_languages()
@@ -80,6 +103,7 @@ class DownloadVideoTab(UIToolbarTab):
         self.active_threads.clear()
         self.download_button.setEnabled(True)
         self.stop_button.setEnabled(False)
+        self._refresh_resume_button()
         self._reset_progress()
 
     def _safe_start_download(self):
@@ -200,10 +224,14 @@ class DownloadVideoTab(UIToolbarTab):
         self.audio_only = QCheckBox("🎵 Tải âm thanh MP3")
         self.include_thumb = QCheckBox("🖼️ Tải ảnh thumbnail")
         self.subtitle_only = QCheckBox("📜 Chỉ tải phụ đề")
+        self.skip_archived = QCheckBox("⏭ Bỏ qua video đã tải")
+        self.skip_archived.setChecked(True)
+        self.skip_archived.setToolTip("Không tải lại video đã có trong kho lưu trữ (mọi thư mục, mọi lần tải)")
 
         row.addWidget(self.audio_only)
         row.addWidget(self.include_thumb)
         row.addWidget(self.subtitle_only)
+        row.addWidget(self.skip_archived)
         row.addStretch()
         parent_layout.addLayout(row)
 
@@ -265,8 +293,29 @@ class DownloadVideoTab(UIToolbarTab):
         self.stop_button.setEnabled(False)
         self.stop_button.clicked.connect(self.stop_download)
         self.stop_button.setObjectName("btn_style_1")
+        self.resume_button = QPushButton(
+            "♻️ Tải tiếp danh sách dở",
+            clicked=self.resume_download
+        )
+        self.resume_button.setObjectName("btn_style_1")
         content_layout.addWidget(self.download_button)
+        content_layout.addWidget(self.resume_button)
         content_layout.addWidget(self.stop_button)
+        self._refresh_resume_button()
+
+    def _refresh_resume_button(self) -> None:
+        """Bật nút tải tiếp khi còn batch chưa xong trong download_queue"""
+        try:
+            batch = download_queue.unfinished_batch()
+        except Exception as e:
+            print(f"Error reading download queue: {e}")
+            batch = None
+        idle = not self.active_threads and self.running <= 0
+        self.resume_button.setEnabled(batch is not None and idle)
+        if batch is not None:
+            self.resume_button.setToolTip(f"Còn {batch['remaining']} video chưa tải xong")
+        else:
+            self.resume_button.setToolTip("")
 
     def open_folder_dialog(self):
         folder_path = QFileDialog.getExistingDirectory(self, "Chọn thư mục")
@@ -322,6 +371,18 @@ class DownloadVideoTab(UIToolbarTab):
                 QMessageBox.warning(self, "Cảnh báo", "Bạn chưa nhập URL nào.")
                 return
 
+            # Danh sách cũ chưa xong: hỏi trước khi bỏ
+            pending = download_queue.unfinished_batch()
+            if pending is not None:
+                reply = QMessageBox.question(
+                    self, "Danh sách chưa tải xong",
+                    f"Danh sách trước còn {pending['remaining']} video chưa tải xong.\n"
+                    "Bỏ danh sách đó (xóa file tải dở) và bắt đầu danh sách mới?",
+                    QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+                if reply != QMessageBox.Yes:
+                    return
+                self._discard_batch(pending["id"])
+
             self.urls = urls
             selected_code = self.language_box.currentData()
 
@@ -348,12 +409,9 @@ class DownloadVideoTab(UIToolbarTab):
             if selected_sub_mode:
                 self._add_log_item(f"📜 Chế độ {sub_mode_name}")
 
-            # Cap workers to number of URLs to avoid spawning unnecessary threads
-            self.max_workers = min(int(self.theard_video.value()), len(self.urls))
-            self._add_log_item(f"Đang chạy với {self.max_workers} thread")
-
             # Update UI
             self.download_button.setEnabled(False)
+            self.resume_button.setEnabled(False)
             self.stop_button.setEnabled(True)
 
             # Set flags
@@ -365,6 +423,7 @@ class DownloadVideoTab(UIToolbarTab):
             self.sub_lang_name_flag = self.language_box.currentText()
             self.include_thumb_flag = self.include_thumb.isChecked()
             self.subtitle_only_flag = self.subtitle_only.isChecked()
+            self.use_archive_flag = self.skip_archived.isChecked()
             self.download_folder = self._create_download_folder()
             
             # Reset progress and start
@@ -372,23 +431,195 @@ class DownloadVideoTab(UIToolbarTab):
             self._update_progress_title("Tiến trình xử lý")
             self._update_progress(15)
             self._add_log_item("🚀 Bắt đầu tải video...")
-            self.download_next_batch()
+            self._expand_and_start()
             
         except Exception as e:
             print(f"Error in _start_download_immediate: {e}")
             self._add_log_item(f"❌ Lỗi khi bắt đầu tải: {e}", "error")
             self._force_reset_state()
 
+    def _expand_and_start(self):
+        """Mở rộng playlist/kênh thành từng video (chạy nền) rồi mới chia cho các thread"""
+        self.download_tasks = []
+        expander = PlaylistExpandRunnable(
+            self.urls,
+            expand_all=self.video_mode != "Video",
+            workers=min(4, len(self.urls)),
+        )
+        expander.signals.message_signal.connect(self._add_log_item)
+        expander.signals.expanded_signal.connect(
+            lambda tasks, e=expander: self._on_tasks_expanded(e, tasks))
+        self._expander = expander
+        if self.video_mode != "Video":
+            self._add_log_item("🔎 Đang lấy danh sách video trong playlist...")
+        self.thread_pool.start(expander)
+
+    def _on_tasks_expanded(self, expander, tasks):
+        # Bỏ qua kết quả của lần tải đã bị dừng/thay thế
+        if expander is not self._expander or self.stopped:
+            return
+        self._expander = None
+        if len(tasks) > len(self.urls):
+            self._add_log_item(f"📃 Tổng cộng {len(tasks)} video từ {len(self.urls)} URL")
+        tasks = self._skip_archived(tasks)
+        self.download_tasks = tasks
+        # Cap workers to number of tasks to avoid spawning unnecessary threads
+        self.max_workers = max(1, min(int(self.theard_video.value()), len(tasks)))
+        self._add_log_item(f"Đang chạy với {self.max_workers} thread")
+        if not tasks:
+            self._add_log_item("✅ Không còn video nào cần tải.")
+            self._force_reset_state()
+            return
+        # Lưu hàng đợi trước khi tải để app tắt giữa chừng vẫn tải tiếp được
+        try:
+            self.batch_id, job_ids = download_queue.create_batch(
+                self.download_folder, self._batch_options(), tasks)
+            tasks = [t._replace(job_id=job_id) for t, job_id in zip(tasks, job_ids)]
+        except Exception as e:
+            print(f"Error saving download queue: {e}")
+            self.batch_id = None
+        self.download_tasks = tasks
+        self.download_next_batch()
+
+    def _batch_options(self) -> dict:
+        """Tuỳ chọn tải lưu kèm batch để tải tiếp y như lần đầu"""
+        return {
+            "urls": self.urls,
+            "video_mode": self.video_mode,
+            "audio_only": self.audio_only_flag,
+            "sub_mode": self.sub_mode_flag,
+            "sub_lang": self.sub_lang_code_flag,
+            "sub_lang_name": self.sub_lang_name_flag,
+            "include_thumb": self.include_thumb_flag,
+            "subtitle_only": self.subtitle_only_flag,
+            "use_archive": self.use_archive_flag,
+        }
+
+    def _skip_archived(self, tasks):
+        """Bỏ các video đã có trong download_archive (job trong hàng đợi được đánh dấu xong)"""
+        if not self.use_archive_flag or self.subtitle_only_flag:
+            return tasks
+        remaining, skipped = [], []
+        for task in tasks:
+            archive_id = task.resolved_archive_id()
+            if download_archive.contains(archive_id):
+                skipped.append((task, archive_id))
+            else:
+                remaining.append(task)
+        for task, archive_id in skipped:
+            files = list(download_archive.lookup(archive_id))
+            if task.job_id is not None:
+                download_queue.mark_done(task.job_id, files)
+            if len(skipped) <= 5:
+                where = f" -> {files[0]}" if files else ""
+                self._add_log_item(f"⏭ Đã tải trước đó: {task.url}{where}")
+        if skipped:
+            self._add_log_item(f"⏭ Bỏ qua {len(skipped)} video đã có trong kho lưu trữ")
+        return remaining
+
+    def resume_download(self):
+        """Tải tiếp batch dở dang: bỏ qua video đã xong, yt-dlp tải tiếp từ file .part"""
+        if self.active_threads or self.running > 0:
+            return
+        try:
+            batch = download_queue.unfinished_batch()
+            if batch is None:
+                QMessageBox.information(self, "Thông báo", "Không có danh sách nào cần tải tiếp.")
+                self._refresh_resume_button()
+                return
+            options = download_queue.batch_options(batch)
+            jobs = download_queue.pending_jobs(batch["id"])
+            counts = download_queue.counts(batch["id"])
+
+            self.stopped = False
+            self.index = 1
+            self.running = 0
+            self.active_threads.clear()
+            self.batch_id = batch["id"]
+            self.urls = options.get("urls") or [job["url"] for job in jobs]
+            self.video_mode = options.get("video_mode", "Video")
+            self.audio_only_flag = options.get("audio_only", False)
+            self.sub_mode_flag = options.get("sub_mode", "")
+            self.sub_lang_code_flag = options.get("sub_lang", "")
+            self.sub_lang_name_flag = options.get("sub_lang_name", "")
+            self.include_thumb_flag = options.get("include_thumb", False)
+            self.subtitle_only_flag = options.get("subtitle_only", False)
+            self.use_archive_flag = options.get("use_archive", False)
+            self.download_folder = batch["download_folder"]
+            os.makedirs(self.download_folder, exist_ok=True)
+            self.download_tasks = self._skip_archived([
+                DownloadTask(job["url"], job["video_index"], job["item_index"], job["id"], job["archive_id"])
+                for job in jobs
+            ])
+
+            self.download_button.setEnabled(False)
+            self.resume_button.setEnabled(False)
+            self.stop_button.setEnabled(True)
+            self._reset_progress()
+            self._update_progress_title("Tiến trình xử lý")
+            self._update_progress(15)
+            self._add_log_item(
+                f"♻️ Tải tiếp {len(jobs)} video còn lại (đã xong {counts.get('done', 0)})")
+            self._add_log_item(f"📁 Thư mục: {self.download_folder}")
+            if not self.download_tasks:
+                self._finish_batch()
+                self._force_reset_state()
+                return
+            self.max_workers = max(1, min(int(self.theard_video.value()), len(self.download_tasks)))
+            self._add_log_item(f"Đang chạy với {self.max_workers} thread")
+            self.download_next_batch()
+        except Exception as e:
+            print(f"Error in resume_download: {e}")
+            self._add_log_item(f"❌ Lỗi khi tải tiếp: {e}", "error")
+            self._force_reset_state()
+
+    def _discard_batch(self, batch_id):
+        """Bỏ batch: xóa thư mục tạm (file .part) của các video chưa xong"""
+        for path in download_queue.staging_dirs(batch_id):
+            remove_tree(path)
+        download_queue.close_batch(batch_id)
+
+    def _record_result(self, task, message: str) -> bool:
+        """
+        Ghi kết quả một video vào download_queue và download_archive.
+        Returns: True nếu video lỗi và còn lượt thử lại
+        """
+        if message == "success":
+            for archive_id, files in getattr(task, "archive_records", {}).items():
+                try:
+                    download_archive.record(archive_id, files)
+                except Exception as e:
+                    print(f"Error updating download archive: {e}")
+        job_id = getattr(task, "job_id", None)
+        if job_id is None:
+            return False
+        try:
+            if message == "success":
+                download_queue.mark_done(job_id, task.output_files)
+            elif message == "skipped":
+                files = download_archive.lookup(task.archive_id) if task.archive_id else {}
+                download_queue.mark_done(job_id, list(files))
+            elif message == "stop" or self.stopped:
+                download_queue.requeue(job_id)
+            else:
+                return download_queue.mark_failed(job_id, message)
+        except Exception as e:
+            print(f"Error updating download queue: {e}")
+        return False
+
     def stop_download(self):
         """Stop all downloads safely without blocking UI"""
         try:
             self.stopped = True
+            if self._expander is not None:
+                self._expander.stop_flag = True
             
             # Update UI immediately
             self._add_log_item("⏹ Đang dừng các tiến trình tải...")
-            # Tắt cả hai nút để tránh nhấp liên tục; sẽ bật lại khi dừng xong
+            # Tắt các nút để tránh nhấp liên tục; sẽ bật lại khi dừng xong
             self.stop_button.setEnabled(False)
             self.download_button.setEnabled(False)
+            self.resume_button.setEnabled(False)
             
             # Use non-blocking approach to stop threads
             self._stop_threads_async()
@@ -434,6 +665,7 @@ class DownloadVideoTab(UIToolbarTab):
             self._reset_progress()
             # Chỉ khi dừng xong mới bật lại Start
             self.download_button.setEnabled(True)
+            self._refresh_resume_button()
                 
         except Exception as e:
             print(f"Error in _complete_stop_process: {e}")
@@ -446,19 +678,20 @@ class DownloadVideoTab(UIToolbarTab):
             self.active_threads.clear()
             self.download_button.setEnabled(True)
             self.stop_button.setEnabled(False)
+            self._refresh_resume_button()
             self._reset_progress()
             
         except Exception as e:
             print(f"Error in force reset: {e}")
 
     def download_next_batch(self):
-        while self.running < self.max_workers and self.index <= len(self.urls) and not self.stopped:
-            url = self.urls[self.index - 1]
+        while self.running < self.max_workers and self.index <= len(self.download_tasks) and not self.stopped:
+            item = self.download_tasks[self.index - 1]
             worker_id = self.running + 1
 
             task = DownloadRunnable(
-                url=url,
-                video_index=self.index,
+                url=item.url,
+                video_index=item.video_index,
                 total_urls=len(self.urls),
                 worker_id=worker_id,
                 video_mode=self.video_mode,
@@ -468,34 +701,58 @@ class DownloadVideoTab(UIToolbarTab):
                 sub_lang_name=self.sub_lang_name_flag,
                 include_thumb=self.include_thumb_flag,
                 subtitle_only=self.subtitle_only_flag,
-                custom_folder_name=self.download_folder
+                custom_folder_name=self.download_folder,
+                item_index=item.item_index,
+                job_id=item.job_id,
+                use_archive=self.use_archive_flag,
+                archive_id=item.resolved_archive_id()
             )
+            if item.job_id is not None:
+                try:
+                    download_queue.mark_running(item.job_id, task.staging_path())
+                except Exception as e:
+                    print(f"Error updating download queue: {e}")
 
             # Connect signals
             task.signals.message_signal.connect(self._add_log_item)
-            task.signals.finished_signal.connect(self.handle_thread_done)
-            task.signals.progress_signal.connect(self.update_progress)
+            task.signals.finished_signal.connect(
+                lambda message, t=task: self.handle_thread_done(message, t))
+            task.signals.status_signal.connect(
+                lambda progress, t=task: self._on_task_status(t, progress))
             task.signals.error_signal.connect(self.error_thread)
             self.active_threads.append(task)
-            self.thread_pool.start(task)
+            self.download_executor.submit(task.run)
             self.running += 1
+            if not self._status_timer.isActive():
+                self._status_timer.start()
             self.index += 1
 
-    def handle_thread_done(self, message: str = ""):
-        """Handle when a thread finishes - no parameters needed"""
+    def handle_thread_done(self, message: str = "", task=None):
+        """Handle when a thread finishes"""
         self.running -= 1
-           
 
         # Clean up active tasks list
-        if self.active_threads:
+        if task in self.active_threads:
+            self.active_threads.remove(task)
+        elif self.active_threads:
             # Remove one finished task marker if present
             try:
                 self.active_threads.pop(0)
             except Exception:
                 pass
+
+        # Lưu kết quả; lỗi mà còn lượt thì đưa video xuống cuối hàng đợi để thử lại
+        self._task_status.pop(task, None)
+        self._status_dirty = True
+        if task is not None and self._record_result(task, message):
+            self.download_tasks.append(
+                DownloadTask(task.url, task.video_index, task.item_index, task.job_id, task.archive_id))
+            self._add_log_item(f"🔁 Sẽ thử lại video {task.video_index}: {task.url}")
+        elif message != "stop":
+            self._finished_tasks += 1
         
         # Schedule next downloads immediately if capacity available
-        if not self.stopped and self.index <= len(self.urls):
+        if not self.stopped and self.index <= len(self.download_tasks):
             self.download_next_batch()
         elif self.running == 0:
             if self.stopped:
@@ -506,6 +763,8 @@ class DownloadVideoTab(UIToolbarTab):
                     self._add_log_item("✅ Tải xong tất cả video.")
                     self._add_log_item(
                         f"📂 Video được lưu tại: {self.download_folder}")
+                elif message == "skipped":
+                    self._add_log_item("⏭ Video đã có trong kho lưu trữ.")
                 elif message == "error":
                     self._add_log_item("❌ Không tải được video. Bỏ qua và tiếp tục.")
                 elif message == "error_no_file":
@@ -515,22 +774,62 @@ class DownloadVideoTab(UIToolbarTab):
                 else:
                     self._add_log_item("❌ Lỗi khi tải video!")
                 
+                self._finish_batch()
+
                 bCheckFolder = self._check_and_cleanup_empty_folders(self.download_folder)
                 if bCheckFolder:
                     self._add_log_item("✅ Đã dọn dẹp thư mục rỗng.")
 
             self.download_button.setEnabled(True)
             self.stop_button.setEnabled(False)
+            self._refresh_resume_button()
             self._reset_progress()
 
+    def _finish_batch(self):
+        """Hết hàng đợi: tổng kết và đóng batch (video lỗi hẳn không giữ file .part)"""
+        if self.batch_id is None:
+            return
+        try:
+            counts = download_queue.counts(self.batch_id)
+            total = sum(counts.values())
+            failed = counts.get("failed", 0)
+            self._add_log_item(f"📊 Đã tải {counts.get('done', 0)}/{total} video"
+                               + (f", {failed} video lỗi" if failed else ""))
+            if not counts.get("pending") and not counts.get("running"):
+                self._discard_batch(self.batch_id)
+                self.batch_id = None
+        except Exception as e:
+            print(f"Error closing download batch: {e}")
+
     def error_thread(self, value):
         # Only log error; do not reset UI here because other threads may be running
         self._add_log_item(value, "error")
         
 
-    def update_progress(self, value):
-        self._update_progress(value)
-        # self._reset_ui_after_download()
+    def _on_task_status(self, task, progress) -> None:
+        """Lưu trạng thái mới nhất của một lượt tải; UI được vẽ lại theo _status_timer"""
+        self._task_status[task] = progress
+        self._status_dirty = True
+
+    def _refresh_status(self) -> None:
+        """Gộp trạng thái các lượt tải thành một thanh tiến trình và một dòng tiêu đề"""
+        if not self._status_dirty:
+            return
+        self._status_dirty = False
+        not_started = max(0, len(self.download_tasks) - self.index + 1)
+        total = self._finished_tasks + max(self.running, 0) + not_started
+        if total <= 0:
+            return
+        active = [p for t, p in self._task_status.items() if t in self.active_threads]
+        done = self._finished_tasks + sum(p.percent for p in active) / 100.0
+        self._update_progress(max(1, int(done * 100 / total)))
+        title = f"Đang tải {self._finished_tasks}/{total} video"
+        speed = sum(p.speed or 0 for p in active if not p.finished)
+        if speed:
+            title += f" • {len(active)} luồng • {format_bytes(speed)}/s"
+        if len(active) == 1:
+            title += f" • {active[0].describe()}"
+        self._update_progress_title(title)
 
     def _create_download_folder(self):
         """Tạo thư mục download với cấu trúc đơn giản"""
@@ -578,6 +877,10 @@ class DownloadVideoTab(UIToolbarTab):
 
     def _reset_progress(self) -> None:
         """Reset progress bar from main window"""
+        self._status_timer.stop()
+        self._task_status.clear()
+        self._finished_tasks = 0
+        self._status_dirty = False
         try:
             if hasattr(self.parent_main, 'progress_bar'):
                 # Ẩn progress bar khi reset về 0
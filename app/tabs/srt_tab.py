@@ -1,17 +1,16 @@
 # -*- coding: utf-8 -*-
-import re
 import os
 import shutil
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QTextEdit, QPushButton,
-    QTableWidget, QTableWidgetItem, QMessageBox, QFileDialog, QHBoxLayout,
+    QTableView, QMessageBox, QFileDialog, QHBoxLayout,
     QAbstractItemView, QGroupBox, QLabel, QListWidget
 )
 
 from PySide6.QtWidgets import QHeaderView
 from app.workers.translate_workers import MultiThreadTranslateWorker
 
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 
 from app.core.segment_audio import SegmentAudio
 
@@ -19,6 +18,9 @@ from typing import Optional
 from app.core.segment_manager import SegmentManager
 from app.core.srt_playback_controller import SRTPlaybackController
 from app.core.language_manager import language_manager
+from app.core.subtitle_engine import parse_subtitles, CueList, iter_srt_blocks
+from app.core.subtitle_table_model import SubtitleTableModel, COL_TIME
+from app.workers.dubbing_worker import SRTDubbingWorker
 
 # Import history system
 from app.uiToolbarTab import UIToolbarTab
@@ -29,31 +31,14 @@ from datetime import datetime
 
 
 def parse_srt(text: str):
-    """Trả về danh sách [(index, timestamp, content), ...] nếu hợp lệ."""
-    blocks = text.strip().split("\n\n")
-
-    timestamp_pattern = re.compile(
-        r"^\d{2}:\d{2}:\d{2},\d{3}\s-->\s\d{2}:\d{2}:\d{2},\d{3}$"
-    )
-
-    results = []
-
-    for i, block in enumerate(blocks, start=1):
-        lines = block.strip().splitlines()
-
-        if len(lines) < 3:
-            return None
-
-        if not lines[0].isdigit() or int(lines[0]) != i:
-            return None
-
-        if not timestamp_pattern.match(lines[1]):
-            return None
-
-        content = " ".join(lines[2:])
-        results.append((i, lines[1], content))
-
-    return results
+    """Trả về danh sách [(index, timestamp, content), ...] nếu hợp lệ (SRT hoặc WebVTT)."""
+    cues = parse_subtitles(text)
+    if not len(cues):
+        return None
+    return [
+        (i, cues.timestamp(i - 1), cues.texts[i - 1].replace("\n", " "))
+        for i in range(1, len(cues) + 1)
+    ]
 
 
 class SRTChecker(QWidget):
@@ -75,23 +60,39 @@ class SRTChecker(QWidget):
         # layout.addWidget(self.btn_check)
 
         # Bảng hiển thị (thêm cột Dịch)
-        self.table = QTableWidget()
-        self.table.setColumnCount(3)
-        self.table.setHorizontalHeaderLabels(["Thời gian", "Nội dung", "Dịch"])
+        # Model đọc trực tiếp từ CueList, không tạo item cho từng ô
+        self.table_model = SubtitleTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.table_model)
         self.table.setEditTriggers(QAbstractItemView.AllEditTriggers)
         self.table.setWordWrap(True)
         self.table.setContextMenuPolicy(Qt.NoContextMenu)
-        # Tự giãn cột nội dung và dịch theo chiều ngang, tự tính chiều cao dòng
+        # Tự giãn cột nội dung và dịch theo chiều ngang
         header = self.table.horizontalHeader()
-        header.setSectionResizeMode(
-            0, QHeaderView.ResizeToContents)  # Thời gian
-        header.setSectionResizeMode(
-            1, QHeaderView.Stretch)           # Nội dung
-        header.setSectionResizeMode(2, QHeaderView.Stretch)           # Dịch
-        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
-        self.table.itemSelectionChanged.connect(self._on_row_selected)
+        header.setSectionResizeMode(0, QHeaderView.Fixed)    # Thời gian
+        header.resizeSection(
+            0, self.table.fontMetrics().horizontalAdvance("00:00:00,000 --> 00:00:00,000") + 24)
+        header.setSectionResizeMode(1, QHeaderView.Stretch)  # Nội dung
+        header.setSectionResizeMode(2, QHeaderView.Stretch)  # Dịch
+        # Chiều cao dòng chỉ tính cho các dòng đang hiển thị (ResizeToContents quét toàn bảng)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self._sized_rows: set = set()
+        self._row_resize_timer = QTimer(self)
+        self._row_resize_timer.setSingleShot(True)
+        self._row_resize_timer.timeout.connect(self._resize_visible_rows)
+        self.table.verticalScrollBar().valueChanged.connect(self._schedule_row_resize)
+        header.sectionResized.connect(self._on_column_resized)
+        self.table_model.modelReset.connect(self._on_column_resized)
+        self.table_model.dataChanged.connect(self._on_table_data_changed)
+        self.table.selectionModel().currentRowChanged.connect(self._on_row_selected)
         layout.addWidget(self.table)
 
+        # Bản dịch nhận từ worker được gộp lại và cập nhật theo lô
+        self._pending_translations: dict = {}
+        self._translation_flush_timer = QTimer(self)
+        self._translation_flush_timer.setSingleShot(True)
+        self._translation_flush_timer.timeout.connect(self._flush_translations)
+
         # Nhóm nút dịch
         btn_layout = QHBoxLayout()
         self.btn_translate_all = QPushButton("Dịch tất cả")
@@ -115,6 +116,11 @@ class SRTChecker(QWidget):
         self.btn_play_audio.clicked.connect(self.play_audio)
         btn_file_layout.addWidget(self.btn_play_audio)
 
+        # Lồng tiếng theo thời gian cue
+        self.btn_dub = QPushButton("🎙️ Lồng tiếng")
+        self.btn_dub.clicked.connect(self.render_dub)
+        btn_file_layout.addWidget(self.btn_dub)
+
         layout.addLayout(btn_file_layout)
 
         # Add segment manager UI
@@ -130,6 +136,9 @@ class SRTChecker(QWidget):
         # Audio system
         self.current_index: int = -1
         self.is_reading_audio: bool = False
+        # Cue đã phân tích (thời gian dạng ms) và worker lồng tiếng
+        self.cues: CueList = CueList()
+        self.dub_worker: Optional[SRTDubbingWorker] = None
         # Throttle logging time (per second)
         self._last_logged_second: int = -1
 
@@ -148,7 +157,9 @@ class SRTChecker(QWidget):
 
         # Connect controller signals to existing handlers
         self.controller.position_changed.connect(self._on_audio_position_changed)
-        # self.controller.segment_changed.connect(self._on_audio_segment_changed)
+        self.controller.segment_changed.connect(self._on_audio_segment_changed)
+        self.controller.cue_changed.connect(self._highlight_cue_row)
+        self.controller.set_cues(self.table_model.cues)
             # self.controller.playback_state_changed.connect(self._on_audio_playback_state_changed)
         # self.controller.status_signal.connect(self._on_audio_status_changed)
         # self.controller.playback_finished.connect(self._on_audio_finished)
@@ -169,9 +180,24 @@ class SRTChecker(QWidget):
         except Exception:
             pass
 
+    def _highlight_cue_row(self, row: int) -> None:
+        """Chọn dòng cue đang phát và cuộn tới nếu nằm ngoài viewport"""
+        if row < 0 or row >= self.table_model.rowCount():
+            return
+        index = self.table_model.index(row, COL_TIME)
+        if self.table.state() == QAbstractItemView.EditingState:
+            return  # Không cướp focus khi người dùng đang sửa ô
+        self.table.setCurrentIndex(index)
+        self.table.scrollTo(index, QAbstractItemView.EnsureVisible)
+
     def _on_audio_segment_changed(self, segment_index: int) -> None:
         """Callback khi segment audio thay đổi"""
         try:
+            # Đồng bộ dòng phụ đề theo vị trí đầu segment (tra chỉ mục O(log n))
+            if self.audio_player:
+                row = self.controller.cue_at(self.audio_player.get_global_position_ms())
+                self._highlight_cue_row(row)
+
             # Highlight current segment in the list
             if hasattr(self, 'segment_list') and self.segment_list and 0 <= segment_index < self.segment_list.count():
                 self.segment_list.setCurrentRow(segment_index)
@@ -518,22 +544,62 @@ class SRTChecker(QWidget):
 
     def check_and_show(self):
         text = self.text_edit.toPlainText()
-        result = parse_srt(text)
+        cues = parse_subtitles(text)
 
-        if result is None:
+        if not len(cues):
             QMessageBox.warning(
                 self, "Kết quả", "❌ Không phải định dạng SRT hợp lệ")
             return
 
-        self.table.setRowCount(len(result))
-        for row, (_index, timestamp, content) in enumerate(result):
-            self.table.setItem(row, 0, QTableWidgetItem(timestamp))
-            self.table.setItem(row, 1, QTableWidgetItem(content))
-            self.table.setItem(row, 2, QTableWidgetItem(""))
-        self.table.resizeRowsToContents()
+        self.cues = cues
+        self._pending_translations.clear()
+        self.table_model.set_cues(cues)
+        self.controller.set_cues(cues)
 
         # Save check action to history
-        self._save_check_to_history(text, len(result))
+        self._save_check_to_history(text, len(cues))
+
+    def _schedule_row_resize(self, *_args) -> None:
+        """Gộp các yêu cầu tính chiều cao dòng (khi cuộn, đổi cỡ cột, cập nhật dữ liệu)"""
+        if not self._row_resize_timer.isActive():
+            self._row_resize_timer.start(30)
+
+    def _on_column_resized(self, *_args) -> None:
+        """Độ rộng cột đổi -> chiều cao dòng cần tính lại"""
+        self._sized_rows.clear()
+        self._schedule_row_resize()
+
+    def _on_table_data_changed(self, top_left, bottom_right, _roles=None) -> None:
+        """Dữ liệu đổi -> chỉ các dòng trong khoảng cần tính lại chiều cao"""
+        self._sized_rows.difference_update(range(top_left.row(), bottom_right.row() + 1))
+        self._schedule_row_resize()
+        # Sửa thời gian cue -> dựng lại chỉ mục tra cứu khi phát
+        if top_left.column() <= COL_TIME <= bottom_right.column():
+            self.controller.set_cues(self.table_model.cues)
+
+    def _resize_visible_rows(self) -> None:
+        """Tính chiều cao cho các dòng đang nằm trong viewport (lazy)"""
+        rows = self.table_model.rowCount()
+        if rows == 0:
+            return
+        viewport = self.table.viewport()
+        top = self.table.rowAt(0)
+        bottom = self.table.rowAt(viewport.height() - 1)
+        if top < 0:
+            top = 0
+        if bottom < 0:
+            bottom = rows - 1
+        # Thêm một ít dòng phía dưới vì chiều cao thay đổi sẽ đẩy viewport
+        bottom = min(rows - 1, bottom + 5)
+        for row in range(top, bottom + 1):
+            if row not in self._sized_rows:
+                self.table.resizeRowToContents(row)
+                self._sized_rows.add(row)
+
+    def _flush_translations(self) -> None:
+        """Đẩy các bản dịch đang chờ vào model bằng một lần dataChanged"""
+        updates, self._pending_translations = self._pending_translations, {}
+        self.table_model.set_translations(updates)
 
     def _save_check_to_history(self, text: str, row_count: int) -> None:
         """Save SRT check action to history"""
@@ -580,16 +646,13 @@ class SRTChecker(QWidget):
         except Exception as e:
             print(f"Error saving check to history: {e}")
 
-    def _on_row_selected(self):
-        row = self.table.currentRow()
-        if row < 0:
+    def _on_row_selected(self, *_args):
+        row = self.table.currentIndex().row()
+        if row < 0 or row >= self.table_model.rowCount():
             return
-        timestamp_item = self.table.item(row, 0)
-        content_item = self.table.item(row, 1)
-        trans_item = self.table.item(row, 2)
-        timestamp = timestamp_item.text() if timestamp_item else ""
-        content = content_item.text() if content_item else ""
-        trans = trans_item.text() if trans_item else ""
+        timestamp = self.table_model.timestamp(row)
+        content = self.table_model.display_text(row)
+        trans = self.table_model.translations[row]
 
         # Bind về ô nhập: ưu tiên hiển thị nội dung gốc, kèm bản dịch nếu có
         display = content
@@ -597,28 +660,12 @@ class SRTChecker(QWidget):
             display = f"{content}\n\n[Dịch]\n{trans}"
 
     def get_table_data(self):
-        rows = self.table.rowCount()
-        cols = self.table.columnCount()
-        data = []
-        for row in range(rows):
-            row_data = []
-            for col in range(cols):
-                item = self.table.item(row, col)
-                row_data.append(item.text() if item else "")
-            data.append(row_data)
-        return data
+        """Mỗi hàng: [timestamp, content, trans]"""
+        return self.table_model.rows_data()
 
     def export_to_srt(self):
         """Xuất ra SRT: dùng chỉ cột Dịch nếu có, bỏ STT (bảng đã có)."""
-        data = self.get_table_data()  # Mỗi hàng: [timestamp, content, trans]
-        srt_lines = []
-        for idx, (timestamp, content, trans) in enumerate(data, start=1):
-            srt_lines.append(str(idx))
-            srt_lines.append(timestamp)
-            text_line = (trans or "").strip() or (content or "")
-            srt_lines.append(text_line)
-            srt_lines.append("")
-        return "\n".join(srt_lines)
+        return "".join(iter_srt_blocks(self.table_model.cues, self.table_model.output_texts()))
 
     def save_srt(self):
         srt_text = self.export_to_srt()
@@ -685,11 +732,11 @@ class SRTChecker(QWidget):
 
     def open_srt(self):
         filename, _ = QFileDialog.getOpenFileName(
-            self, "Mở file SRT", "", "Subtitle Files (*.srt)")
+            self, "Mở file SRT", "", "Subtitle Files (*.srt *.vtt)")
         if not filename:
             return
         try:
-            with open(filename, "r", encoding="utf-8") as f:
+            with open(filename, "r", encoding="utf-8-sig") as f:
                 content = f.read()
         except UnicodeDecodeError:
             # Fallback nếu không phải utf-8
@@ -748,16 +795,15 @@ class SRTChecker(QWidget):
 
     def translate_all(self):
         """Dùng TranslateWorker để dịch tất cả (EN→VI)"""
-        rows = self.table.rowCount()
+        rows = self.table_model.rowCount()
         if rows == 0:
             QMessageBox.information(
                 self, "Thông báo", "Không có dữ liệu để dịch")
             return
 
-        contents = []
-        for row in range(rows):
-            item = self.table.item(row, 1)  # cột Nội dung
-            contents.append(item.text() if item else "")
+        # Đọc thẳng từ CueList (cột Nội dung)
+        contents = [self.table_model.display_text(row) for row in range(rows)]
+        self._pending_translations.clear()
 
         # Khởi tạo worker dịch: Google Translate, EN -> VI
         self.translate_worker = MultiThreadTranslateWorker(
@@ -777,15 +823,16 @@ class SRTChecker(QWidget):
         self.btn_translate_all.setEnabled(False)
 
         def on_segment_translated(original: str, translated: str, index: int):
-            row_idx = index - 1
-            if 0 <= row_idx < self.table.rowCount():
-                self.table.setItem(row_idx, 2, QTableWidgetItem(translated))
-                self.table.resizeRowToContents(row_idx)
+            # Gộp lại, cập nhật model theo lô (~10 lần/giây)
+            self._pending_translations[index - 1] = translated
+            if not self._translation_flush_timer.isActive():
+                self._translation_flush_timer.start(100)
 
         def on_progress(completed: int, total: int):
             pass
 
         def on_done():
+            self._flush_translations()
             self.btn_translate_all.setEnabled(True)
             QMessageBox.information(
                 self, "Thành công", "✅ Đã dịch xong tất cả dòng")
@@ -794,6 +841,7 @@ class SRTChecker(QWidget):
             self._save_translation_to_history()
 
         def on_error(msg: str):
+            self._flush_translations()
             self.btn_translate_all.setEnabled(True)
             QMessageBox.warning(self, "Lỗi", msg)
 
@@ -803,6 +851,57 @@ class SRTChecker(QWidget):
         self.translate_worker.error.connect(on_error)
         self.translate_worker.start()
 
+    def render_dub(self) -> None:
+        """Lồng tiếng: đọc từng cue (ưu tiên cột Dịch) đúng thời gian và ghi ra một file audio"""
+        if self.dub_worker and self.dub_worker.isRunning():
+            self.dub_worker.stop()
+            self._add_log_item("⏹️ Đang dừng lồng tiếng...", "info")
+            return
+        rows = self.table_model.rowCount()
+        if rows == 0:
+            QMessageBox.information(self, "Thông báo", "Không có dữ liệu phụ đề để lồng tiếng")
+            return
+
+        texts = self.table_model.output_texts()
+
+        default_name = f"SRT_Dub_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp3"
+        out_path, _ = QFileDialog.getSaveFileName(
+            self, "Lưu file lồng tiếng", str(AppConfig.OUTPUT_DIR / default_name), "Audio Files (*.mp3 *.wav)"
+        )
+        if not out_path:
+            return
+
+        # Chọn giọng theo ngôn ngữ của nội dung sẽ đọc
+        sample = " ".join(texts[:50])
+        detected_lang = language_manager.detect_language_from_text(sample)
+        voice_name = language_manager.get_female_voice(
+            detected_lang) or language_manager.get_default_voice_for_language(detected_lang)
+        self._add_log_item(f"🎙️ Lồng tiếng {rows} cue, voice: {voice_name}", "info")
+
+        self.dub_worker = SRTDubbingWorker(self.table_model.cues, out_path, voice_name, texts=texts)
+        self.dub_worker.status.connect(lambda msg: self._add_log_item(msg, "info"))
+        self.dub_worker.progress.connect(
+            lambda done, total: self.btn_dub.setText(f"⏹️ Dừng lồng tiếng ({done}/{total})"))
+        self.dub_worker.done.connect(self._on_dub_done)
+        self.dub_worker.error.connect(self._on_dub_error)
+        self.dub_worker.finished.connect(lambda: self.btn_dub.setText("🎙️ Lồng tiếng"))
+        self.btn_dub.setText("⏹️ Dừng lồng tiếng")
+        self.dub_worker.start()
+
+    def _on_dub_done(self, out_path: str, total_ms: int) -> None:
+        """Lồng tiếng xong: nạp file kết quả vào player"""
+        self.segment_manager.clear_segments()
+        self.segment_manager.add_segment(out_path, total_ms)
+        if self.audio_player:
+            valid_paths, valid_durations = self.segment_manager.get_valid_segments()
+            self.audio_player.add_segments(valid_paths, valid_durations)
+        self._show_player_section(True)
+        QMessageBox.information(self, "Thành công", f"✅ Đã lồng tiếng xong:\n{out_path}")
+
+    def _on_dub_error(self, msg: str) -> None:
+        self._add_log_item(msg, "error")
+        QMessageBox.warning(self, "Lỗi", msg)
+
     def _save_translation_to_history(self) -> None:
         """Save translation completion to history"""
         try:
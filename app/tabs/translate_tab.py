@@ -13,20 +13,15 @@ from app.core.config import AppConfig
 from pathlib import Path
 
 import os
-from datetime import datetime
 
 from typing import Optional, List, Dict, Tuple
 
-from langdetect import detect, DetectorFactory
-
-from deep_translator import GoogleTranslator
-
-from app.workers.translate_workers import MultiThreadTranslateWorker, BatchTranslateWorker
+from app.workers.translate_workers import MultiThreadTranslateWorker, BatchTranslateWorker, TranslateTTSWorker
 from app.core.audio_player import AudioPlayer
-from app.workers.TTS_workers import MTProducerWorker
+from app.workers.TTS_workers import MTProducerWorker, StreamingTTSWorker
 from app.core.segment_manager import SegmentManager
-from app.core.voices_data import voices_data
 from app.core.language_manager import language_manager
+from app.core.log_sink import log_sink
 
 from app.utils.helps import clean_all_temp_parts
 
@@ -58,6 +53,12 @@ class TranslateTab(UIToolbarTab):
         self.worker: Optional[MultiThreadTranslateWorker] = None
         self.batch_worker: Optional[BatchTranslateWorker] = None
         self.translated_segments: List[Tuple[str, str, int]] = []  # (original, translated, index)
+        # Kết quả từng phần của các đoạn đang dịch (streaming Gemini/OpenAI): index -> text
+        self.partial_segments: Dict[int, str] = {}
+        self._pipeline_fed = 0  # Số đoạn đã đưa vào TTS pipeline (gồm cả đoạn dịch lỗi bị skip)
+        self._output_update_timer = QTimer(self)
+        self._output_update_timer.setSingleShot(True)
+        self._output_update_timer.timeout.connect(self._update_output_text)
         self.is_batch_mode = False
         
         # Language management
@@ -77,9 +78,6 @@ class TranslateTab(UIToolbarTab):
         self.is_reading_source: bool = False
         self.is_reading_target: bool = False
         
-        # Log file
-        self.log_file_path = "testtr.txt"
-
         # Segment management
         self.segment_manager = SegmentManager()
 
@@ -337,6 +335,12 @@ class TranslateTab(UIToolbarTab):
         self.max_len_spinbox.setFixedWidth(150)
         self.max_len_spinbox.setSuffix(" ký tự")
         third_row.addWidget(self.max_len_spinbox)
+
+        # Đọc đoạn dịch ngay khi dịch xong (pipeline dịch → TTS)
+        self.read_while_translate_checkbox = QCheckBox("🔊 Đọc ngay khi dịch")
+        self.read_while_translate_checkbox.setToolTip(
+            "Mỗi đoạn dịch xong sẽ được tạo audio song song và phát theo thứ tự")
+        third_row.addWidget(self.read_while_translate_checkbox)
         third_row.addStretch()
         
         # Cột 5: Spinbox Workers
@@ -347,6 +351,15 @@ class TranslateTab(UIToolbarTab):
         self.workers_spinbox.setFixedHeight(30)
         self.workers_spinbox.setFixedWidth(200)
         third_row.addWidget(self.workers_spinbox)
+
+        # Spinbox số luồng tạo audio (TTS)
+        self.tts_workers_spinbox = QSpinBox()
+        self.tts_workers_spinbox.setRange(1, 16)
+        self.tts_workers_spinbox.setValue(AppConfig.DEFAULT_WORKERS_CHUNK)
+        self.tts_workers_spinbox.setSuffix(" Thread TTS")
+        self.tts_workers_spinbox.setFixedHeight(30)
+        self.tts_workers_spinbox.setFixedWidth(150)
+        third_row.addWidget(self.tts_workers_spinbox)
        
         
         parent_layout.addLayout(third_row)
@@ -727,6 +740,7 @@ class TranslateTab(UIToolbarTab):
         # Xóa kết quả cũ
         self.output_text.clear()
         self.translated_segments.clear()
+        self.partial_segments.clear()
 
         # Tạo và chạy worker
         self.worker = MultiThreadTranslateWorker(
@@ -735,6 +749,8 @@ class TranslateTab(UIToolbarTab):
         
         # Kết nối signals
         self.worker.segment_translated.connect(self._on_segment_translated)
+        self.worker.segment_partial.connect(self._on_segment_partial)
+        self.worker.segment_skipped.connect(self._on_segment_skipped)
         self.worker.progress.connect(self._update_progress)
         self.worker.status.connect(self._add_log_item)
         self.worker.all_done.connect(self._on_translation_complete)
@@ -745,9 +761,51 @@ class TranslateTab(UIToolbarTab):
         self.stop_button.setEnabled(True)
         self._update_progress_title("Đang dịch...")
         
+        # Pipeline dịch → đọc: TTS chạy song song với dịch
+        if self.read_while_translate_checkbox.isChecked():
+            self._start_pipeline_tts(tgt, self.tts_workers_spinbox.value())
+
         # Bắt đầu worker
         self.worker.start()
 
+    def _start_pipeline_tts(self, target_lang: str, workers: int) -> None:
+        """Khởi tạo TTS pipeline: mỗi đoạn dịch xong được đưa ngay vào pool TTS"""
+        try:
+            selected_voice = self.target_tts_lang_combo.currentText()
+            voice_name = None
+            if selected_voice != "Tự phát hiện":
+                voice_name = language_manager.extract_voice_name_from_label(selected_voice)
+            if not voice_name:
+                # Đã biết ngôn ngữ đích nên không cần phát hiện ngôn ngữ
+                voice_name = (language_manager.get_female_voice(target_lang)
+                              or language_manager.get_default_voice_for_language(target_lang))
+
+            self.tts_worker = StreamingTTSWorker(voice_name, 0, 0, workers)
+            self._pipeline_fed = 0
+            self.tts_worker.segment_ready.connect(self._on_tts_segment_ready)
+            self.tts_worker.progress.connect(self._on_tts_progress)
+            self.tts_worker.status.connect(self._on_tts_status)
+            self.tts_worker.all_done.connect(self._on_tts_complete)
+            self.tts_worker.error.connect(self._on_tts_error)
+
+            # Trạng thái "đang đọc văn bản đích" để nút đọc có thể dừng pipeline
+            self.is_reading_target = True
+            self.read_target_btn.setText("🔇 Tắt đọc văn bản đích")
+            self.read_target_btn.setStyleSheet("background-color: #ff6b6b; color: white;")
+            self.target_tts_lang_combo.setEnabled(False)
+            if hasattr(self, 'segment_manager_group'):
+                self.segment_manager_group.setVisible(True)
+
+            self.tts_worker.start()
+            self._add_log_item(f"🔊 Đọc ngay khi dịch với voice: {voice_name}", "info")
+        except Exception as e:
+            self._add_log_item(f"❌ Lỗi khi bắt đầu TTS: {e}", "error")
+
+    def _finish_pipeline_tts(self) -> None:
+        """Báo cho TTS pipeline không còn đoạn dịch mới"""
+        if isinstance(self.tts_worker, StreamingTTSWorker):
+            self.tts_worker.finish(self._pipeline_fed)
+
     def _start_batch_translation(self) -> None:
         """Bắt đầu dịch hàng loạt"""
         files, _ = QFileDialog.getOpenFileNames(
@@ -787,9 +845,11 @@ class TranslateTab(UIToolbarTab):
         )
         
         # Kết nối signals
-        self.batch_worker.fileProgress.connect(self._update_progress)
+        self.batch_worker.fileProgress.connect(
+            lambda done, total: self._update_progress(int(done * 100 / max(1, total))))
         self.batch_worker.fileStatus.connect(self._add_log_item)
-        self.batch_worker.attachWorker.connect(self._attach_batch_worker)
+        self.batch_worker.segment_translated.connect(self._on_segment_translated)
+        self.batch_worker.batchMetrics.connect(lambda m: self._update_progress_title(m.describe()))
         
         # Cập nhật UI
         self.reset_button_Translate(False)
@@ -802,17 +862,36 @@ class TranslateTab(UIToolbarTab):
     def _on_segment_translated(self, original: str, translated: str, index: int) -> None:
         """Xử lý khi một đoạn được dịch xong"""
         self.translated_segments.append((original, translated, index))
+        self.partial_segments.pop(index, None)
         
         # Sắp xếp theo index để hiển thị đúng thứ tự
         self.translated_segments.sort(key=lambda x: x[2])
+
+        # Pipeline: đưa đoạn vừa dịch vào pool TTS ngay
+        if isinstance(self.tts_worker, StreamingTTSWorker):
+            self.tts_worker.submit(index, translated)
+            self._pipeline_fed += 1
         
         # Cập nhật output
+        self._output_update_timer.stop()
         self._update_output_text()
-        
+
+    def _on_segment_skipped(self, index: int, message: str) -> None:
+        """Đoạn dịch lỗi: báo TTS pipeline bỏ qua để các đoạn sau vẫn được đọc"""
+        self.partial_segments.pop(index, None)
+        if isinstance(self.tts_worker, StreamingTTSWorker):
+            self.tts_worker.skip(index)
+            self._pipeline_fed += 1
+
+    def _on_segment_partial(self, partial: str, index: int) -> None:
+        """Hiển thị kết quả từng phần của đoạn đang dịch (gộp cập nhật ~10 lần/giây)"""
+        self.partial_segments[index] = partial
+        if not self._output_update_timer.isActive():
+            self._output_update_timer.start(100)
 
     def _update_output_text(self) -> None:
-        """Cập nhật text output với tất cả đoạn đã dịch"""
-        if not self.translated_segments:
+        """Cập nhật text output với tất cả đoạn đã dịch (và các đoạn đang dịch dở)"""
+        if not self.translated_segments and not self.partial_segments:
             return
             
         output_lines = []
@@ -821,6 +900,11 @@ class TranslateTab(UIToolbarTab):
             # output_lines.append(f"Gốc: {original}")
             output_lines.append(f"{translated}")
             output_lines.append("")  # Dòng trống
+
+        # Đoạn đang dịch dở hiển thị sau các đoạn đã xong, theo đúng thứ tự index
+        for index in sorted(self.partial_segments):
+            output_lines.append(f"{self.partial_segments[index]}…")
+            output_lines.append("")
         
         output_text = "\n".join(output_lines)
         self.output_text.setPlainText(output_text)
@@ -828,14 +912,6 @@ class TranslateTab(UIToolbarTab):
         # Cập nhật số từ và ký tự cho output
         self._update_word_count(output_text, self.output_word_count_label)
 
-    def _attach_batch_worker(self, worker: MultiThreadTranslateWorker, filename: str) -> None:
-        """Kết nối worker con của batch worker"""
-        worker.segment_translated.connect(self._on_segment_translated)
-        worker.progress.connect(self._update_progress)
-        worker.status.connect(self._add_log_item)
-        worker.all_done.connect(lambda: self._add_log_item(f"✅ Hoàn thành file: {filename}"))
-        worker.error.connect(lambda e: self._add_log_item(f"❌ Lỗi file {filename}: {e}"))
-
     def _read_source_text(self) -> None:
         """Đọc văn bản nguồn bằng TTS - toggle play/stop"""
         # Kiểm tra xem có đang đọc không
@@ -941,7 +1017,10 @@ class TranslateTab(UIToolbarTab):
                 selected_voice = self.target_tts_lang_combo.currentText()
             
             # Xử lý voice được chọn
+            voice_resolver = None
             if selected_voice == "Tự phát hiện":
+                # Chọn voice theo ngôn ngữ từng đoạn (văn bản nhiều ngôn ngữ)
+                voice_resolver = language_manager.voices_for_chunks
                 # Sử dụng langdetect để tự động phát hiện
                 detected_lang = language_manager.detect_language_from_text(text)
                 voice_name = language_manager.get_female_voice(detected_lang) or language_manager.get_default_voice_for_language(detected_lang)
@@ -968,17 +1047,30 @@ class TranslateTab(UIToolbarTab):
                     else:
                         voice_name = "vi-VN-HoaiMyNeural"  # Default Vietnamese
                         self._add_log_item("🎯 Fallback voice: Tiếng Việt (vi)", "info")
-            # Tạo TTS worker
-            self.tts_worker = MTProducerWorker(
-                text, voice_name, 0, 0, 500, 4
-            )
-            
-            # Kết nối signals
-            self.tts_worker.segment_ready.connect(self._on_tts_segment_ready)
-            self.tts_worker.progress.connect(self._on_tts_progress)
-            self.tts_worker.status.connect(self._on_tts_status)
-            self.tts_worker.all_done.connect(self._on_tts_complete)
-            self.tts_worker.error.connect(self._on_tts_error)
+            tts_workers = self.tts_workers_spinbox.value()
+            if text_type == "target" and self.translated_segments:
+                # Văn bản đích đã được chia đoạn khi dịch -> tạo audio theo từng đoạn dịch
+                tgt = language_manager.code_by_name(self.target_lang_combo.currentText())
+                self.tts_worker = TranslateTTSWorker(
+                    list(self.translated_segments), tgt, voice_name, 0, 0, tts_workers
+                )
+                self.tts_worker.audio_ready.connect(self._on_tts_segment_ready)
+                self.tts_worker.tts_progress.connect(self._on_tts_progress)
+                self.tts_worker.tts_status.connect(self._on_tts_status)
+                self.tts_worker.tts_error.connect(self._on_tts_error)
+                self.tts_worker.tts_done.connect(self._on_tts_complete)
+            else:
+                # Tạo TTS worker
+                self.tts_worker = MTProducerWorker(
+                    text, voice_name, 0, 0, 500, tts_workers, voice_resolver=voice_resolver
+                )
+                
+                # Kết nối signals
+                self.tts_worker.segment_ready.connect(self._on_tts_segment_ready)
+                self.tts_worker.progress.connect(self._on_tts_progress)
+                self.tts_worker.status.connect(self._on_tts_status)
+                self.tts_worker.all_done.connect(self._on_tts_complete)
+                self.tts_worker.error.connect(self._on_tts_error)
             
             # Bắt đầu TTS
             self.tts_worker.start()
@@ -1252,6 +1344,7 @@ class TranslateTab(UIToolbarTab):
         # Clear kết quả dịch
         self.output_text.clear()
         self.translated_segments.clear()
+        self.partial_segments.clear()
         
         # Xóa số từ và ký tự cho output
         self._update_word_count("", self.output_word_count_label)
@@ -1261,6 +1354,8 @@ class TranslateTab(UIToolbarTab):
 
     def _on_translation_complete(self) -> None:
         """Xử lý khi hoàn thành dịch thuật"""
+        self.partial_segments.clear()
+        self._finish_pipeline_tts()
         self.reset_button_Translate(True)
         self.stop_button.setEnabled(False)
         self._update_progress_title("")
@@ -1269,6 +1364,9 @@ class TranslateTab(UIToolbarTab):
 
     def _on_translation_error(self, error: str) -> None:
         """Xử lý khi có lỗi dịch thuật"""
+        self.partial_segments.clear()
+        self._update_output_text()
+        self._finish_pipeline_tts()
         self.reset_button_Translate(True)
         self.stop_button.setEnabled(False)
         self._update_progress_title("")
@@ -1439,16 +1537,8 @@ class TranslateTab(UIToolbarTab):
  
 
     def _write_log_to_file(self, message: str) -> None:
-        """Ghi log vào file testtr.txt"""
-        try:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            log_entry = f"[{timestamp}] {message}\n"
-            
-            with open(self.log_file_path, "a", encoding="utf-8") as f:
-                f.write(log_entry)
-                
-        except Exception as e:
-            print(f"❌ Lỗi khi ghi log vào file: {str(e)}")
+        """Ghi log vào file log chung (log_sink ghi nền theo lô, xoay vòng file)"""
+        log_sink.write_to_file(message)
     
     def _update_word_count(self, text: str, label: QLabel) -> None:
         """Cập nhật số từ và ký tự cho label"""
@@ -1528,6 +1618,8 @@ class TranslateTab(UIToolbarTab):
             # Clear translated segments
             if hasattr(self, 'translated_segments'):
                 self.translated_segments.clear()
+            if hasattr(self, 'partial_segments'):
+                self.partial_segments.clear()
             
             # Xóa số từ và ký tự cho output
             self._update_word_count("", self.output_word_count_label)
@@ -1613,8 +1705,7 @@ class TranslateTab(UIToolbarTab):
                 lang_code = language_manager.code_by_name(source_lang)
                 # Sử dụng language_manager để populate voices
                 voices = language_manager.populate_voices_for_language(lang_code)
-                for voice in voices:
-                    self.source_tts_lang_combo.addItem(voice)
+                self.source_tts_lang_combo.addItems(voices)
             else:
                 # Nếu là "Tự phát hiện", chỉ thêm option đó
                 self.source_tts_lang_combo.addItem("Tự phát hiện")
@@ -1636,8 +1727,7 @@ class TranslateTab(UIToolbarTab):
                 lang_code = language_manager.code_by_name(target_lang)
                 # Sử dụng language_manager để populate voices
                 voices = language_manager.populate_voices_for_language(lang_code)
-                for voice in voices:
-                    self.target_tts_lang_combo.addItem(voice)
+                self.target_tts_lang_combo.addItems(voices)
             else:
                 # Nếu là "Tự phát hiện", chỉ thêm option đó
                 self.target_tts_lang_combo.addItem("Tự phát hiện")
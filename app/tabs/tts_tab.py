@@ -16,6 +16,7 @@ from typing import Optional
 from app.core.audio_player import AudioPlayer
 # Import SegmentManager
 from app.core.segment_manager import SegmentManager
+from app.core.segment_store import segment_store, KIND_GAP
 # Import LanguageManager
 from app.core.language_manager import language_manager
 
@@ -33,11 +34,12 @@ import json
 from app.utils.helps import (
     clean_all_temp_parts
 )
-from app.utils.audio_helpers import ms_to_mmss, prepare_pydub_ffmpeg, get_mp3_duration_ms
+from app.utils.audio_helpers import ms_to_mmss, prepare_pydub_ffmpeg, get_mp3_duration_ms, load_audio
 from app.utils.helps import hide_directory_on_windows
+from app.utils.lazy_import import lazy_import
 
-# Import audio library
-from pydub import AudioSegment
+# Import audio library (nạp lười ở lần dùng đầu)
+pydub = lazy_import("pydub")
 
 
 class TTSTab(UIToolbarTab):
@@ -1168,9 +1170,10 @@ class TTSTab(UIToolbarTab):
         if self.audio_player:
             self.audio_player.clear_segments()
 
-        clean_all_temp_parts()
         # Reset segments list using SegmentManager
         self.segment_manager.clear_segments()
+        # Dọn file tạm không còn segment nào giữ
+        clean_all_temp_parts()
         self.current_index = -1
         # Reset progress bar từ main window và hiện lên
         self._reset_progress()
@@ -1495,7 +1498,7 @@ class TTSTab(UIToolbarTab):
         try:
             prepare_pydub_ffmpeg()
             gap_ms = self.gap_spin_edge_tts.value()
-            final = AudioSegment.silent(duration=0)
+            final = pydub.AudioSegment.silent(duration=0)
 
             total_ms = 0
             valid_count = 0
@@ -1503,7 +1506,7 @@ class TTSTab(UIToolbarTab):
             # Concatenate segments with smart gap handling
             for i, p in enumerate(parts):
                 try:
-                    seg = AudioSegment.from_file(p)
+                    seg = load_audio(p)
                     final += seg
 
                     # Add gap between segments (but not after the last one)
@@ -1511,16 +1514,15 @@ class TTSTab(UIToolbarTab):
                         # Check if next segment is a gap segment
                         next_path = parts[i + 1] if i + \
                             1 < len(parts) else None
-                        if next_path and "gap_" in next_path:
+                        if segment_store.kind(next_path) == KIND_GAP:
                             # Skip adding extra gap since gap segment already exists
                             pass
                         else:
                             # Add normal gap
-                            gap = AudioSegment.silent(duration=gap_ms)
+                            gap = pydub.AudioSegment.silent(duration=gap_ms)
                             final += gap
 
-                    d = get_mp3_duration_ms(p)
-                    total_ms += d
+                    total_ms += len(seg)
                     valid_count += 1
                 except Exception as e:
                     print(f"Warning: Could not process segment {p}: {e}")
@@ -1535,7 +1537,7 @@ class TTSTab(UIToolbarTab):
             final.export(out_path, format="mp3")
 
             # Show success message with details
-            gap_count = sum(1 for p in parts if "gap_" in p)
+            gap_count = sum(1 for p in parts if segment_store.kind(p) == KIND_GAP)
             if gap_count > 0:
                 success_msg = f"Đã xuất MP3 với {gap_count} khoảng nghỉ:\n{out_path}\nTổng thời lượng: {ms_to_mmss(total_ms)}"
                 QMessageBox.information(self, "Thành công", success_msg)
@@ -1820,18 +1822,18 @@ class TTSTab(UIToolbarTab):
         try:
             prepare_pydub_ffmpeg()
             gap_ms = self.gap_spin_edge_tts.value() if hasattr(self, 'gap_spin_edge_tts') else 0
-            final = AudioSegment.silent(duration=0)
+            final = pydub.AudioSegment.silent(duration=0)
             valid_count = 0
             for i, p in enumerate(parts):
                 try:
-                    seg = AudioSegment.from_file(p)
+                    seg = load_audio(p)
                     final += seg
                     # Optional gap between segments (skip after last)
                     if i < len(parts) - 1 and gap_ms > 0:
                         # Avoid double gap if next is a gap segment
                         next_path = parts[i + 1] if i + 1 < len(parts) else None
-                        if not (next_path and "gap_" in next_path):
-                            final += AudioSegment.silent(duration=gap_ms)
+                        if segment_store.kind(next_path) != KIND_GAP:
+                            final += pydub.AudioSegment.silent(duration=gap_ms)
                     valid_count += 1
                 except Exception as e:
                     print(f"Warning: Could not process segment {p}: {e}")
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Lazy tab - Tab chỉ được dựng khi được mở lần đầu
+Trước đó QTabWidget chỉ chứa một placeholder nhẹ; module của tab (và các
+AudioPlayer, SegmentManager, lịch sử... bên trong) chưa được import/khởi tạo.
+"""
+
+import importlib
+from typing import Callable, Optional
+
+from PySide6.QtCore import Qt, Signal, QTimer
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
+
+
+def tab_factory(module_name: str, class_name: str, *args, **kwargs) -> Callable[[], QWidget]:
+    """Factory import module của tab ở lần gọi đầu rồi khởi tạo class"""
+    def create() -> QWidget:
+        module = importlib.import_module(module_name)
+        return getattr(module, class_name)(*args, **kwargs)
+    return create
+
+
+class LazyTabHost(QWidget):
+    """
+    Widget chứa tab thật; hiển thị placeholder cho tới khi ensure_built()/activate()
+
+    Signals:
+        built: Tab thật vừa được dựng (widget)
+        build_failed: Dựng tab lỗi (message)
+    """
+
+    built = Signal(object)
+    build_failed = Signal(str)
+
+    def __init__(self, factory: Callable[[], QWidget], title: str, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self._factory = factory
+        self.title = title
+        self.widget: Optional[QWidget] = None
+        self._build_pending = False
+
+        self._layout = QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self._placeholder = QLabel(f"⏳ Đang tải {title}...")
+        self._placeholder.setAlignment(Qt.AlignCenter)
+        self._placeholder.setStyleSheet("color: #94a3b8; font-size: 14px;")
+        self._layout.addWidget(self._placeholder)
+
+    def is_built(self) -> bool:
+        return self.widget is not None
+
+    def activate(self) -> None:
+        """Tab được chọn: dựng ở vòng lặp sự kiện kế tiếp để placeholder kịp hiển thị"""
+        if self.widget is not None or self._build_pending:
+            return
+        self._build_pending = True
+        QTimer.singleShot(0, self.ensure_built)
+
+    def ensure_built(self) -> Optional[QWidget]:
+        """Dựng tab ngay (nếu chưa) và trả về widget thật"""
+        self._build_pending = False
+        if self.widget is not None:
+            return self.widget
+        try:
+            widget = self._factory()
+        except Exception as e:
+            self._placeholder.setText(f"❌ Không thể tải {self.title}: {e}")
+            self.build_failed.emit(str(e))
+            return None
+        self.widget = widget
+        self._layout.removeWidget(self._placeholder)
+        self._placeholder.deleteLater()
+        self._placeholder = None
+        self._layout.addWidget(widget)
+        self.built.emit(widget)
+        return widget
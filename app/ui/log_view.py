@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+Log View - Khung log ảo hoá đọc từ log_sink
+- QListView + model: chỉ vẽ các dòng đang nhìn thấy, không tạo QListWidgetItem cho mỗi dòng
+- Dòng mới được lấy theo lô mỗi AppConfig.LOG_FLUSH_MS, số dòng tối đa = dung lượng ring buffer
+- Lọc theo mức log (tất cả / cảnh báo & lỗi / chỉ lỗi)
+"""
+
+from typing import List, Optional, Set
+
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QTimer
+from PySide6.QtGui import QColor
+from PySide6.QtWidgets import QAbstractItemView, QListView
+
+from app.core.config import AppConfig
+from app.core.log_sink import LogRecord, LogSink, log_sink
+
+
+# (Tên hiển thị, các mức được hiện; None = tất cả)
+LEVEL_FILTERS = [
+    ("Tất cả", None),
+    ("Cảnh báo & lỗi", {"warning", "error"}),
+    ("Chỉ lỗi", {"error"}),
+]
+
+_LEVEL_COLORS = {
+    "info": QColor("#05df60"),
+    "warning": QColor("orange"),
+    "error": QColor("red"),
+    "blue": QColor("#4a5568"),
+}
+
+
+class LogListModel(QAbstractListModel):
+    """Các dòng log đang hiển thị (đã lọc), tối đa capacity dòng"""
+
+    def __init__(self, capacity: int, parent=None) -> None:
+        super().__init__(parent)
+        self.capacity = capacity
+        self.levels: Optional[Set[str]] = None
+        self._rows: List[LogRecord] = []
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        record = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return record.text()
+        if role == Qt.ForegroundRole:
+            return _LEVEL_COLORS.get(record.level)
+        if role == Qt.ToolTipRole:
+            return record.message
+        return None
+
+    def _accepts(self, record: LogRecord) -> bool:
+        return self.levels is None or record.level in self.levels
+
+    def append(self, records: List[LogRecord]) -> None:
+        """Thêm một lô dòng mới; bỏ dòng cũ nhất khi vượt capacity"""
+        rows = [r for r in records if self._accepts(r)][-self.capacity:]
+        if not rows:
+            return
+        overflow = len(self._rows) + len(rows) - self.capacity
+        if overflow > 0:
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            del self._rows[:overflow]
+            self.endRemoveRows()
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    def set_levels(self, levels: Optional[Set[str]], records) -> None:
+        """Đổi bộ lọc và dựng lại từ ring buffer"""
+        self.beginResetModel()
+        self.levels = levels
+        self._rows = [r for r in records if self._accepts(r)][-self.capacity:]
+        self.endResetModel()
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        self._rows = []
+        self.endResetModel()
+
+
+class LogView(QListView):
+    """Khung log dùng chung (thay QListWidget output_list)"""
+
+    def __init__(self, sink: LogSink = log_sink, parent=None) -> None:
+        super().__init__(parent)
+        self.setObjectName("logView")
+        self.sink = sink
+        self.log_model = LogListModel(sink.capacity, self)
+        self.setModel(self.log_model)
+        self.setUniformItemSizes(True)
+        self.setAlternatingRowColors(True)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setInterval(AppConfig.LOG_FLUSH_MS)
+        self._flush_timer.timeout.connect(self.flush)
+        self._flush_timer.start()
+
+    def flush(self) -> None:
+        """Đưa các dòng mới lên view; chỉ tự cuộn khi đang ở cuối"""
+        records = self.sink.drain()
+        if not records:
+            return
+        bar = self.verticalScrollBar()
+        at_bottom = bar.value() >= bar.maximum() - 2
+        self.log_model.append(records)
+        if at_bottom:
+            self.scrollToBottom()
+
+    def set_level_filter(self, levels: Optional[Set[str]]) -> None:
+        self.flush()
+        self.log_model.set_levels(levels, self.sink.records)
+        self.scrollToBottom()
+
+    def clear(self) -> None:
+        self.sink.clear()
+        self.log_model.clear()
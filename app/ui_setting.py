@@ -394,7 +394,7 @@ def get_slider_styles():
 def get_list_widget_styles():
     """Get list widget styles"""
     return f"""
-        QListWidget {{
+        QListWidget, QListView#logView {{
             background-color: {COLORS['secondary_bg']};
             color: {COLORS['text_primary']};
             border: 1px solid {COLORS['border']};
@@ -405,16 +405,16 @@ def get_list_widget_styles():
             selection-background-color: {COLORS['accent_blue']};
             outline: none;
         }}
-        QListWidget::item {{
+        QListWidget::item, QListView#logView::item {{
             padding: {DIMENSIONS['padding_small']} {DIMENSIONS['padding_medium']};
             border-bottom: 1px solid {COLORS['accent_gray']};
             min-height: 20px;
             word-wrap: break-word;
         }}
-        QListWidget::item:hover {{
+        QListWidget::item:hover, QListView#logView::item:hover {{
             background-color: {COLORS['accent_gray']};
         }}
-        QListWidget::item:selected {{
+        QListWidget::item:selected, QListView#logView::item:selected {{
             background-color: {COLORS['accent_gray']};
             color: {COLORS['text_white']};
         }}
@@ -636,17 +636,17 @@ def get_scrollbar_styles():
         }}
 
         /* ----- Thanh trượt cho QListWidget và QTextEdit ----- */
-        QListWidget QScrollBar:vertical, QTextEdit QScrollBar:vertical {{
+        QListWidget QScrollBar:vertical, QListView#logView QScrollBar:vertical, QTextEdit QScrollBar:vertical {{
             background: {COLORS['secondary_bg']};
             width: 6px;
             border-radius: 3px;
         }}
-        QListWidget QScrollBar::handle:vertical, QTextEdit QScrollBar::handle:vertical {{
+        QListWidget QScrollBar::handle:vertical, QListView#logView QScrollBar::handle:vertical, QTextEdit QScrollBar::handle:vertical {{
             background: {COLORS['accent_gray']};
             border-radius: 3px;
             min-height: 15px;
         }}
-        QListWidget QScrollBar::handle:vertical:hover, QTextEdit QScrollBar::handle:vertical:hover {{
+        QListWidget QScrollBar::handle:vertical:hover, QListView#logView QScrollBar::handle:vertical:hover, QTextEdit QScrollBar::handle:vertical:hover {{
             background: {COLORS['accent_blue']};
         }}
         
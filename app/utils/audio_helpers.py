@@ -4,17 +4,22 @@ Audio helper functions
 Chứa các hàm hỗ trợ xử lý audio, tránh circular import
 """
 
-from pydub import AudioSegment
-from pydub.utils import which
+from app.utils.lazy_import import lazy_import
+
+pydub = lazy_import("pydub")
+pydub_utils = lazy_import("pydub.utils")
 
 
 def get_mp3_duration_ms(path: str) -> int:
-    """Lấy thời lượng file MP3 theo milliseconds"""
-    try:
-        seg = AudioSegment.from_file(path)
-        return int(seg.duration_seconds * 1000)
-    except Exception:
-        return 0
+    """Lấy thời lượng file MP3 theo milliseconds (kể cả segment đang nằm trong bộ nhớ)"""
+    from app.core.segment_store import segment_store
+    return segment_store.duration_ms(path)
+
+
+def load_audio(path: str):
+    """Đọc audio thành pydub.AudioSegment (từ bộ nhớ nếu segment chưa ghi ra đĩa)"""
+    from app.core.segment_store import segment_store
+    return segment_store.load_audio(path)
 
 
 def ms_to_mmss(ms: int) -> str:
@@ -29,9 +34,9 @@ def ms_to_mmss(ms: int) -> str:
 
 def prepare_pydub_ffmpeg():
     """Chuẩn bị FFmpeg cho pydub"""
-    ffmpeg = which("ffmpeg") or r"C:\ffmpeg\bin\ffmpeg.exe"
-    ffprobe = which("ffprobe") or r"C:\ffmpeg\bin\ffprobe.exe"
-    AudioSegment.converter = ffmpeg
-    AudioSegment.ffprobe = ffprobe
+    ffmpeg = pydub_utils.which("ffmpeg") or r"C:\ffmpeg\bin\ffmpeg.exe"
+    ffprobe = pydub_utils.which("ffprobe") or r"C:\ffmpeg\bin\ffprobe.exe"
+    pydub.AudioSegment.converter = ffmpeg
+    pydub.AudioSegment.ffprobe = ffprobe
 
 
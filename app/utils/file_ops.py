@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+File operations - Di chuyển file tải về mà không copy lại dữ liệu
+- Thư mục tạm (staging) đặt ngay trong thư mục đích, tức cùng filesystem
+- Chuyển file bằng os.replace (atomic, chỉ đổi tên); chỉ copy khi khác ổ đĩa
+"""
+
+import errno
+import os
+import shutil
+import stat
+import tempfile
+from typing import Optional
+
+from app.utils.helps import hide_directory_on_windows
+
+
+def staging_dir(dest_dir: str, prefix: str = ".yt_download_", name: Optional[str] = None) -> str:
+    """
+    Tạo thư mục tạm nằm trong dest_dir để file tải xong chỉ cần đổi tên sang đích.
+    Nếu không ghi được vào dest_dir thì dùng thư mục tạm của hệ thống.
+    name: tên cố định (dùng lại thư mục cũ nếu đã có) thay cho tên ngẫu nhiên
+    """
+    try:
+        os.makedirs(dest_dir, exist_ok=True)
+        if name:
+            path = os.path.join(dest_dir, name)
+            os.makedirs(path, exist_ok=True)
+        else:
+            path = tempfile.mkdtemp(prefix=prefix, dir=dest_dir)
+    except OSError:
+        if name:
+            path = os.path.join(tempfile.gettempdir(), name.lstrip("."))
+            os.makedirs(path, exist_ok=True)
+            return path
+        return tempfile.mkdtemp(prefix=prefix.lstrip("."))
+    try:
+        hide_directory_on_windows(path)
+    except OSError:
+        pass
+    return path
+
+
+def move_file(src: str, dst: str) -> bool:
+    """
+    Chuyển src tới dst (ghi đè nếu đã có).
+
+    Returns:
+        bool: True nếu chỉ đổi tên (cùng filesystem), False nếu phải copy sang ổ khác
+    """
+    try:
+        os.replace(src, dst)
+        return True
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+    # Khác ổ đĩa: copy vào file tạm cạnh đích rồi đổi tên để đích không bao giờ dở dang
+    tmp = f"{dst}.moving"
+    try:
+        shutil.copy2(src, tmp)
+        os.replace(tmp, dst)
+    except Exception:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    os.remove(src)
+    return False
+
+
+def remove_tree(path: str) -> None:
+    """Xóa thư mục (kể cả file chỉ đọc trên Windows), bỏ qua lỗi"""
+    if not path or not os.path.exists(path):
+        return
+
+    def _on_rm_error(func, p, exc_info):
+        try:
+            os.chmod(p, stat.S_IWRITE)
+            func(p)
+        except Exception:
+            pass
+    shutil.rmtree(path, onerror=_on_rm_error)
@@ -1,16 +1,14 @@
 import re
 import os
 import json
-import shutil
-import tempfile
 from datetime import datetime
 from typing import List, Tuple
 import asyncio
-from pydub import AudioSegment
-from pydub.utils import which
-import edge_tts
 
 from app.core.config import AppConfig
+from app.utils.lazy_import import lazy_import
+
+edge_tts = lazy_import("edge_tts")
 
 # ---------- Text split ----------
 
@@ -142,6 +140,26 @@ def tts_sync_save(text, out_path, voice, rate_percent, pitch_hz):
         pitch=f"{pitch_hz:+d}Hz",
     ))
 
+
+async def _edge_tts_bytes_async(text: str, voice: str, rate: str, pitch: str) -> bytes:
+    communicate = edge_tts.Communicate(
+        text, voice=voice, rate=rate, pitch=pitch)
+    audio = bytearray()
+    async for chunk in communicate.stream():
+        if chunk["type"] == "audio":
+            audio += chunk["data"]
+    return bytes(audio)
+
+
+def tts_sync_bytes(text, voice, rate_percent, pitch_hz) -> bytes:
+    """Như tts_sync_save nhưng trả về dữ liệu MP3 trong bộ nhớ (không ghi file)"""
+    return asyncio.run(_edge_tts_bytes_async(
+        text,
+        voice=voice,
+        rate=f"{rate_percent:+d}%",
+        pitch=f"{pitch_hz:+d}Hz",
+    ))
+
 # ---------- Audio helpers ----------
 # Moved to audio_helpers.py to avoid circular import
 
@@ -150,28 +168,20 @@ def tts_sync_save(text, out_path, voice, rate_percent, pitch_hz):
 
 def clean_all_temp_parts():
     """
-    Xóa tất cả các thư mục tạm thời của ứng dụng
+    Xóa các file/thư mục tạm của phiên hiện tại không còn được dùng
+    (file SegmentManager còn giữ được giữ lại). Không quét lại thư mục tạm
+    của hệ thống; thư mục của các phiên cũ được dọn một lần khi khởi động
+    (temp_workspace.reclaim_orphans).
 
     Returns:
-        int: Số lượng thư mục đã xóa thành công
+        int: Số lượng artifact đã xóa
     """
-    cleaned_count = 0
-    tmpdir = tempfile.gettempdir()
-
+    from app.core.temp_workspace import temp_workspace
     try:
-        for name in os.listdir(tmpdir):
-            p = os.path.join(tmpdir, name)
-            if os.path.isdir(p) and name.startswith(AppConfig.TEMP_PREFIX):
-                try:
-                    shutil.rmtree(p, ignore_errors=True)
-                    cleaned_count += 1
-                    print(f"Đã xóa thư mục tạm: {name}")
-                except Exception as e:
-                    print(f"Lỗi khi xóa thư mục {name}: {e}")
+        return temp_workspace.cleanup()
     except Exception as e:
-        print(f"Lỗi khi quét thư mục tạm: {e}")
-
-    return cleaned_count
+        print(f"Lỗi khi dọn thư mục tạm: {e}")
+        return 0
 
 
 def timestamp_str():
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Lazy import - Trì hoãn import các thư viện nặng tới lần dùng đầu tiên
+(pydub, edge_tts, openai, google.generativeai, deep_translator, requests...)
+để cửa sổ chính hiện lên mà không phải chờ nạp toàn bộ provider.
+
+Cách dùng:
+    pydub = lazy_import("pydub")
+    ...
+    seg = pydub.AudioSegment.from_file(path)   # pydub chỉ được import tại đây
+"""
+
+import importlib
+import sys
+import threading
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Module đại diện: import module thật ở lần truy cập thuộc tính đầu tiên"""
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+        self.__dict__["_lazy_target"] = None
+        self.__dict__["_lazy_lock"] = threading.Lock()
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__["_lazy_target"]
+        if module is None:
+            with self.__dict__["_lazy_lock"]:
+                module = self.__dict__["_lazy_target"]
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__["_lazy_target"] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr: str, value) -> None:
+        setattr(self._load(), attr, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_lazy_target"] is not None else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """Trả về module nếu đã được import, ngược lại trả về LazyModule"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+
+def is_loaded(module: types.ModuleType) -> bool:
+    """Module (hoặc LazyModule) đã thực sự được import chưa"""
+    if isinstance(module, LazyModule):
+        return module.__dict__["_lazy_target"] is not None
+    return True
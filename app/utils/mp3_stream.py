@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+MP3 stream helpers
+Tách frame MPEG Layer III (bỏ tag ID3, frame Xing/Info) để nối trực tiếp nhiều file MP3
+vào một file mà không cần giải mã/mã hoá lại
+"""
+
+import io
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from app.utils.lazy_import import lazy_import
+
+pydub = lazy_import("pydub")
+
+
+# kbps theo chỉ số bitrate (Layer III): MPEG1 / MPEG2 & 2.5
+_BITRATES = {
+    True: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    False: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+# Hz theo bit phiên bản: 3 = MPEG1, 2 = MPEG2, 0 = MPEG2.5
+_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+
+class Mp3Format(NamedTuple):
+    sample_rate: int
+    channels: int
+    bitrate_kbps: int
+    samples_per_frame: int
+
+
+class Mp3Frames(NamedTuple):
+    data: bytes  # Các frame audio liền nhau
+    frames: int
+    fmt: Optional[Mp3Format]
+
+    @property
+    def duration_ms(self) -> int:
+        if not self.fmt:
+            return 0
+        return self.frames * self.fmt.samples_per_frame * 1000 // self.fmt.sample_rate
+
+
+def _frame_header(buf, pos: int) -> Optional[Tuple[int, Mp3Format]]:
+    """(độ dài frame, định dạng) nếu tại pos là header MPEG Layer III hợp lệ"""
+    if pos + 4 > len(buf) or buf[pos] != 0xFF or (buf[pos + 1] & 0xE0) != 0xE0:
+        return None
+    version = (buf[pos + 1] >> 3) & 3
+    layer = (buf[pos + 1] >> 1) & 3
+    bitrate_idx = buf[pos + 2] >> 4
+    rate_idx = (buf[pos + 2] >> 2) & 3
+    if version == 1 or layer != 1 or bitrate_idx in (0, 15) or rate_idx == 3:
+        return None
+    mpeg1 = version == 3
+    bitrate = _BITRATES[mpeg1][bitrate_idx]
+    sample_rate = _SAMPLE_RATES[version][rate_idx]
+    samples = 1152 if mpeg1 else 576
+    padding = (buf[pos + 2] >> 1) & 1
+    length = samples // 8 * bitrate * 1000 // sample_rate + padding
+    channels = 1 if (buf[pos + 3] >> 6) == 3 else 2
+    return length, Mp3Format(sample_rate, channels, bitrate, samples)
+
+
+def _id3v2_size(buf) -> int:
+    if len(buf) < 10 or bytes(buf[:3]) != b"ID3":
+        return 0
+    size = (buf[6] << 21) | (buf[7] << 14) | (buf[8] << 7) | buf[9]
+    footer = 10 if buf[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def split_frames(data) -> Mp3Frames:
+    """Lấy phần frame audio của một file MP3 (bỏ ID3v2/ID3v1, frame Xing/Info, rác giữa frame)"""
+    buf = memoryview(data)
+    end = len(buf)
+    if end >= 128 and bytes(buf[end - 128:end - 125]) == b"TAG":
+        end -= 128
+    pos = _id3v2_size(buf)
+    out = io.BytesIO()
+    frames = 0
+    fmt = None
+    first = True
+    while pos + 4 <= end:
+        header = _frame_header(buf, pos)
+        if header is None or pos + header[0] > end:
+            pos += 1  # Tìm lại sync
+            continue
+        length, frame_fmt = header
+        frame = buf[pos:pos + length]
+        # Frame Xing/Info (LAME) chỉ chứa thông tin VBR, không có audio
+        if first and (b"Xing" in bytes(frame[:64]) or b"Info" in bytes(frame[:64])):
+            first = False
+            pos += length
+            continue
+        first = False
+        fmt = fmt or frame_fmt
+        out.write(frame)
+        frames += 1
+        pos += length
+    return Mp3Frames(out.getvalue(), frames, fmt)
+
+
+_silence_cache: Dict[Tuple[int, Mp3Format], Mp3Frames] = {}
+
+
+def silence_frames(duration_ms: int, fmt: Mp3Format) -> Mp3Frames:
+    """Frame MP3 khoảng lặng cùng định dạng với luồng đang ghi (mã hoá một lần, dùng lại)"""
+    key = (duration_ms, fmt)
+    cached = _silence_cache.get(key)
+    if cached is None:
+        seg = pydub.AudioSegment.silent(duration=duration_ms, frame_rate=fmt.sample_rate)
+        seg = seg.set_channels(fmt.channels)
+        buf = io.BytesIO()
+        seg.export(buf, format="mp3", bitrate=f"{fmt.bitrate_kbps}k")
+        cached = _silence_cache[key] = split_frames(buf.getvalue())
+    return cached
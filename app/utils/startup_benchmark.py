@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Startup benchmark - Đo thời gian import khi khởi động (python -X importtime)
+
+Chạy từ thư mục gốc dự án:
+    python -m app.utils.startup_benchmark              # đo "import main"
+    python -m app.utils.startup_benchmark --runs 5 --top 30
+    python -m app.utils.startup_benchmark --module app.tabs.translate_tab --json
+
+Mỗi lần đo chạy một tiến trình Python mới (cold import), lấy lần nhanh nhất,
+tổng hợp theo module (cumulative) và theo package gốc (self), đồng thời cảnh báo
+nếu các thư viện nặng lẽ ra phải nạp lười lại bị import lúc khởi động.
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+# Thư viện nặng chỉ nên được import khi dùng tới (xem app/utils/lazy_import.py)
+HEAVY_MODULES = (
+    "google.generativeai",
+    "openai",
+    "deep_translator",
+    "langdetect",
+    "edge_tts",
+    "pydub",
+    "requests",
+)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+class ImportEntry(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr: str) -> List[ImportEntry]:
+    """Phân tích output của -X importtime"""
+    entries = []
+    for line in stderr.splitlines():
+        m = _LINE_RE.match(line)
+        if not m:
+            continue
+        self_us, cumulative_us, indent, module = m.groups()
+        # Mỗi cấp lồng nhau thụt thêm 2 khoảng trắng (cấp 0 có 1 khoảng trắng)
+        entries.append(ImportEntry(module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return entries
+
+
+def run_importtime(module: str, python: str = sys.executable) -> List[ImportEntry]:
+    """Import module trong một tiến trình mới và trả về các dòng importtime"""
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(PROJECT_ROOT), capture_output=True, text=True,
+    )
+    entries = parse_importtime(result.stderr)
+    if result.returncode != 0:
+        tail = "\n".join(l for l in result.stderr.splitlines() if not l.startswith("import time:"))
+        raise RuntimeError(f"Import {module} thất bại:\n{tail.strip()}")
+    return entries
+
+
+def summarize(entries: List[ImportEntry], top: int = 20) -> Dict:
+    """Tổng hợp: tổng thời gian, top module theo cumulative, top package theo self"""
+    total_us = sum(e.cumulative_us for e in entries if e.depth == 0)
+    by_package: Dict[str, int] = {}
+    for e in entries:
+        root = e.module.split(".")[0]
+        by_package[root] = by_package.get(root, 0) + e.self_us
+    imported = {e.module for e in entries}
+    heavy = [name for name in HEAVY_MODULES if name in imported]
+    return {
+        "total_ms": round(total_us / 1000, 1),
+        "module_count": len(entries),
+        "top_cumulative": [
+            {"module": e.module, "cumulative_ms": round(e.cumulative_us / 1000, 1),
+             "self_ms": round(e.self_us / 1000, 1)}
+            for e in sorted(entries, key=lambda e: e.cumulative_us, reverse=True)[:top]
+        ],
+        "top_packages": [
+            {"package": name, "self_ms": round(us / 1000, 1)}
+            for name, us in sorted(by_package.items(), key=lambda kv: kv[1], reverse=True)[:top]
+        ],
+        "eager_heavy_modules": heavy,
+    }
+
+
+def format_report(module: str, summary: Dict, runs: List[float]) -> str:
+    lines = [
+        f"📦 import {module}: {summary['total_ms']:.1f} ms "
+        f"(tốt nhất trong {len(runs)} lần: {', '.join(f'{r:.1f}' for r in runs)} ms), "
+        f"{summary['module_count']} module",
+        "",
+        "⏱️ Top module (cumulative):",
+    ]
+    for row in summary["top_cumulative"]:
+        lines.append(f"  {row['cumulative_ms']:>9.1f} ms  (self {row['self_ms']:>7.1f})  {row['module']}")
+    lines += ["", "📚 Top package (self):"]
+    for row in summary["top_packages"]:
+        lines.append(f"  {row['self_ms']:>9.1f} ms  {row['package']}")
+    lines.append("")
+    if summary["eager_heavy_modules"]:
+        lines.append("⚠️ Thư viện nặng bị import lúc khởi động: " + ", ".join(summary["eager_heavy_modules"]))
+    else:
+        lines.append("✅ Không có thư viện nặng nào bị import lúc khởi động")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Đo thời gian import khi khởi động")
+    parser.add_argument("--module", default="main", help="Module cần đo (mặc định: main)")
+    parser.add_argument("--runs", type=int, default=3, help="Số lần đo, lấy lần nhanh nhất")
+    parser.add_argument("--top", type=int, default=20, help="Số dòng trong mỗi bảng")
+    parser.add_argument("--json", action="store_true", help="In kết quả dạng JSON")
+    args = parser.parse_args(argv)
+
+    best: Optional[Dict] = None
+    totals = []
+    try:
+        for _ in range(max(1, args.runs)):
+            summary = summarize(run_importtime(args.module), args.top)
+            totals.append(summary["total_ms"])
+            if best is None or summary["total_ms"] < best["total_ms"]:
+                best = summary
+    except RuntimeError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps({"module": args.module, "runs_ms": totals, **best}, ensure_ascii=False, indent=2))
+    else:
+        print(format_report(args.module, best, totals))
+    return 1 if best["eager_heavy_modules"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
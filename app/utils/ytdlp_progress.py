@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+yt-dlp progress - Tiến trình tải dạng máy đọc được
+- yt-dlp in tiến trình theo --progress-template (một dòng có tiền tố cố định)
+  nên worker chỉ cần tách trường, không phải regex từng dòng log
+- DownloadProgress: trạng thái gọn của một lượt tải (bytes, tốc độ, ETA)
+- ProgressThrottle: gộp cập nhật về ~10 lần/giây cho mỗi lượt tải
+"""
+
+import time
+from typing import List, NamedTuple, Optional
+
+PROGRESS_PREFIX = "[progress]"
+PROGRESS_TEMPLATE = (
+    f"download:{PROGRESS_PREFIX} %(progress.status)s %(progress.downloaded_bytes)s "
+    "%(progress.total_bytes)s %(progress.total_bytes_estimate)s "
+    "%(progress.speed)s %(progress.eta)s"
+)
+PROGRESS_INTERVAL_S = 0.1  # ~10 Hz
+
+
+def progress_args() -> List[str]:
+    """Tham số yt-dlp để in tiến trình theo PROGRESS_TEMPLATE"""
+    return ["--progress-template", PROGRESS_TEMPLATE]
+
+
+def _number(value: str) -> Optional[float]:
+    try:
+        return float(value)
+    except ValueError:
+        return None  # "NA"
+
+
+def format_bytes(size: Optional[float]) -> str:
+    if size is None:
+        return "?"
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}" if unit != "B" else f"{int(size)} B"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+class DownloadProgress(NamedTuple):
+    """Trạng thái một lượt tải (một file) theo yt-dlp"""
+    status: str  # downloading | finished | error
+    downloaded: float = 0
+    total: Optional[float] = None  # total_bytes hoặc total_bytes_estimate
+    speed: Optional[float] = None  # bytes/giây
+    eta: Optional[float] = None  # giây
+
+    @property
+    def finished(self) -> bool:
+        return self.status != "downloading"
+
+    @property
+    def percent(self) -> float:
+        if self.status == "finished":
+            return 100.0
+        if not self.total:
+            return 0.0
+        return min(100.0, self.downloaded * 100.0 / self.total)
+
+    def describe(self) -> str:
+        """Chuỗi ngắn: '45% • 12.3 MB/s • ETA 00:42'"""
+        parts = [f"{self.percent:.0f}%"]
+        if self.speed:
+            parts.append(f"{format_bytes(self.speed)}/s")
+        if self.eta is not None and not self.finished:
+            minutes, seconds = divmod(int(self.eta), 60)
+            parts.append(f"ETA {minutes:02d}:{seconds:02d}")
+        return " • ".join(parts)
+
+
+def parse_progress(line: str) -> Optional[DownloadProgress]:
+    """Đọc một dòng PROGRESS_TEMPLATE, None nếu là dòng log bình thường"""
+    if not line.startswith(PROGRESS_PREFIX):
+        return None
+    fields = line[len(PROGRESS_PREFIX):].split()
+    if len(fields) < 6:
+        return None
+    status, downloaded, total, estimate, speed, eta = fields[:6]
+    return DownloadProgress(
+        status=status,
+        downloaded=_number(downloaded) or 0,
+        total=_number(total) or _number(estimate),
+        speed=_number(speed),
+        eta=_number(eta),
+    )
+
+
+class ProgressThrottle:
+    """Cho qua tối đa một cập nhật mỗi interval giây (cập nhật cuối cùng luôn được cho qua)"""
+
+    def __init__(self, interval: float = PROGRESS_INTERVAL_S) -> None:
+        self.interval = interval
+        self._last = 0.0
+
+    def ready(self, force: bool = False) -> bool:
+        now = time.monotonic()
+        if force or now - self._last >= self.interval:
+            self._last = now
+            return True
+        return False
@@ -5,29 +5,27 @@ Chứa các worker class để xử lý text-to-speech song song và batch proce
 """
 
 import os
-import tempfile
 from datetime import datetime
 import time
 import random
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional, List
 
 from PySide6.QtCore import QThread, Signal
 
 from app.core.config import AppConfig
+from app.core.job_scheduler import job_scheduler
+from app.core.reorder_window import OrderedSubmitter, ReorderWindow
 from app.utils.helps import split_text, tts_sync_save, save_log_entry, group_by_char_limit_with_len
 from app.utils.audio_helpers import get_mp3_duration_ms
 from app.utils.helps import hide_directory_on_windows
 from app.utils.historyLog import save_history_log
 import json
-import uuid
 from app.ui_setting import resource_path
 import subprocess
-import re
-PROGRESS_RE = re.compile(r"\[download\]\s+(\d{1,3}(?:\.\d{1,2})?)%")
 
-import shutil   
+from app.utils.file_ops import staging_dir, move_file, remove_tree
+from app.utils.ytdlp_progress import ProgressThrottle, parse_progress, progress_args
 class NTDownloadWorker(QThread):
     """
     Worker đa luồng cho việc tạo audio TTS
@@ -112,14 +110,27 @@ class NTDownloadWorker(QThread):
             self.status.emit(
                 f"🚀 Bắt đầu tải {total} url bằng {self.workers} luồng...")
 
-            # Khởi tạo biến theo dõi tiến trình
-            # Dict lưu kết quả đã hoàn thành {index: (path, duration)}
-            completed = {}
-            next_index = 1  # Index tiếp theo cần emit
-            emitted = 0     # Số đoạn đã emit
+            # Emit theo đúng thứ tự qua cửa sổ có giới hạn (kết quả về sớm giữ tối đa REORDER_WINDOW url)
+            emitted = 0     # Số url đã emit
+
+            def on_emit(index1: int, result: tuple) -> None:
+                nonlocal emitted
+                if self.stop_flag:
+                    return
+                _idx1, url, title, _dst = result
+                self.segment_ready.emit(url, title)
+                emitted += 1
+                self.progress.emit(emitted, total)
+
+            def on_skip(index1: int, error: str) -> None:
+                if not self.stop_flag:
+                    self.status.emit(f"⚠️ {error}")
+
+            window = ReorderWindow(on_emit, on_skip)
 
             def job(index1: int, content: str) -> tuple:
                 self.temp_dir = ""
+                temp_dir = ""
                 title = ""
                 
                 # Lấy thông tin thread hiện tại
@@ -140,10 +151,11 @@ class NTDownloadWorker(QThread):
                     if self.video_mode != "Video":
                         output_template = f"playlist_{index1:02d}_%(title)s.%(ext)s"
                     
-                    self.temp_dir = tempfile.mkdtemp(prefix="yt_download_")
-                    self.temp_dir = os.path.join(self.temp_dir, str(uuid.uuid4()))
-                    os.makedirs(self.temp_dir, exist_ok=True)
-                    temp_output = os.path.join(self.temp_dir, output_template)
+                    # Thư mục tạm nằm trong thư mục đích (cùng ổ đĩa) để chỉ cần đổi tên khi xong
+                    dst = "Videos"
+                    temp_dir = staging_dir(dst)
+                    self.temp_dir = temp_dir
+                    temp_output = os.path.join(temp_dir, output_template)
                     
                     download_cmd = self._build_command(
                         self.ytdlp_path, temp_output, content)
@@ -180,6 +192,7 @@ class NTDownloadWorker(QThread):
                     start_time = time.time()
                     timeout_seconds = 300  # 5 phút timeout
                     
+                    throttle = ProgressThrottle()
                     try:
                         for line in self.process.stdout:
                             if self.stop_flag:
@@ -200,14 +213,17 @@ class NTDownloadWorker(QThread):
                                 self.process.terminate()
                                 raise Exception(f"Timeout sau {timeout_seconds}s - URL có thể bị treo")
 
-                            if line.strip():
-                                stdout_lines.append(line.strip())
-                                self.status.emit(line.strip()) 
-                                match = PROGRESS_RE.search(line)
-                                if match:
-                                    percent = int(float(match.group(1)))
-                                    if percent < 90:
-                                        self.progress_single.emit(int(percent))
+                            line = line.strip()
+                            if not line:
+                                continue
+                            progress = parse_progress(line)
+                            if progress is not None:
+                                # Tiến trình: gộp ~10 Hz, không đẩy từng dòng vào log
+                                if progress.percent < 90 and throttle.ready():
+                                    self.progress_single.emit(int(progress.percent))
+                                continue
+                            stdout_lines.append(line)
+                            self.status.emit(line)
                     
                         # Chờ process hoàn thành với timeout
                         return_code = self.process.wait(timeout=timeout_seconds)
@@ -227,24 +243,16 @@ class NTDownloadWorker(QThread):
                     
                     self.status.emit(f"✅ Xong tải video: {title}") 
                     
-                    # Copy file vào thư mục Videos
-                    dst = "Videos"
-                    os.makedirs(dst, exist_ok=True)
-                    
                     # Tìm file đã tải trong temp_dir
-                    downloaded_files = [f for f in os.listdir(self.temp_dir) if os.path.isfile(os.path.join(self.temp_dir, f))]
+                    downloaded_files = [f for f in os.listdir(temp_dir) if os.path.isfile(os.path.join(temp_dir, f))]
                     if downloaded_files:
-                        # Copy từng file vào thư mục Videos
+                        # Chuyển từng file vào thư mục Videos (đổi tên, không copy)
                         for file_name in downloaded_files:
-                            src_file = os.path.join(self.temp_dir, file_name)
+                            src_file = os.path.join(temp_dir, file_name)
                             dst_file = os.path.join(dst, file_name)
-                            shutil.copy2(src_file, dst_file)
-                    
-                    # Dọn dẹp temp_dir
-                    # if os.path.exists(self.temp_dir):
-                    #     shutil.rmtree(self.temp_dir)
+                            move_file(src_file, dst_file)
                     
-                    print(f"Đã copy file vào {dst}")
+                    print(f"Đã chuyển file vào {dst}")
                     
                     # Log hoàn thành
                     self.status.emit(f"🧵 Thread {thread_name} (ID: {thread_id}) hoàn thành URL {index1}")
@@ -258,9 +266,15 @@ class NTDownloadWorker(QThread):
                     self.status.emit(f"❌ Thread {thread_name} (ID: {thread_id}) - {error_msg}")
                     print(f"❌ Thread {thread_name} (ID: {thread_id}) - {error_msg}")
                     raise Exception(error_msg)
+                finally:
+                    # Không để thư mục tạm sót lại trong thư mục đích (lỗi/dừng giữa chừng)
+                    remove_tree(temp_dir)
 
             # Xử lý đa luồng theo batch để tránh treo và rate-limit
-            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            with job_scheduler.executor("download", self.workers, label="nt-download") as executor:
+                # Không hedge: tải lại cùng một URL song song sẽ ghi đè file của nhau
+                submitter = OrderedSubmitter(executor, window, job, chunks,
+                                             should_stop=lambda: self.stop_flag, hedge_after=None)
                 # Giảm batch size để tránh treo
                 batch_size = min(50, total)  # Tối đa 50 URLs mỗi batch
                 for batch_start in range(0, total, batch_size):
@@ -274,33 +288,11 @@ class NTDownloadWorker(QThread):
                     self.status.emit(f"📦 Bắt đầu batch {batch_num}: URLs {batch_start + 1}-{batch_end} (sử dụng {self.workers} threads)")
                     print(f"📦 Bắt đầu batch {batch_num}: URLs {batch_start + 1}-{batch_end} (sử dụng {self.workers} threads)")
                     
-                    # Submit batch hiện tại
-                    futures = [executor.submit(job, i + 1, chunks[i])
-                               for i in range(batch_start, batch_end)]
-
-                    # Xử lý kết quả của batch
-                    for future in as_completed(futures):
-                        if self.stop_flag:
-                            self.status.emit(
-                                "⏹ Đã dừng theo yêu cầu người dùng.")
-                            break
-
-                        try:
-                            idx1, url, title, temp_output = future.result()
-                            completed[idx1] = (url, title)
-                        except Exception as e:
-                            self.status.emit(f"⚠️ {str(e)}")
-                            continue
-
-                        # Emit các đoạn theo đúng thứ tự (status + progress)
-                        while next_index in completed:
-                            url, title = completed.pop(next_index)
-                            self.segment_ready.emit(url, title)
-                            emitted += 1
-                            self.progress.emit(emitted, total)
-                            next_index += 1
-
-                    if self.stop_flag:
+                    # Gửi batch hiện tại (chặn khi cửa sổ đầy) rồi chờ emit hết batch
+                    if not (submitter.submit(range(batch_start + 1, batch_end + 1))
+                            and submitter.wait(batch_end)):
+                        self.status.emit("⏹ Đã dừng theo yêu cầu người dùng.")
+                        executor.shutdown(wait=False, cancel_futures=True)
                         break
 
                     # Log hoàn thành batch
@@ -318,13 +310,7 @@ class NTDownloadWorker(QThread):
                             self.msleep(step)
                             remaining_ms -= step
 
-            # Emit các đoạn còn lại (nếu có)
-            while not self.stop_flag and next_index in completed:
-                url, title = completed.pop(next_index)
-                self.segment_ready.emit(url, title)
-                emitted += 1
-                self.progress.emit(emitted, total)
-                next_index += 1
+            self.status.emit(window.metrics().describe())
 
             if not self.stop_flag:
 
@@ -353,7 +339,7 @@ class NTDownloadWorker(QThread):
         """Xây dựng lệnh yt-dlp với retry và fallback options"""
         cmd = [ytdlp_path]
         cmd += ["--encoding", "utf-8"]
-        cmd += [url, "--progress", "--newline"]
+        cmd += [url, "--progress", "--newline"] + progress_args()
         
         # Thêm đường dẫn ffmpeg nếu tồn tại
         if os.path.exists(self.ffmpeg_path):
@@ -5,25 +5,31 @@ Chứa các worker class để xử lý text-to-speech song song và batch proce
 """
 
 import os
-import tempfile
 from datetime import datetime
 import time
 import random
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import queue
+from concurrent.futures import as_completed
 from tokenize import Double
-from typing import Optional, List
+from typing import Callable, Optional, List, Tuple
 
 from PySide6.QtCore import QThread, Signal
-from pydub import AudioSegment
 
 from app.core.config import AppConfig
-from app.utils.helps import split_text, tts_sync_save, save_log_entry, group_by_char_limit_with_len
+from app.utils.helps import split_text, tts_sync_bytes, save_log_entry, group_by_char_limit_with_len
 from app.utils.audio_helpers import get_mp3_duration_ms
-from app.utils.helps import hide_directory_on_windows
+from app.core.temp_workspace import temp_workspace
+from app.core.segment_store import segment_store
+from app.core.job_scheduler import job_scheduler
+from app.core.batch_scheduler import BatchFile, BatchFileScheduler, ORDER_SJF
+from app.core.ordered_writer import OrderedMp3Writer
+from app.core.reorder_window import OrderedSubmitter, ReorderWindow
 from app.utils.historyLog import save_history_log
+from app.utils.lazy_import import lazy_import
 import json
-import uuid
+
+pydub = lazy_import("pydub")
 # ==================== MTProducerWorker - Worker đa luồng cho Tab TTS ====================
 
 
@@ -47,7 +53,8 @@ class MTProducerWorker(QThread):
     all_done = Signal()                    # all processing done
     error = Signal(str)                    # error message
 
-    def __init__(self, text: str, voice: str, rate: float, pitch: float, max_len: int, workers: int) -> None:
+    def __init__(self, text: str, voice: str, rate: float, pitch: float, max_len: int, workers: int,
+                 voice_resolver: Optional[Callable[[List[str]], List[str]]] = None) -> None:
         """
         Khởi tạo worker TTS đa luồng
 
@@ -58,6 +65,8 @@ class MTProducerWorker(QThread):
             pitch: Cao độ (ví dụ: "+5Hz", "-10Hz", "0Hz")
             max_len: Độ dài tối đa mỗi đoạn (ký tự)
             workers: Số luồng xử lý song song
+            voice_resolver: Chọn voice cho từng đoạn (ví dụ theo ngôn ngữ phát hiện được);
+                None = dùng chung voice cho mọi đoạn
         """
         super().__init__()
 
@@ -68,11 +77,11 @@ class MTProducerWorker(QThread):
         self.pitch: float = pitch
         self.max_len: int = max_len
         self.workers: int = max(1, workers)  # Tối thiểu 1 worker
+        self.voice_resolver = voice_resolver
         self.group_max_items: int = 10      # NEW: tối đa bao nhiêu ý/nhóm
         self.group_sep: str = " | "
         # Trạng thái worker
         self.stop_flag: bool = False
-        self.tmpdir: Optional[str] = None
 
     def stop(self) -> None:
         """
@@ -105,23 +114,40 @@ class MTProducerWorker(QThread):
                 self.error.emit("❌ Không thể tách văn bản thành các đoạn.")
                 return
 
-            self.tmpdir = Path(tempfile.mkdtemp(prefix=AppConfig.TEMP_PREFIX))
-            hide_directory_on_windows(self.tmpdir)
+            # Voice cho từng đoạn (phát hiện ngôn ngữ theo lô, chạy trên luồng worker)
+            voices = [self.voice] * total
+            if self.voice_resolver:
+                try:
+                    voices = self.voice_resolver(chunks)
+                    distinct = len(set(voices))
+                    if distinct > 1:
+                        self.status.emit(f"🌐 Văn bản có {distinct} giọng đọc theo ngôn ngữ từng đoạn")
+                except Exception as e:
+                    self.status.emit(f"⚠️ Không chọn được voice theo đoạn: {e}")
 
-            # Tạo thư mục con với UUID
-            self.tmpdir = self.tmpdir / str(uuid.uuid4())
-            self.tmpdir.mkdir(parents=True, exist_ok=True)
-            hide_directory_on_windows(self.tmpdir)
-            # print(f"self.tmpdir: {self.tmpdir}")
             self.status.emit(
                 f"🚀 Bắt đầu sinh {total} đoạn audio bằng {self.workers} luồng...")
 
-            # Khởi tạo biến theo dõi tiến trình
-            # Dict lưu kết quả đã hoàn thành {index: (path, duration)}
-            completed = {}
-            next_index = 1  # Index tiếp theo cần emit
+            # Emit theo đúng thứ tự qua cửa sổ có giới hạn (kết quả về sớm giữ tối đa REORDER_WINDOW đoạn)
             emitted = 0     # Số đoạn đã emit
 
+            def on_emit(index1: int, result: tuple) -> None:
+                nonlocal emitted
+                if self.stop_flag:
+                    temp_workspace.discard(result[0])
+                    return
+                path, dur = result
+                self.segment_ready.emit(path, dur, index1)
+                emitted += 1
+                self.progress.emit(emitted, total)
+
+            def on_skip(index1: int, error: str) -> None:
+                if not self.stop_flag:
+                    self.status.emit(f"⚠️ Lỗi xử lý đoạn {index1}, bỏ qua: {error}")
+
+            # Kết quả không được emit (hedge thua, còn giữ khi dừng) -> bỏ hold của file tạm
+            window = ReorderWindow(on_emit, on_skip, on_drop=lambda i, result: temp_workspace.discard(result[0]))
+
             def job(index1: int, content: str) -> tuple:
                 """
                 Job function cho mỗi worker thread
@@ -129,55 +155,29 @@ class MTProducerWorker(QThread):
                     index1: Index của đoạn (1-based)
                     content: Nội dung văn bản đoạn
                 Returns:
-                    tuple: (index, path, duration_ms)
+                    tuple: (path, duration_ms)
                 """
-                try:
-                    path = os.path.join(self.tmpdir, f"part_{index1:04d}.mp3")
-                    tts_sync_save(content, path, self.voice,
-                                  self.rate, self.pitch)
-                    # print(f"path: {path}")
-                    dur = get_mp3_duration_ms(path)
-                    return (index1, path, dur)
-                except Exception as e:
-                    # print(f"Lỗi xử lý đoạn {index1}: {str(e)}")
-                    raise Exception(f"Lỗi xử lý đoạn {index1}: {str(e)}")
+                # Giữ audio trong bộ nhớ (segment_store tự ghi ra đĩa khi vượt ngân sách)
+                data = tts_sync_bytes(content, voices[index1 - 1],
+                                      self.rate, self.pitch)
+                path = segment_store.put(data, ".mp3", tag="part", hold=True)
+                return (path, get_mp3_duration_ms(path))
 
             # Xử lý đa luồng theo batch để tránh treo và rate-limit
-            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            with job_scheduler.executor("tts", self.workers, label="tts") as executor:
+                submitter = OrderedSubmitter(
+                    executor, window, job, chunks,
+                    should_stop=lambda: self.stop_flag,
+                    on_hedge=lambda i: self.status.emit(
+                        f"⏱ Đoạn {i} chờ quá {AppConfig.REORDER_HEDGE_AFTER_S}s, gửi thêm một lần"))
                 batch_size = 150
                 for batch_start in range(0, total, batch_size):
-                    if self.stop_flag:
-                        self.status.emit("⏹ Đã dừng theo yêu cầu người dùng.")
-                        break
-
                     batch_end = min(total, batch_start + batch_size)
-                    # Submit batch hiện tại
-                    futures = [executor.submit(job, i + 1, chunks[i])
-                               for i in range(batch_start, batch_end)]
-
-                    # Xử lý kết quả của batch
-                    for future in as_completed(futures):
-                        if self.stop_flag:
-                            self.status.emit(
-                                "⏹ Đã dừng theo yêu cầu người dùng.")
-                            break
-
-                        try:
-                            idx1, path, dur = future.result()
-                            completed[idx1] = (path, dur)
-                        except Exception as e:
-                            self.status.emit(f"⚠️ {str(e)}")
-                            continue
-
-                        # Emit các đoạn theo đúng thứ tự
-                        while next_index in completed:
-                            p, d = completed.pop(next_index)
-                            self.segment_ready.emit(p, d, next_index)
-                            emitted += 1
-                            self.progress.emit(emitted, total)
-                            next_index += 1
-
-                    if self.stop_flag:
+                    # Gửi batch hiện tại (chặn khi cửa sổ đầy) rồi chờ emit hết batch
+                    if not (submitter.submit(range(batch_start + 1, batch_end + 1))
+                            and submitter.wait(batch_end)):
+                        self.status.emit("⏹ Đã dừng theo yêu cầu người dùng.")
+                        executor.shutdown(wait=False, cancel_futures=True)
                         break
 
                     # Nếu còn batch kế tiếp, nghỉ ngẫu nhiên 500-700s như yêu cầu
@@ -193,13 +193,8 @@ class MTProducerWorker(QThread):
                             self.msleep(step)
                             remaining_ms -= step
 
-            # Emit các đoạn còn lại (nếu có)
-            while not self.stop_flag and next_index in completed:
-                p, d = completed.pop(next_index)
-                self.segment_ready.emit(p, d, next_index)
-                emitted += 1
-                self.progress.emit(emitted, total)
-                next_index += 1
+            window.close()
+            self.status.emit(window.metrics().describe())
 
             if not self.stop_flag:
 
@@ -230,6 +225,144 @@ class MTProducerWorker(QThread):
             self.error.emit(f"❌ Lỗi nghiêm trọng: {str(e)}")
 
 
+# ==================== StreamingTTSWorker - TTS nhận đoạn dần dần (pipeline dịch → đọc) ====================
+
+
+class StreamingTTSWorker(QThread):
+    """
+    Worker TTS dạng pipeline: nhận từng đoạn qua submit() trong khi worker đang chạy
+    (ví dụ ngay khi một đoạn vừa dịch xong), sinh audio song song và emit theo đúng thứ tự
+    qua ReorderWindow như MTProducerWorker (không có vòng lặp msleep chờ).
+    Gọi finish() khi không còn đoạn nào để worker kết thúc sau khi xử lý xong.
+
+    Signals giống MTProducerWorker để dùng chung các callback phát audio.
+    """
+
+    segment_ready = Signal(str, int, int)  # path, duration_ms, index1
+    progress = Signal(int, int)            # completed, total (total = 0 khi chưa biết)
+    status = Signal(str)                   # status message
+    all_done = Signal()                    # all processing done
+    error = Signal(str)                    # error message
+
+    _END = None  # Đánh thức vòng nhận đoạn khi finish()/stop()
+
+    def __init__(self, voice: str, rate: float, pitch: float, workers: int) -> None:
+        super().__init__()
+        self.voice: str = voice
+        self.rate: float = rate
+        self.pitch: float = pitch
+        self.workers: int = max(1, workers)
+
+        self.stop_flag: bool = False
+        self._inbox: "queue.Queue[Optional[Tuple[int, str]]]" = queue.Queue()
+        self._total: int = 0
+
+    def submit(self, index1: int, text: str) -> None:
+        """Thêm một đoạn cần đọc (an toàn khi gọi từ luồng UI)"""
+        self._inbox.put((index1, text))
+
+    def skip(self, index1: int) -> None:
+        """Đoạn index1 không có gì để đọc (ví dụ dịch lỗi) - giữ thứ tự để các đoạn sau không phải chờ"""
+        self._inbox.put((index1, ""))
+
+    def finish(self, total: Optional[int] = None) -> None:
+        """Báo không còn đoạn mới; total = tổng số đoạn (gồm cả đoạn bị skip) nếu biết"""
+        if total is not None:
+            self._total = total
+        self._inbox.put(self._END)
+
+    def stop(self) -> None:
+        """Dừng worker"""
+        self.stop_flag = True
+        self._inbox.put(self._END)
+
+    def _job(self, index1: int, content: str) -> Tuple[str, int]:
+        data = tts_sync_bytes(content, self.voice, self.rate, self.pitch)
+        path = segment_store.put(data, ".mp3", tag="part", hold=True)
+        return (path, get_mp3_duration_ms(path))
+
+    def run(self) -> None:
+        try:
+            texts = {}  # index1 - 1 -> nội dung (items của OrderedSubmitter), bỏ khi đã emit
+            seen = set()  # Các đoạn đã nhận (kể cả đoạn skip)
+            emitted = 0
+            processed = 0
+            submitted = 0
+
+            def on_emit(index1: int, result: tuple) -> None:
+                nonlocal emitted, processed
+                texts.pop(index1 - 1, None)
+                if self.stop_flag:
+                    temp_workspace.discard(result[0])
+                    return
+                self.segment_ready.emit(result[0], result[1], index1)
+                emitted += 1
+                processed += 1
+                self.progress.emit(processed, self._total or submitted)
+
+            def on_skip(index1: int, error: str) -> None:
+                nonlocal processed
+                texts.pop(index1 - 1, None)
+                if self.stop_flag:
+                    return
+                if error:
+                    self.status.emit(f"⚠️ Lỗi xử lý đoạn {index1}: {error}")
+                processed += 1
+                self.progress.emit(processed, self._total or submitted)
+
+            window = ReorderWindow(on_emit, on_skip, on_drop=lambda i, result: temp_workspace.discard(result[0]))
+
+            with job_scheduler.executor("tts", self.workers, label="tts-stream") as executor:
+                submitter = OrderedSubmitter(
+                    executor, window, self._job, texts,
+                    should_stop=lambda: self.stop_flag,
+                    on_hedge=lambda i: self.status.emit(
+                        f"⏱ Đoạn {i} chờ quá {AppConfig.REORDER_HEDGE_AFTER_S}s, gửi thêm một lần"))
+                while not self.stop_flag:
+                    # Chờ đoạn mới (block), vẫn hedge đoạn đầu nếu bị kẹt trong lúc chờ
+                    try:
+                        item = self._inbox.get(timeout=submitter.poll_s)
+                    except queue.Empty:
+                        submitter.maybe_hedge()
+                        continue
+                    if item is self._END:
+                        break
+                    index1, content = item
+                    seen.add(index1)
+                    submitted += 1
+                    if not content.strip():
+                        # Đoạn rỗng/bị skip: bỏ qua nhưng vẫn giữ thứ tự
+                        window.submitted(index1)
+                        window.fail(index1, "")
+                        continue
+                    texts[index1 - 1] = content
+                    if not submitter.submit((index1,)):
+                        break
+
+                total = self._total or submitted
+                # Chỉ chờ tới trước đoạn thiếu đầu tiên (chưa submit/skip) để không treo
+                missing = next((i for i in range(window.head, total + 1) if i not in seen), total + 1)
+                if not self.stop_flag:
+                    submitter.wait(missing - 1)
+                if self.stop_flag:
+                    executor.shutdown(wait=False, cancel_futures=True)
+            window.close()
+
+            if self.stop_flag:
+                self.status.emit("⏹ Đã dừng theo yêu cầu người dùng.")
+                return
+
+            self.status.emit(window.metrics().describe())
+            if missing <= total:
+                # Thiếu đoạn (chưa submit/skip) -> các đoạn sau không thể phát theo thứ tự
+                self.error.emit(f"⚠️ Chỉ tạo được {emitted}/{total} đoạn audio (thiếu đoạn {missing}).")
+                return
+            self.status.emit(f"✅ Hoàn thành tạo {emitted} đoạn audio.")
+            self.all_done.emit()
+        except Exception as e:
+            self.error.emit(f"❌ Lỗi nghiêm trọng: {str(e)}")
+
+
 # ==================== OneFileWorker & BatchWorker - Workers cho xử lý batch files ====================
 
 
@@ -277,7 +410,6 @@ class OneFileWorker(QThread):
         self.workers_chunk: int = max(1, workers_chunk)
 
         # Trạng thái worker
-        self.tempdir: Optional[Path] = None
         self.stop_flag: bool = False
 
     def stop(self) -> None:
@@ -287,9 +419,7 @@ class OneFileWorker(QThread):
     def run(self):
         start_time = datetime.now().isoformat()
         base_name = Path(self.txt_path).stem
-        self.tempdir = Path(tempfile.mkdtemp(prefix=AppConfig.TEMP_PREFIX))
-
-        hide_directory_on_windows(self.tmpdir)
+        writer: Optional[OrderedMp3Writer] = None
 
         try:
             with open(self.txt_path, "r", encoding="utf-8") as f:
@@ -303,48 +433,46 @@ class OneFileWorker(QThread):
             self.status.emit(
                 f"🔧 {base_name}: Tạo {total} đoạn bằng {self.workers_chunk} luồng…", base_name)
 
-            results, emitted = {}, 0
+            # Ghi file đích theo thứ tự ngay khi có đoạn (phát được trong lúc chạy),
+            # đoạn trung gian bị xóa ngay sau khi nối
+            out_name = f"{base_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp3"
+            out_path = AppConfig.OUTPUT_DIR / out_name
+            writer = OrderedMp3Writer(out_path, self.gap_ms)
+            emitted = 0
 
-            def job(idx1: int, content: str):
-                part_path = str(self.tempdir / f"part_{idx1:04d}.mp3")
-                print(f"part_path: {part_path}")
-                # tts_sync_save(content, part_path, self.voice,
-                #               self.rate, self.pitch)
-                d = get_mp3_duration_ms(part_path)
-                return (idx1, part_path, d)
+            def job(content: str) -> str:
+                data = tts_sync_bytes(content, self.voice, self.rate, self.pitch)
+                return segment_store.put(data, ".mp3", tag="part", hold=True)
 
-            with ThreadPoolExecutor(max_workers=self.workers_chunk) as ex:
-                futs = [ex.submit(job, i+1, c) for i, c in enumerate(chunks)]
+            with job_scheduler.executor("tts", self.workers_chunk, label=f"tts-file {base_name}") as ex:
+                futs = {ex.submit(job, c): i + 1 for i, c in enumerate(chunks)}
+                cancelled = False
                 for fut in as_completed(futs):
-                    if self.stop_flag:
-                        break
+                    if self.stop_flag and not cancelled:
+                        # Bỏ các đoạn chưa chạy; đoạn đang chạy vẫn được nối/dọn qua writer
+                        ex.shutdown(wait=False, cancel_futures=True)
+                        cancelled = True
+                    if fut.cancelled():
+                        continue
+                    idx1 = futs[fut]
                     try:
-                        idx1, p, d = fut.result()
-                        results[idx1] = (p, d)
+                        writer.add(idx1, fut.result())
                     except Exception as e:
+                        writer.skip(idx1)
                         self.status.emit(
-                            f"⚠️ {base_name}: lỗi đoạn - {e}", base_name)
+                            f"⚠️ {base_name}: lỗi đoạn {idx1}, bỏ qua - {e}", base_name)
                     emitted += 1
                     self.progress.emit(min(emitted, total), total, base_name)
 
+            stats = writer.close()
             if self.stop_flag:
-                raise RuntimeError("Bị dừng bởi người dùng.")
-
-            gap = AudioSegment.silent(duration=self.gap_ms)
-            final = AudioSegment.silent(duration=0)
-            total_ms = 0
-            for idx in range(1, total + 1):
-                if idx not in results:
+                if stats.parts_written:
                     self.status.emit(
-                        f"⚠️ {base_name}: thiếu đoạn {idx}, bỏ qua.", base_name)
-                    continue
-                seg = AudioSegment.from_file(results[idx][0])
-                total_ms += results[idx][1]
-                final += seg + gap
-
-            out_name = f"{base_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp3"
-            out_path = AppConfig.OUTPUT_DIR / out_name
-            final.export(str(out_path), format="mp3")
+                        f"⏹ {base_name}: đã ghi {stats.parts_written}/{total} đoạn vào {out_path.name}", base_name)
+                raise RuntimeError("Bị dừng bởi người dùng.")
+            if not stats.parts_written:
+                raise RuntimeError("Không tạo được đoạn audio nào.")
+            total_ms = stats.duration_ms
 
             self.status.emit(
                 f"✅ {base_name}: xong -> {out_path.name}", base_name)
@@ -359,7 +487,7 @@ class OneFileWorker(QThread):
                 "pitch_hz": self.pitch,
                 "max_chunk_chars": self.maxlen,
                 "gap_ms": self.gap_ms,
-                "created_chunks": emitted,
+                "created_chunks": stats.parts_written,
                 "total_duration_ms_est": total_ms,
                 "started_at": start_time,
                 "finished_at": datetime.now().isoformat(),
@@ -386,21 +514,38 @@ class OneFileWorker(QThread):
             }
             save_log_entry(entry)
         finally:
-            try:
-                if self.tempdir and self.tempdir.exists():
-                    import shutil
-                    shutil.rmtree(self.tempdir, ignore_errors=True)
-            except Exception:
-                pass
+            if writer is not None and not writer.close().parts_written:
+                try:
+                    os.remove(writer.out_path)
+                except OSError:
+                    pass
 
 
 class BatchWorker(QThread):
+    """
+    Worker xử lý batch nhiều file văn bản thành audio
+    Dùng BatchFileScheduler: một pool đoạn dùng chung cho mọi file (không tạo OneFileWorker
+    cho từng file), file nhỏ xử lý trước để file xong sớm nhất có thể
+
+    Signals:
+        fileProgress: Số file đã xong (done, total)
+        fileStatus: Thông báo trạng thái
+        fileDone: Một file xong (output_path, filename)
+        fileFailed: Một file lỗi (error_msg, filename)
+        chunkProgress: Tiến trình đoạn của một file (created, total, filename)
+        batchMetrics: Số liệu batch (BatchMetrics - file/s, đoạn/s)
+    """
+
     fileProgress = Signal(int, int)
     fileStatus = Signal(str)
-    attachWorker = Signal(object, str)
+    fileDone = Signal(str, str)
+    fileFailed = Signal(str, str)
+    chunkProgress = Signal(int, int, str)
+    batchMetrics = Signal(object)
 
     def __init__(self, files: list[str], voice: str, rate: str, pitch: str,
-                 maxlen: int, gap_ms: int, workers_chunk: int, workers_file: int):
+                 maxlen: int, gap_ms: int, workers_chunk: int, workers_file: int,
+                 order: str = ORDER_SJF):
         """
         Khởi tạo worker xử lý batch nhiều file
 
@@ -411,8 +556,9 @@ class BatchWorker(QThread):
             pitch: Cao độ (ví dụ: "+5Hz", "-10Hz", "0Hz")
             maxlen: Độ dài tối đa mỗi chunk
             gap_ms: Khoảng cách giữa các chunk (ms)
-            workers_chunk: Số luồng xử lý chunk trong mỗi file
-            workers_file: Số file xử lý song song
+            workers_chunk: Số luồng xử lý đoạn (dùng chung cho mọi file)
+            workers_file: Số file mở cùng lúc
+            order: Thứ tự file ("sjf" nhỏ trước, "ljf" lớn trước, "fifo")
         """
         super().__init__()
         self.files = files
@@ -421,42 +567,111 @@ class BatchWorker(QThread):
         self.pitch = pitch
         self.maxlen = maxlen
         self.gap_ms = gap_ms
-        self.workers_chunk = workers_chunk
+        self.workers_chunk = max(1, workers_chunk)
         self.workers_file = max(1, workers_file)
+        self.order = order
         self.stop_flag = False
-        self.children: list[OneFileWorker] = []
+        self.scheduler: Optional[BatchFileScheduler] = None
 
     def stop(self):
         self.stop_flag = True
-        for w in self.children:
+        if self.scheduler is not None:
+            self.scheduler.stop()
+
+    # ---------- Các bước cho BatchFileScheduler (chạy trên luồng pool) ----------
+
+    def _prepare(self, txt_path: str):
+        with open(txt_path, "r", encoding="utf-8") as f:
+            chunks = split_text(f.read(), self.maxlen)
+        base_name = Path(txt_path).stem
+        context = {"path": txt_path, "base_name": base_name,
+                   "started_at": datetime.now().isoformat(), "writer": None}
+        if chunks:
+            # File đích được ghi dần theo thứ tự đoạn (xem OrderedMp3Writer)
+            out_name = f"{base_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp3"
+            context["writer"] = OrderedMp3Writer(AppConfig.OUTPUT_DIR / out_name, self.gap_ms)
+        return chunks, context
+
+    def _synthesize(self, context: dict, idx1: int, content: str) -> None:
+        writer: OrderedMp3Writer = context["writer"]
+        try:
+            data = tts_sync_bytes(content, self.voice, self.rate, self.pitch)
+        except Exception:
+            writer.skip(idx1)
+            raise
+        writer.add(idx1, segment_store.put(data, ".mp3", tag="part", hold=True))
+
+    def _finalize(self, context: dict, results: dict, errors: List[str]) -> str:
+        base_name = context["base_name"]
+        for err in errors:
+            self.fileStatus.emit(f"⚠️ {base_name}: lỗi {err}")
+        writer: OrderedMp3Writer = context["writer"]
+        stats = writer.close()
+        if not stats.parts_written:
+            raise RuntimeError("Không tạo được đoạn audio nào.")
+        context["created_chunks"] = stats.parts_written
+        context["total_duration_ms_est"] = stats.duration_ms
+        return writer.out_path
+
+    def _release(self, context: dict) -> None:
+        writer: Optional[OrderedMp3Writer] = context.get("writer")
+        if writer is None:
+            return
+        stats = writer.close()
+        if not stats.parts_written:
             try:
-                w.stop()
-            except Exception:
+                os.remove(writer.out_path)
+            except OSError:
                 pass
 
+    def _on_chunk_done(self, bf: BatchFile) -> None:
+        self.chunkProgress.emit(bf.processed, bf.total, bf.context["base_name"])
+
+    def _on_file_done(self, bf: BatchFile, output: Optional[str], error: Optional[str]) -> None:
+        context = bf.context or {}
+        base_name = context.get("base_name", Path(bf.path).stem)
+        entry = {
+            "input_file": str(bf.path),
+            "output_file": output,
+            "media_type": "audio/mp3",
+            "voice": self.voice,
+            "rate_percent": self.rate,
+            "pitch_hz": self.pitch,
+            "max_chunk_chars": self.maxlen,
+            "gap_ms": self.gap_ms,
+            "started_at": context.get("started_at"),
+            "finished_at": datetime.now().isoformat(),
+        }
+        if error is None:
+            entry.update(created_chunks=context.get("created_chunks", 0),
+                         total_duration_ms_est=context.get("total_duration_ms_est", 0),
+                         status="success")
+            self.fileStatus.emit(f"✅ {base_name}: xong -> {Path(output).name}")
+            self.fileDone.emit(output, base_name)
+        else:
+            entry.update(status="failed", error=error)
+            self.fileFailed.emit(f"❌ {base_name}: {error}", base_name)
+        save_log_entry(entry)
+        self.fileProgress.emit(self.scheduler.stats.snapshot().files_done, len(self.files))
+
     def run(self):
         total = len(self.files)
-        done = 0
         self.fileStatus.emit(
-            f"🚀 Xử lý {total} file với {self.workers_file} file song song…")
-        idx = 0
-        active: list[OneFileWorker] = []
+            f"🚀 Xử lý {total} file ({self.workers_file} file mở cùng lúc, "
+            f"{self.workers_chunk} luồng đoạn dùng chung)…")
+        self.scheduler = BatchFileScheduler(
+            self.files, self._prepare, self._synthesize, self._finalize,
+            workers=self.workers_chunk, max_active_files=self.workers_file,
+            queue="tts", order=self.order, label="tts-batch",
+            release=self._release,
+            on_file_done=self._on_file_done,
+            on_chunk_done=self._on_chunk_done,
+            on_metrics=self.batchMetrics.emit,
+        )
+        if self.stop_flag:
+            self.scheduler.stop()
         try:
-            while idx < total or active:
-                while idx < total and len(active) < self.workers_file and not self.stop_flag:
-                    f = self.files[idx]
-                    w = OneFileWorker(f, self.voice, self.rate, self.pitch,
-                                      self.maxlen, self.gap_ms, self.workers_chunk)
-                    self.children.append(w)
-                    self.attachWorker.emit(w, Path(f).name)
-                    w.start()
-                    active.append(w)
-                    idx += 1
-                for w in list(active):
-                    if not w.isRunning():
-                        active.remove(w)
-                        done += 1
-                        self.fileProgress.emit(done, total)
-                self.msleep(100)
+            metrics = self.scheduler.run()
+            self.fileStatus.emit(metrics.describe())
         finally:
             self.fileStatus.emit("🏁 Hoàn tất batch.")
@@ -2,24 +2,163 @@ from PySide6.QtCore import Signal, QRunnable, QObject
 import sys
 import os
 import re
+import json
 import subprocess
-import shutil
-import tempfile
-import stat
 import time
 import random
+from typing import Dict, List, NamedTuple, Optional, Tuple
 from app.ui_setting import resource_path
+from app.core.config import AppConfig
+from app.core.download_archive import archive_id_for_url, file_sha256, make_archive_id
+from app.core.job_scheduler import job_scheduler
+from app.utils.file_ops import staging_dir, move_file, remove_tree
+from app.utils.ytdlp_progress import ProgressThrottle, parse_progress, progress_args
+
+# yt-dlp bỏ qua video đã có trong --download-archive
+ARCHIVED_RE = re.compile(r"has already been recorded in (?:the )?archive")
+# File yt-dlp ghi archive id của video vừa tải (nằm trong thư mục tạm, không chuyển ra đích)
+ARCHIVE_IDS_FILE = ".archive_ids"
+
+# URL chắc chắn là danh sách (playlist/kênh) dù đang ở chế độ "Video"
+COLLECTION_URL_RE = re.compile(
+    r"(/playlist\?|/@[^/?#]+/?(?:videos|shorts|streams)?/?(?:[?#]|$)|/channel/|/c/|/user/)")
+
+# Độ sâu tối đa khi mở rộng (kênh -> tab -> video)
+EXPAND_MAX_DEPTH = 2
+EXPAND_TIMEOUT_S = 120
 
-# Compile once for efficiency
-PROGRESS_RE = re.compile(r"\[download\]\s+(\d{1,3}(?:\.\d{1,2})?)%")
 
 class DownloadSignals(QObject):
     message_signal = Signal(str, str)
-    progress_signal = Signal(int)
+    status_signal = Signal(object)  # DownloadProgress, gộp ~10 Hz
     finished_signal = Signal(str)
     error_signal = Signal(str)
 
 
+class DownloadTask(NamedTuple):
+    """Một đơn vị tải: một video (có thể là mục item_index của playlist thứ video_index)"""
+    url: str
+    video_index: int
+    item_index: Optional[int] = None
+    job_id: Optional[int] = None  # id trong download_queue (None nếu chưa lưu)
+    archive_id: Optional[str] = None  # "<extractor> <id>" nếu biết trước khi tải
+
+    def resolved_archive_id(self) -> Optional[str]:
+        return self.archive_id or archive_id_for_url(self.url)
+
+
+def is_collection_url(url: str) -> bool:
+    return bool(COLLECTION_URL_RE.search(url))
+
+
+def _creation_flags() -> int:
+    return subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
+
+
+def _entry_url(entry: dict) -> Optional[str]:
+    url = entry.get("url") or entry.get("webpage_url") or entry.get("original_url")
+    if url and "://" not in url and entry.get("ie_key") == "Youtube":
+        url = f"https://www.youtube.com/watch?v={url}"
+    return url
+
+
+def _is_nested_list(entry: dict) -> bool:
+    ie_key = entry.get("ie_key") or ""
+    return entry.get("_type") == "playlist" or ie_key.endswith("Tab") or ie_key.endswith("Playlist")
+
+
+def flat_extract(ytdlp_path: str, url: str) -> dict:
+    """Lấy metadata dạng phẳng (không tải, không resolve từng video)"""
+    result = subprocess.run(
+        [ytdlp_path, "--encoding", "utf-8", "--flat-playlist", "-J", "--no-warnings", url],
+        capture_output=True, text=True, encoding="utf-8", stdin=subprocess.DEVNULL,
+        timeout=EXPAND_TIMEOUT_S, creationflags=_creation_flags(),
+    )
+    if result.returncode != 0:
+        lines = (result.stderr or "").strip().splitlines()
+        raise RuntimeError(lines[-1] if lines else f"yt-dlp lỗi (mã {result.returncode})")
+    return json.loads(result.stdout)
+
+
+def _entry_archive_id(entry: dict) -> Optional[str]:
+    extractor = entry.get("ie_key") or entry.get("extractor_key")
+    video_id = entry.get("id")
+    return make_archive_id(extractor, video_id) if extractor and video_id else None
+
+
+def expand_entries(ytdlp_path: str, info: dict, depth: int = 0) -> List[Tuple[str, Optional[str]]]:
+    """Danh sách (URL video, archive id) theo đúng thứ tự của playlist/kênh"""
+    entries = info.get("entries")
+    if entries is None:
+        url = info.get("webpage_url") or info.get("original_url")
+        return [(url, _entry_archive_id(info))] if url else []
+    urls: List[Tuple[str, Optional[str]]] = []
+    for entry in entries:
+        if not entry:
+            continue  # Video bị ẩn/xóa
+        if _is_nested_list(entry) and depth < EXPAND_MAX_DEPTH:
+            nested = entry if entry.get("entries") is not None else None
+            if nested is None:
+                nested_url = _entry_url(entry)
+                if not nested_url:
+                    continue
+                nested = flat_extract(ytdlp_path, nested_url)
+            urls.extend(expand_entries(ytdlp_path, nested, depth + 1))
+            continue
+        url = _entry_url(entry)
+        if url:
+            urls.append((url, _entry_archive_id(entry)))
+    # Bỏ trùng (kênh có thể liệt kê cùng video ở nhiều tab), giữ thứ tự
+    seen = set()
+    return [item for item in urls if not (item[0] in seen or seen.add(item[0]))]
+
+
+class PlaylistExpandSignals(QObject):
+    message_signal = Signal(str, str)
+    expanded_signal = Signal(list)  # List[DownloadTask]
+
+
+class PlaylistExpandRunnable(QRunnable):
+    """
+    Bước tiền xử lý: mở rộng playlist/kênh thành từng video (flat extraction)
+    để mỗi video là một task riêng trong QThreadPool.
+    URL không mở rộng được giữ nguyên như một task (tải như trước).
+    """
+
+    def __init__(self, urls: List[str], expand_all: bool, workers: int = 4):
+        super().__init__()
+        self.signals = PlaylistExpandSignals()
+        self.urls = urls
+        self.expand_all = expand_all
+        self.workers = max(1, workers)
+        self.stop_flag = False
+        ytdlp_path = resource_path(os.path.join("data", "yt-dlp.exe"))
+        self.ytdlp_path = ytdlp_path if os.path.exists(ytdlp_path) else "yt-dlp"
+
+    def _expand_one(self, video_index: int, url: str) -> List[DownloadTask]:
+        if self.stop_flag or not (self.expand_all or is_collection_url(url)):
+            return [DownloadTask(url, video_index)]
+        try:
+            items = expand_entries(self.ytdlp_path, flat_extract(self.ytdlp_path, url))
+        except Exception as e:
+            self.signals.message_signal.emit(
+                f"⚠️ Không mở rộng được playlist {url}: {e}. Tải nguyên playlist.", "")
+            return [DownloadTask(url, video_index)]
+        if not items:
+            return [DownloadTask(url, video_index)]
+        self.signals.message_signal.emit(
+            f"📃 URL {video_index}: {len(items)} video", "")
+        return [DownloadTask(url, video_index, i, archive_id=archive_id)
+                for i, (url, archive_id) in enumerate(items, 1)]
+
+    def run(self):
+        with job_scheduler.executor("download", self.workers, label="playlist-expand") as executor:
+            groups = list(executor.map(
+                lambda args: self._expand_one(*args), enumerate(self.urls, 1)))
+        tasks = [task for group in groups for task in group]
+        self.signals.expanded_signal.emit(tasks)
+
+
 class DownloadRunnable(QRunnable):
     """QRunnable-based worker for QThreadPool."""
 
@@ -27,7 +166,8 @@ class DownloadRunnable(QRunnable):
                  total_urls, worker_id,
                  video_mode, audio_only,
                  sub_mode, sub_lang, sub_lang_name, include_thumb,
-                 subtitle_only, custom_folder_name=""):
+                 subtitle_only, custom_folder_name="", item_index=None, job_id=None,
+                 use_archive=False, archive_id=None):
         super().__init__()
         self.signals = DownloadSignals()
         self.url = url
@@ -42,15 +182,26 @@ class DownloadRunnable(QRunnable):
         self.include_thumb = include_thumb
         self.subtitle_only = subtitle_only
         self.custom_folder_name = custom_folder_name
+        self.item_index = item_index  # Vị trí trong playlist nếu task là một mục đã mở rộng
+        self.job_id = job_id  # Job trong download_queue: giữ thư mục tạm (file .part) để tải tiếp
+        # Kho video đã tải (--download-archive); không dùng khi chỉ tải phụ đề
+        self.use_archive = use_archive and not subtitle_only
+        self.archive_id = archive_id
+        self.archived = False  # yt-dlp bỏ qua vì video đã có trong kho
+        self.archive_records: Dict[str, Dict[str, str]] = {}  # archive id -> {file: sha256}
         self.ffmpeg_path = resource_path(os.path.join("data", "ffmpeg.exe"))
         self.ytdlp_path = resource_path(os.path.join("data", "yt-dlp.exe"))
         self.stop_flag = False
         self.temp_dir = ""
         self.final_dir = custom_folder_name
         self.process = None
+        self.completed = False
+        self.output_files = []
 
     def run(self):
         message_thread = f"[Thread {self.worker_id}] ({self.video_index}/{self.total_urls}) "
+        if self.item_index is not None:
+            message_thread = f"[Thread {self.worker_id}] ({self.video_index}/{self.total_urls} #{self.item_index}) "
         try:
             if self.stop_flag:
                 self.signals.message_signal.emit(
@@ -76,10 +227,15 @@ class DownloadRunnable(QRunnable):
             )
 
             output_template = f"video_{self.video_index:02d}_%(title)s.%(ext)s"
-            if self.video_mode != "Video":
+            if self.item_index is not None:
+                output_template = f"playlist_{self.video_index:02d}_{self.item_index:03d}_%(title)s.%(ext)s"
+            elif self.video_mode != "Video":
                 output_template = f"playlist_{self.video_index:02d}_%(title)s.%(ext)s"
 
-            self.temp_dir = tempfile.mkdtemp(prefix="yt_download_")
+            # Thư mục tạm nằm trong thư mục đích (cùng ổ đĩa) để chỉ cần đổi tên khi xong
+            if not self.final_dir:
+                self.final_dir = "output"  # Thư mục mặc định
+            self.temp_dir = self.staging_path()
             temp_output = os.path.join(self.temp_dir, output_template)
             # Sử dụng đường dẫn đầy đủ đến yt-dlp.exe
             ytdlp_path = self.ytdlp_path if os.path.exists(self.ytdlp_path) else "yt-dlp"
@@ -111,6 +267,7 @@ class DownloadRunnable(QRunnable):
             )
 
 
+            throttle = ProgressThrottle()
             for line in self.process.stdout:
                 if self.stop_flag:
                     self.process.kill()
@@ -121,15 +278,18 @@ class DownloadRunnable(QRunnable):
                     self.signals.finished_signal.emit("stop")
                     return
 
-                if line.strip():
-                
-                    self.signals.message_signal.emit(
-                            f"{message_thread} {line.strip()}", "")
-                
-                    match = PROGRESS_RE.search(line)
-                    if match:
-                        percent = int(float(match.group(1)))
-                        self.signals.progress_signal.emit(percent)
+                line = line.strip()
+                if not line:
+                    continue
+                progress = parse_progress(line)
+                if progress is not None:
+                    # Tiến trình không vào log; chỉ gửi trạng thái mới nhất ~10 lần/giây
+                    if throttle.ready(progress.finished):
+                        self.signals.status_signal.emit(progress)
+                    continue
+                self.signals.message_signal.emit(f"{message_thread} {line}", "")
+                if self.use_archive and ARCHIVED_RE.search(line):
+                    self.archived = True
 
 
             self.process.wait()
@@ -146,30 +306,35 @@ class DownloadRunnable(QRunnable):
                 self.signals.finished_signal.emit("error")
                 return
 
-            self.signals.progress_signal.emit(85)
-
             downloaded_files = self._find_downloaded_files()
-            if not downloaded_files:
+            if not downloaded_files and self.archived:
+                self.completed = True
+                self.signals.message_signal.emit(
+                    f"{message_thread} ⏭ Video đã có trong kho lưu trữ, bỏ qua.", "")
+                self.signals.finished_signal.emit("skipped")
+            elif not downloaded_files:
                 self.signals.error_signal.emit(
                     f"{message_thread} ❌ Không có file nào được download. Bỏ qua và tiếp tục.")
                 self.signals.finished_signal.emit("error_no_file")
             else:
                 self.signals.message_signal.emit(
-                    f"{message_thread} 📁 Đang copy file ra thư mục cuối cùng...", "")
-                # Copy từng file từ thư mục tạm vào final_dir
-                success = self._copy_files_to_final(downloaded_files)
+                    f"{message_thread} 📁 Đang chuyển file ra thư mục cuối cùng...", "")
+                # Chuyển từng file từ thư mục tạm vào final_dir
+                success = self._move_files_to_final(downloaded_files)
                 if success:
+                    self.completed = True
+                    self._collect_archive_records()
                     main_file = self._find_main_file(downloaded_files)
                     if main_file:
                         self.signals.message_signal.emit(
-                            f"{message_thread} ✅ Hoàn thành download và copy!", "")
+                            f"{message_thread} ✅ Hoàn thành download và chuyển file!", "")
                     else:
                         self.signals.message_signal.emit(
                             f"{message_thread} ✅ Hoàn thành download!", "")
                     self.signals.finished_signal.emit("success")
                 else:
                     self.signals.error_signal.emit(
-                        f"{message_thread} ❌ Lỗi khi copy file! Bỏ qua và tiếp tục.")
+                        f"{message_thread} ❌ Lỗi khi chuyển file! Bỏ qua và tiếp tục.")
                     self.signals.finished_signal.emit("error_copy_file")
             self._cleanup_temp()
         finally:
@@ -181,14 +346,14 @@ class DownloadRunnable(QRunnable):
             return [
                 os.path.join(self.temp_dir, item)
                 for item in os.listdir(self.temp_dir)
-                if os.path.isfile(os.path.join(self.temp_dir, item))
+                if item != ARCHIVE_IDS_FILE and os.path.isfile(os.path.join(self.temp_dir, item))
             ]
         except Exception as e:
             print(f"Error finding downloaded files: {e}")
             return []
 
 
-    def _copy_files_to_final(self, temp_files):
+    def _move_files_to_final(self, temp_files):
         try:
             # Tạo thư mục đích nếu chưa tồn tại
             if not self.final_dir:
@@ -196,10 +361,10 @@ class DownloadRunnable(QRunnable):
             
             os.makedirs(self.final_dir, exist_ok=True)
             
-            copied_count = 0
+            moved_count = 0
             total_files = len(temp_files)
             
-            print(f"Bắt đầu copy {total_files} file từ thư mục tạm: {self.temp_dir}")
+            print(f"Bắt đầu chuyển {total_files} file từ thư mục tạm: {self.temp_dir}")
             print(f"Thư mục đích: {self.final_dir}")
             
             for i, temp_file in enumerate(temp_files, 1):
@@ -207,8 +372,6 @@ class DownloadRunnable(QRunnable):
                     filename = os.path.basename(temp_file)
                     final_file = os.path.join(self.final_dir, filename)
                     
-                    print(f"[{i}/{total_files}] Đang copy: {filename}")
-                    
                     # Kiểm tra file nguồn có tồn tại không
                     if not os.path.exists(temp_file):
                         print(f"  ❌ Source file not found: {temp_file}")
@@ -218,48 +381,23 @@ class DownloadRunnable(QRunnable):
                     if os.path.exists(final_file):
                         print(f"  ⚠️  File đích đã tồn tại, sẽ ghi đè: {filename}")
                     
-                    if self._is_video_file(filename):
-                        if self._copy_video_file(temp_file, final_file):
-                            copied_count += 1
-                            print(f"  ✅ Đã copy video file: {filename}")
-                        else:
-                            print(f"  ❌ Failed to copy video file: {filename}")
-                    elif self._is_audio_file(filename):
-                        if self._copy_audio_file(temp_file, final_file):
-                            copied_count += 1
-                            print(f"  ✅ Đã copy audio file: {filename}")
-                        else:
-                            print(f"  ❌ Failed to copy audio file: {filename}")
-                    elif self._is_subtitle_file(filename):
-                        if self._copy_subtitle_file(temp_file, final_file):
-                            copied_count += 1
-                            print(f"  ✅ Đã copy subtitle file: {filename}")
-                        else:
-                            print(f"  ❌ Failed to copy subtitle file: {filename}")
-                    elif self._is_thumbnail_file(filename):
-                        if self._copy_thumbnail_file(temp_file, final_file):
-                            copied_count += 1
-                            print(f"  ✅ Đã copy thumbnail file: {filename}")
-                        else:
-                            print(f"  ❌ Failed to copy thumbnail file: {filename}")
-                    else:
-                        if self._copy_other_file(temp_file, final_file):
-                            copied_count += 1
-                            print(f"  ✅ Đã copy other file: {filename}")
-                        else:
-                            print(f"  ❌ Failed to copy other file: {filename}")
+                    renamed = move_file(temp_file, final_file)
+                    moved_count += 1
+                    self.output_files.append(final_file)
+                    how = "đổi tên" if renamed else "copy (khác ổ đĩa)"
+                    print(f"[{i}/{total_files}] ✅ Đã chuyển {self._file_kind(filename)} file ({how}): {filename}")
                             
                 except Exception as e:
-                    print(f"  ❌ Error copying file {temp_file}: {e}")
+                    print(f"  ❌ Error moving file {temp_file}: {e}")
                     continue
             
-            print(f"Hoàn thành copy: {copied_count}/{total_files} file thành công")
+            print(f"Hoàn thành chuyển: {moved_count}/{total_files} file thành công")
             
-            # Trả về True nếu có ít nhất 1 file được copy thành công
-            return copied_count > 0
+            # Trả về True nếu có ít nhất 1 file được chuyển thành công
+            return moved_count > 0
             
         except Exception as e:
-            print(f"Error in _copy_files_to_final: {e}")
+            print(f"Error in _move_files_to_final: {e}")
             return False
 
     def _find_main_file(self, temp_files):
@@ -287,72 +425,56 @@ class DownloadRunnable(QRunnable):
         image_extensions = ['.jpg', '.jpeg', '.png', '.webp', '.bmp', '.gif']
         return any(filename.lower().endswith(ext) for ext in image_extensions)
 
-    def _copy_video_file(self, temp_file, final_file):
-        try:
-            if os.path.exists(self.ffmpeg_path):
-                creation_flags = 0
-                if sys.platform == "win32":
-                    creation_flags = subprocess.CREATE_NO_WINDOW
-                result = subprocess.run([self.ffmpeg_path, "-i", temp_file, "-c", "copy",
-                                        "-y", final_file], capture_output=True, creationflags=creation_flags)
-                if result.returncode == 0:
-                    return True
-            shutil.copy2(temp_file, final_file)
-            return True
-        except Exception as e:
-            print(f"Error copying video file (runnable): {e}")
-            return False
-
-    def _copy_audio_file(self, temp_file, final_file):
+    def _file_kind(self, filename):
+        if self._is_video_file(filename):
+            return "video"
+        if self._is_audio_file(filename):
+            return "audio"
+        if self._is_subtitle_file(filename):
+            return "subtitle"
+        if self._is_thumbnail_file(filename):
+            return "thumbnail"
+        return "other"
+
+    def _collect_archive_records(self):
+        """Archive id (yt-dlp ghi sau khi tải) -> file kết quả kèm SHA-256"""
+        if not self.use_archive or not self.output_files:
+            return
+        ids = []
         try:
-            if os.path.exists(self.ffmpeg_path):
-                creation_flags = 0
-                if sys.platform == "win32":
-                    creation_flags = subprocess.CREATE_NO_WINDOW
-                result = subprocess.run([self.ffmpeg_path, "-i", temp_file, "-c", "copy",
-                                        "-y", final_file], capture_output=True, creationflags=creation_flags)
-                if result.returncode == 0:
-                    return True
-            shutil.copy2(temp_file, final_file)
-            return True
-        except Exception as e:
-            print(f"Error copying audio file (runnable): {e}")
-            return False
-
-    def _copy_subtitle_file(self, temp_file, final_file):
-        try:
-            shutil.copy2(temp_file, final_file)
-            return True
-        except Exception as e:
-            print(f"Error copying subtitle file (runnable): {e}")
-            return False
-
-    def _copy_thumbnail_file(self, temp_file, final_file):
-        try:
-            shutil.copy2(temp_file, final_file)
-            return True
-        except Exception as e:
-            print(f"Error copying thumbnail file (runnable): {e}")
-            return False
-
-    def _copy_other_file(self, temp_file, final_file):
-        try:
-            shutil.copy2(temp_file, final_file)
-            return True
-        except Exception as e:
-            print(f"Error copying other file (runnable): {e}")
-            return False
+            with open(os.path.join(self.temp_dir, ARCHIVE_IDS_FILE), encoding="utf-8") as f:
+                for line in f:
+                    extractor, _, video_id = line.strip().partition(" ")
+                    if extractor and video_id:
+                        ids.append(make_archive_id(extractor, video_id))
+        except OSError:
+            pass
+        if not ids and self.archive_id:
+            ids.append(self.archive_id)
+        if not ids:
+            return
+        files = {}
+        for path in self.output_files:
+            try:
+                files[path] = file_sha256(path)
+            except OSError as e:
+                print(f"Error hashing {path}: {e}")
+        for archive_id in dict.fromkeys(ids):
+            self.archive_records[archive_id] = files
+
+    def staging_path(self):
+        """Thư mục tạm; job trong hàng đợi dùng tên cố định để lần sau tải tiếp đúng chỗ"""
+        if self.job_id is None:
+            return staging_dir(self.final_dir)
+        return staging_dir(self.final_dir, name=f".yt_download_job{self.job_id}")
 
     def _cleanup_temp(self):
+        # Job chưa xong: giữ file .part cho lần tải tiếp
+        if self.job_id is not None and not self.completed:
+            return
         try:
-            if hasattr(self, 'temp_dir') and self.temp_dir and os.path.exists(self.temp_dir):
-                def _on_rm_error(func, path, exc_info):
-                    try:
-                        os.chmod(path, stat.S_IWRITE)
-                        func(path)
-                    except Exception:
-                        pass
-                shutil.rmtree(self.temp_dir, onerror=_on_rm_error)
+            if hasattr(self, 'temp_dir') and self.temp_dir:
+                remove_tree(self.temp_dir)
         except Exception as e:
             print(f"Error cleaning up temp directory (runnable): {e}")
 
@@ -366,7 +488,10 @@ class DownloadRunnable(QRunnable):
         """Xây dựng lệnh yt-dlp"""
         cmd = [ytdlp_path]
         cmd += ["--encoding", "utf-8"]
-        cmd += [self.url, "--progress", "--newline"]
+        cmd += [self.url, "--progress", "--newline"] + progress_args()
+        if self.item_index is not None:
+            # Mục đã mở rộng từ playlist: chỉ tải đúng video này
+            cmd.append("--no-playlist")
         # Thêm đường dẫn ffmpeg nếu tồn tại
         if os.path.exists(self.ffmpeg_path):
             cmd += ["--ffmpeg-location", self.ffmpeg_path]
@@ -385,6 +510,13 @@ class DownloadRunnable(QRunnable):
             # Không emit signal ở đây vì method này không có access đến signals
 
         cmd += ["-o", output]
+        if self.job_id is not None:
+            cmd += ["--continue", "--part"]  # Tải tiếp từ file .part của lần trước
+        if self.use_archive:
+            # Bỏ qua video đã có trong kho; ghi lại id của video vừa tải để lưu đường dẫn/hash
+            cmd += ["--download-archive", str(AppConfig.DOWNLOAD_ARCHIVE_FILE)]
+            cmd += ["--print-to-file", "after_move:%(extractor_key)s %(id)s",
+                    os.path.join(os.path.dirname(output), ARCHIVE_IDS_FILE)]
 
         # Đặt timeout/kịch bản retry để tránh treo khi mạng chập chờn
         # cmd += [
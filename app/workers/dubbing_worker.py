@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""
+Worker lồng tiếng theo phụ đề (SRT/VTT)
+Sinh audio cho từng cue song song, co giãn tốc độ để vừa khung thời gian của cue,
+đặt lên timeline (chèn khoảng lặng) và ghi ra một file duy nhất theo kiểu streaming.
+"""
+
+import os
+import shutil
+import subprocess
+import wave
+from concurrent.futures import as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QThread, Signal
+
+from app.core.config import AppConfig
+from app.core.subtitle_engine import CueList
+from app.utils.audio_helpers import prepare_pydub_ffmpeg
+from app.utils.helps import tts_sync_save
+from app.core.temp_workspace import temp_workspace
+from app.core.job_scheduler import job_scheduler
+from app.utils.lazy_import import lazy_import
+
+pydub = lazy_import("pydub")
+
+
+# Định dạng PCM của timeline
+DUB_FRAME_RATE = 24000
+DUB_CHANNELS = 1
+DUB_SAMPLE_WIDTH = 2  # 16-bit
+
+# Tăng tốc tối đa khi audio dài hơn khung cue (atempo)
+DEFAULT_MAX_TEMPO = 1.6
+
+# Kích thước mỗi lần ghi khoảng lặng / copy frame (1 giây)
+_WRITE_BLOCK_FRAMES = DUB_FRAME_RATE
+
+
+def atempo_filter(tempo: float) -> str:
+    """Chuỗi filter atempo cho ffmpeg (mỗi khâu atempo giới hạn 0.5..2.0)"""
+    parts = []
+    while tempo > 2.0:
+        parts.append("atempo=2.0")
+        tempo /= 2.0
+    while tempo < 0.5:
+        parts.append("atempo=0.5")
+        tempo /= 0.5
+    parts.append(f"atempo={tempo:.4f}")
+    return ",".join(parts)
+
+
+def ms_to_frames(ms: int) -> int:
+    return int(round(ms * DUB_FRAME_RATE / 1000))
+
+
+class SRTDubbingWorker(QThread):
+    """
+    Lồng tiếng cho danh sách cue
+
+    Signals:
+        progress: Số cue đã ghi vào timeline (written, total)
+        status: Thông báo trạng thái
+        done: Hoàn thành (output_path, total_ms)
+        error: Có lỗi xảy ra
+    """
+
+    progress = Signal(int, int)
+    status = Signal(str)
+    done = Signal(str, int)
+    error = Signal(str)
+
+    def __init__(self, cues: CueList, out_path: str, voice: str,
+                 texts: Optional[List[str]] = None, rate: int = 0, pitch: int = 0,
+                 workers: int = AppConfig.DEFAULT_WORKERS_CHUNK,
+                 max_tempo: float = DEFAULT_MAX_TEMPO) -> None:
+        """
+        Args:
+            cues: Danh sách cue (thời gian lấy từ đây)
+            out_path: File kết quả (.mp3 hoặc .wav)
+            voice: Giọng đọc edge-tts
+            texts: Nội dung đọc cho từng cue (ví dụ bản dịch); None = dùng text gốc
+            workers: Số luồng TTS song song
+            max_tempo: Hệ số tăng tốc tối đa khi audio dài hơn khung cue
+        """
+        super().__init__()
+        self.cues = cues
+        self.texts = texts if texts is not None else list(cues.texts)
+        self.out_path = out_path
+        self.voice = voice
+        self.rate = rate
+        self.pitch = pitch
+        self.workers = max(1, workers)
+        self.max_tempo = max(1.0, max_tempo)
+        self.stop_flag = False
+        self.tmpdir: Optional[Path] = None
+
+    def stop(self) -> None:
+        self.stop_flag = True
+
+    def _window_ms(self, i: int) -> int:
+        """Khung thời gian của cue; cue lỗi (end <= start) thì dùng tới cue kế tiếp"""
+        start, end = self.cues.starts[i], self.cues.ends[i]
+        if end > start:
+            return end - start
+        if i + 1 < len(self.cues):
+            return max(0, self.cues.starts[i + 1] - start)
+        return 0
+
+    def _render_cue(self, i: int) -> Tuple[int, Optional[str], float]:
+        """Sinh audio cho cue i -> (i, file wav PCM chuẩn, tempo đã áp dụng)"""
+        text = (self.texts[i] or "").strip()
+        if not text:
+            return i, None, 1.0
+        mp3_path = str(self.tmpdir / f"cue_{i + 1:05d}.mp3")
+        wav_path = str(self.tmpdir / f"cue_{i + 1:05d}.wav")
+        tts_sync_save(text, mp3_path, self.voice, self.rate, self.pitch)
+
+        seg = pydub.AudioSegment.from_file(mp3_path)
+        seg = seg.set_frame_rate(DUB_FRAME_RATE).set_channels(DUB_CHANNELS).set_sample_width(DUB_SAMPLE_WIDTH)
+        window = self._window_ms(i)
+        tempo = 1.0
+        if window > 0 and len(seg) > window:
+            tempo = min(self.max_tempo, len(seg) / window)
+        if tempo > 1.0:
+            seg.export(wav_path, format="wav",
+                       parameters=["-filter:a", atempo_filter(tempo), "-ar", str(DUB_FRAME_RATE)])
+        else:
+            seg.export(wav_path, format="wav")
+        try:
+            os.remove(mp3_path)
+        except OSError:
+            pass
+        return i, wav_path, tempo
+
+    @staticmethod
+    def _write_silence(out: wave.Wave_write, frames: int) -> None:
+        block = b"\x00" * (_WRITE_BLOCK_FRAMES * DUB_SAMPLE_WIDTH * DUB_CHANNELS)
+        while frames > 0:
+            n = min(frames, _WRITE_BLOCK_FRAMES)
+            out.writeframesraw(block[:n * DUB_SAMPLE_WIDTH * DUB_CHANNELS])
+            frames -= n
+
+    @staticmethod
+    def _append_clip(out: wave.Wave_write, clip_path: str) -> int:
+        """Copy frame của clip vào timeline theo từng khối, trả về số frame"""
+        written = 0
+        with wave.open(clip_path, "rb") as clip:
+            while True:
+                data = clip.readframes(_WRITE_BLOCK_FRAMES)
+                if not data:
+                    break
+                out.writeframesraw(data)
+                written += len(data) // (DUB_SAMPLE_WIDTH * DUB_CHANNELS)
+        return written
+
+    def _encode_output(self, wav_path: str) -> None:
+        """Chuyển timeline WAV sang định dạng đích (mp3...) bằng ffmpeg"""
+        if self.out_path.lower().endswith(".wav"):
+            shutil.move(wav_path, self.out_path)
+            return
+        prepare_pydub_ffmpeg()
+        cmd = [pydub.AudioSegment.converter, "-y", "-loglevel", "error", "-i", wav_path, self.out_path]
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise Exception(result.stderr.strip() or "ffmpeg thất bại")
+
+    def run(self) -> None:
+        try:
+            total = len(self.cues)
+            if total == 0:
+                self.error.emit("❌ Không có cue nào để lồng tiếng.")
+                return
+
+            prepare_pydub_ffmpeg()
+            self.tmpdir = temp_workspace.new_dir("dub")
+            timeline_path = str(self.tmpdir / "timeline.wav")
+
+            self.status.emit(f"🎙️ Lồng tiếng {total} cue bằng {self.workers} luồng...")
+
+            ready: Dict[int, Tuple[Optional[str], float]] = {}
+            next_i = 0
+            cursor = 0  # frame hiện tại trên timeline
+            stretched = 0
+            overrun_ms = 0
+
+            with wave.open(timeline_path, "wb") as out, \
+                    job_scheduler.executor("dubbing", self.workers, label="dubbing") as executor:
+                out.setnchannels(DUB_CHANNELS)
+                out.setsampwidth(DUB_SAMPLE_WIDTH)
+                out.setframerate(DUB_FRAME_RATE)
+
+                futures = [executor.submit(self._render_cue, i) for i in range(total)]
+                for fut in as_completed(futures):
+                    if self.stop_flag:
+                        for f in futures:
+                            f.cancel()
+                        break
+                    try:
+                        i, clip_path, tempo = fut.result()
+                    except Exception as e:
+                        i = futures.index(fut)
+                        self.status.emit(f"⚠️ Lỗi cue {i + 1}: {e}")
+                        clip_path, tempo = None, 1.0
+                    ready[i] = (clip_path, tempo)
+
+                    # Ghi các cue theo đúng thứ tự, chỉ giữ đường dẫn clip trong bộ nhớ
+                    while next_i in ready:
+                        clip_path, tempo = ready.pop(next_i)
+                        if clip_path:
+                            start = ms_to_frames(self.cues.starts[next_i])
+                            if start > cursor:
+                                self._write_silence(out, start - cursor)
+                                cursor = start
+                            elif start < cursor:
+                                overrun_ms += (cursor - start) * 1000 // DUB_FRAME_RATE
+                            cursor += self._append_clip(out, clip_path)
+                            if tempo > 1.0:
+                                stretched += 1
+                            try:
+                                os.remove(clip_path)
+                            except OSError:
+                                pass
+                        next_i += 1
+                        self.progress.emit(next_i, total)
+
+                # Khoảng lặng tới cuối cue cuối cùng để độ dài track khớp phụ đề
+                if not self.stop_flag:
+                    end = ms_to_frames(self.cues.duration_ms())
+                    if end > cursor:
+                        self._write_silence(out, end - cursor)
+                        cursor = end
+
+            if self.stop_flag:
+                self.status.emit("⏹ Đã dừng theo yêu cầu người dùng.")
+                return
+
+            self._encode_output(timeline_path)
+            total_ms = cursor * 1000 // DUB_FRAME_RATE
+            if stretched:
+                self.status.emit(f"⏩ {stretched} cue đã được tăng tốc để vừa khung thời gian")
+            if overrun_ms:
+                self.status.emit(f"⚠️ Tổng thời gian bị lệch do cue quá dài: {overrun_ms}ms")
+            self.status.emit(f"✅ Đã lồng tiếng xong: {self.out_path}")
+            self.done.emit(self.out_path, total_ms)
+        except Exception as e:
+            self.error.emit(f"❌ Lỗi lồng tiếng: {str(e)}")
+        finally:
+            if self.tmpdir:
+                temp_workspace.release(self.tmpdir)
+                temp_workspace.discard(self.tmpdir)
@@ -5,21 +5,23 @@ Chứa các worker class để xử lý dịch thuật song song và batch proce
 """
 
 import os
-import tempfile
 from datetime import datetime
-import time
-import random
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Optional, List, Dict, Tuple
+from typing import Optional, List, Tuple
 import json
 
 from PySide6.QtCore import QThread, Signal
 
-from app.utils.helps import split_text
-from deep_translator import GoogleTranslator
-import google.generativeai as genai
-import openai
+from app.core.config import AppConfig
+from app.utils.helps import split_text, tts_sync_bytes
+from app.core.segment_store import segment_store
+from app.core.temp_workspace import temp_workspace
+from app.core.job_scheduler import job_scheduler
+from app.utils.audio_helpers import get_mp3_duration_ms
+from app.core.translate_clients import TranslateClientPool, BaseTranslateClient
+from app.core.translate_engine import AsyncTranslateEngine
+from app.core.batch_scheduler import BatchStats, ORDER_SJF, order_files
+from app.core.reorder_window import OrderedSubmitter, ReorderWindow
 
 class MultiThreadTranslateWorker(QThread):
     """
@@ -28,6 +30,7 @@ class MultiThreadTranslateWorker(QThread):
 
     Signals:
         segment_translated: Phát khi một đoạn được dịch xong (original, translated, index)
+        segment_partial: Kết quả từng phần của đoạn đang dịch (partial_text, index) - Gemini/OpenAI
         progress: Tiến trình xử lý (completed, total)
         status: Thông báo trạng thái
         all_done: Hoàn thành tất cả
@@ -36,6 +39,8 @@ class MultiThreadTranslateWorker(QThread):
 
     # Định nghĩa các signals
     segment_translated = Signal(str, str, int)  # original, translated, index
+    segment_partial = Signal(str, int)          # partial translated text, index
+    segment_skipped = Signal(int, str)          # index, error message (đoạn dịch lỗi, bị bỏ qua)
     progress = Signal(int, int)                 # completed, total
     status = Signal(str)                        # status message
     all_done = Signal()                         # all processing done
@@ -44,7 +49,8 @@ class MultiThreadTranslateWorker(QThread):
     def __init__(self, text: str, source_lang: str, target_lang: str, 
                  service: str, api_key: str, max_len: int, workers: int, 
                  custom_prompt: str = "", input_type: str = "text",
-                 chunks: Optional[List[str]] = None) -> None:
+                 chunks: Optional[List[str]] = None,
+                 client_pool: Optional[TranslateClientPool] = None) -> None:
         """
         Khởi tạo worker dịch thuật đa luồng
 
@@ -57,6 +63,7 @@ class MultiThreadTranslateWorker(QThread):
             max_len: Độ dài tối đa mỗi đoạn (ký tự)
             workers: Số luồng xử lý song song
             custom_prompt: Prompt tùy chỉnh cho AI models
+            client_pool: Pool client dùng chung (nếu None sẽ tạo pool riêng)
         """
         super().__init__()
 
@@ -73,6 +80,9 @@ class MultiThreadTranslateWorker(QThread):
         self.input_type: str = input_type
         # Nếu đã có sẵn danh sách chunks, dùng trực tiếp (bỏ qua tách)
         self.provided_chunks: Optional[List[str]] = chunks
+        # Pool client dịch - chỉ đóng khi worker tự tạo pool
+        self._owns_client_pool: bool = client_pool is None
+        self.client_pool: TranslateClientPool = client_pool or TranslateClientPool()
         
         # Trạng thái worker
         self.stop_flag: bool = False
@@ -84,87 +94,18 @@ class MultiThreadTranslateWorker(QThread):
         """
         self.stop_flag = True
 
-    def _translate_segment_google(self, text: str) -> str:
-        """Dịch bằng Google Translate"""
-        try:
-            translator = GoogleTranslator(source=self.source_lang, target=self.target_lang)
-            return translator.translate(text)
-        except Exception as e:
-            raise Exception(f"Lỗi Google Translate: {str(e)}")
-
-    def _translate_segment_gemini(self, text: str) -> str:
-        """Dịch bằng Google Gemini"""
-        try:
-            if not self.api_key:
-                raise Exception("Thiếu Gemini API Key")
-            
-            genai.configure(api_key=self.api_key)
-            model = genai.GenerativeModel('gemini-pro')
-            
-            prompt = f"""
-            Bạn là một dịch giả chuyên nghiệp. Hãy dịch văn bản sau từ {self.source_lang} sang {self.target_lang}.
-            
-            {self.custom_prompt if self.custom_prompt else "Hãy dịch chính xác và tự nhiên, giữ nguyên ý nghĩa và ngữ cảnh."}
-            
-            Văn bản cần dịch:
-            {text}
-            
-            Chỉ trả về bản dịch, không có giải thích thêm.
-            """
-            
-            response = model.generate_content(prompt)
-            return response.text.strip()
-        except Exception as e:
-            raise Exception(f"Lỗi Google Gemini: {str(e)}")
-
-    def _translate_segment_openai(self, text: str) -> str:
-        """Dịch bằng OpenAI ChatGPT"""
-        try:
-            if not self.api_key:
-                raise Exception("Thiếu OpenAI API Key")
-            
-            openai.api_key = self.api_key
-            
-            prompt = f"""
-            Bạn là một dịch giả chuyên nghiệp. Hãy dịch văn bản sau từ {self.source_lang} sang {self.target_lang}.
-            
-            {self.custom_prompt if self.custom_prompt else "Hãy dịch chính xác và tự nhiên, giữ nguyên ý nghĩa và ngữ cảnh."}
-            
-            Văn bản cần dịch:
-            {text}
-            
-            Chỉ trả về bản dịch, không có giải thích thêm.
-            """
-            
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "Bạn là một dịch giả chuyên nghiệp."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=1000,
-                temperature=0.3
-            )
-            
-            return response.choices[0].message.content.strip()
-        except Exception as e:
-            raise Exception(f"Lỗi OpenAI: {str(e)}")
+    def _get_client(self) -> BaseTranslateClient:
+        """Lấy client dùng lại cho service và cặp ngôn ngữ hiện tại"""
+        return self.client_pool.get(self.service, self.api_key, self.source_lang, self.target_lang)
 
     def _translate_segment(self, text: str) -> str:
         """Dịch một đoạn văn bản theo service được chọn"""
-        if self.service == "Google Translate":
-            return self._translate_segment_google(text)
-        elif self.service == "Google Gemini":
-            return self._translate_segment_gemini(text)
-        elif self.service == "OpenAI (ChatGPT)":
-            return self._translate_segment_openai(text)
-        else:
-            raise Exception(f"Không hỗ trợ service: {self.service}")
+        return self._get_client().translate(text, self.custom_prompt)
 
     def run(self) -> None:
         """
         Phương thức chính chạy worker dịch thuật
-        Chia văn bản thành chunks và xử lý song song
+        Chia văn bản thành chunks và dịch bất đồng bộ trên một event loop
         """
         try:
 
@@ -196,79 +137,45 @@ class MultiThreadTranslateWorker(QThread):
                 self.error.emit("❌ Không thể tách văn bản thành các đoạn.")
                 return
 
-            self.status.emit(f"🔧 Tạo {total} đoạn để dịch bằng {self.workers} luồng...")
-
-            # Dictionary để lưu kết quả theo thứ tự
-            completed: Dict[int, Tuple[str, str]] = {}  # index -> (original, translated)
-            next_index = 1
+            # Emit theo đúng thứ tự qua cửa sổ có giới hạn (kết quả về sớm giữ tối đa REORDER_WINDOW đoạn)
             emitted = 0
 
-            def job(index1: int, content: str) -> Tuple[int, str, str]:
-                """Job xử lý một đoạn văn bản"""
-                try:
-                    # Lấy thông tin thread hiện tại
-                    import threading
-                    current_thread = threading.current_thread()
-                    thread_name = current_thread.name
-                    thread_id = current_thread.ident
-                    
-                    self.status.emit(f"🧵 Thread {thread_name} (ID: {thread_id}) bắt đầu dịch đoạn {index1}")
-                    
-                    # Dịch đoạn văn bản
-                    translated = self._translate_segment(content)
-                    
-                    # Nghỉ ngẫu nhiên để tránh rate limit
-                    time.sleep(random.uniform(0.5, 1.5))
-                    
-                    return (index1, content, translated)
-                    
-                except Exception as e:
-                    raise Exception(f"Lỗi xử lý đoạn {index1}: {str(e)}")
+            def on_emit(index1: int, result: Tuple[str, str]) -> None:
+                """Nhận kết quả (trên luồng worker) theo đúng thứ tự"""
+                nonlocal emitted
+                if self.stop_flag:
+                    return
+                original, translated = result
+                self.segment_translated.emit(original, translated, index1)
+                emitted += 1
+                self.progress.emit(emitted, total)
 
-            # Xử lý đa luồng theo batch để tránh treo và rate-limit
-            with ThreadPoolExecutor(max_workers=self.workers) as executor:
-                batch_size = 50  # Batch size nhỏ hơn cho dịch thuật
-                
-                for batch_start in range(0, total, batch_size):
-                    if self.stop_flag:
-                        self.status.emit("⏹ Đã dừng theo yêu cầu người dùng.")
-                        break
-
-                    batch_end = min(total, batch_start + batch_size)
-                    
-                    # Submit batch hiện tại
-                    futures = [executor.submit(job, i + 1, chunks[i])
-                               for i in range(batch_start, batch_end)]
-
-                    # Xử lý kết quả của batch
-                    for future in as_completed(futures):
-                        if self.stop_flag:
-                            self.status.emit("⏹ Đã dừng theo yêu cầu người dùng.")
-                            break
-
-                        try:
-                            idx1, original, translated = future.result()
-                            completed[idx1] = (original, translated)
-                        except Exception as e:
-                            self.status.emit(f"⚠️ {str(e)}")
-                            continue
-
-                        # Emit các đoạn theo đúng thứ tự
-                        while next_index in completed:
-                            orig, trans = completed.pop(next_index)
-                            self.segment_translated.emit(orig, trans, next_index)
-                            emitted += 1
-                            self.progress.emit(emitted, total)
-                            next_index += 1
-
-                    if self.stop_flag:
-                        break
-
-                    # Nếu còn batch kế tiếp, nghỉ ngẫu nhiên 1-3s
-                    if batch_end < total:
-                        delay = random.uniform(1, 3)
-                        self.status.emit(f"⏳ Nghỉ {delay:.1f}s trước batch tiếp theo...")
-                        time.sleep(delay)
+            def on_skip(index1: int, message: str) -> None:
+                if self.stop_flag:
+                    return
+                self.status.emit(f"⚠️ {message}")
+                self.segment_skipped.emit(index1, message)
+
+            window = ReorderWindow(on_emit, on_skip)
+
+            def on_partial(index1: int, partial: str) -> None:
+                """Kết quả từng phần - chỉ gửi cho đoạn chưa được emit"""
+                if not self.stop_flag and index1 >= window.head:
+                    self.segment_partial.emit(partial, index1)
+
+            engine = AsyncTranslateEngine(
+                self._get_client(), self.service, self.workers,
+                custom_prompt=self.custom_prompt,
+                should_stop=lambda: self.stop_flag,
+                window=window,
+                on_hedge=lambda i: self.status.emit(
+                    f"⏱ Đoạn {i} chờ quá {AppConfig.REORDER_HEDGE_AFTER_S}s, gửi thêm một lần")
+            )
+            self.status.emit(f"🔧 Tạo {total} đoạn để dịch ({engine.concurrency} request đồng thời)...")
+
+            # Một event loop, không chờ theo batch
+            engine.run(chunks, on_partial=on_partial)
+            self.status.emit(window.metrics().describe())
 
             if self.stop_flag:
                 self.status.emit("⏹ Đã dừng theo yêu cầu người dùng.")
@@ -285,6 +192,8 @@ class MultiThreadTranslateWorker(QThread):
             self.error.emit(f"❌ Lỗi: {str(e)}")
         finally:
             # Cleanup
+            if self._owns_client_pool:
+                self.client_pool.close()
             if self.tmpdir and os.path.exists(self.tmpdir):
                 try:
                     import shutil
@@ -297,15 +206,20 @@ class MultiThreadTranslateWorker(QThread):
 class BatchTranslateWorker(QThread):
     """
     Worker xử lý dịch thuật hàng loạt cho nhiều file
+    Tất cả đoạn của mọi file đi qua một AsyncTranslateEngine (một event loop, một client,
+    giới hạn request chung) thay vì mỗi file một QThread + event loop riêng.
+    File nhỏ xếp trước (SJF) để số file xong sớm là nhiều nhất.
     """
     
-    fileProgress = Signal(int, int)      # completed, total files
-    fileStatus = Signal(str)             # status message
-    attachWorker = Signal(object, str)   # worker, filename
+    fileProgress = Signal(int, int)              # completed, total files
+    fileStatus = Signal(str)                     # status message
+    segment_translated = Signal(str, str, int)   # original, translated, index (liên tục qua các file)
+    fileDone = Signal(str, str)                  # filename, error ("" nếu thành công)
+    batchMetrics = Signal(object)                # BatchMetrics
     
     def __init__(self, files: list[str], source_lang: str, target_lang: str,
                  service: str, api_key: str, max_len: int, workers_chunk: int, 
-                 workers_file: int, custom_prompt: str = ""):
+                 workers_file: int, custom_prompt: str = "", order: str = ORDER_SJF):
         super().__init__()
         self.files = files
         self.source_lang = source_lang
@@ -314,66 +228,117 @@ class BatchTranslateWorker(QThread):
         self.api_key = api_key
         self.max_len = max_len
         self.workers_chunk = workers_chunk
+        # Số file chạy song song không còn ý nghĩa khi dùng chung pool: giới hạn request
+        # là workers_chunk * workers_file như tổng cũ của các worker con
         self.workers_file = max(1, workers_file)
         self.custom_prompt = custom_prompt
+        self.order = order
         self.stop_flag = False
-        self.children: list[MultiThreadTranslateWorker] = []
+        # Dùng chung client cho tất cả file trong batch
+        self.client_pool = TranslateClientPool()
 
     def stop(self):
         self.stop_flag = True
-        for w in self.children:
-            try:
-                w.stop()
-            except Exception:
-                pass
+
+    def _read_chunks(self, path: str) -> List[str]:
+        with open(path, "r", encoding="utf-8") as file:
+            return split_text(file.read(), self.max_len)
 
     def run(self):
-        total = len(self.files)
-        done = 0
-        self.fileStatus.emit(f"�� Xử lý {total} file với {self.workers_file} file song song...")
-        
-        idx = 0
-        active: list[MultiThreadTranslateWorker] = []
-        
+        files = order_files(self.files, self.order)
+        total = len(files)
+        self.fileStatus.emit(f"🚀 Xử lý {total} file (file nhỏ trước, một pool dịch dùng chung)...")
+        stats = BatchStats(total)
+
         try:
-            while idx < total or active:
-                while idx < total and len(active) < self.workers_file and not self.stop_flag:
-                    f = self.files[idx]
-                    
-                    # Đọc nội dung file
-                    try:
-                        with open(f, "r", encoding="utf-8") as file:
-                            text = file.read()
-                    except Exception as e:
-                        self.fileStatus.emit(f"⚠️ Không thể đọc file {Path(f).name}: {e}")
-                        idx += 1
-                        continue
-                    
-                    w = MultiThreadTranslateWorker(
-                        text, self.source_lang, self.target_lang, self.service,
-                        self.api_key, self.max_len, self.workers_chunk, self.custom_prompt
-                    )
-                    self.children.append(w)
-                    self.attachWorker.emit(w, Path(f).name)
-                    w.start()
-                    active.append(w)
-                    idx += 1
-                
-                for w in list(active):
-                    if not w.isRunning():
-                        active.remove(w)
-                        done += 1
-                        self.fileProgress.emit(done, total)
-                
-                self.msleep(100)
-                
+            # 1) Đọc + tách đoạn, nối mọi file thành một danh sách theo thứ tự SJF
+            chunks: List[str] = []
+            owner: List[Tuple[int, int]] = []  # chỉ số toàn cục -> (file, đoạn 1-based trong file)
+            names: List[str] = []
+            totals: List[int] = []
+            for fi, path in enumerate(files):
+                names.append(Path(path).name)
+                try:
+                    file_chunks = self._read_chunks(path)
+                except Exception as e:
+                    file_chunks = []
+                    self.fileStatus.emit(f"⚠️ Không thể đọc file {names[fi]}: {e}")
+                totals.append(len(file_chunks))
+                owner.extend((fi, k + 1) for k in range(len(file_chunks)))
+                chunks.extend(file_chunks)
+            stats.add_chunks(len(chunks))
+
+            errors: List[int] = [0] * total
+
+            def file_finished(fi: int) -> None:
+                stats.file_done()
+                if totals[fi] == 0:
+                    error = "không có đoạn nào để dịch"
+                elif errors[fi]:
+                    error = f"{errors[fi]}/{totals[fi]} đoạn lỗi"
+                else:
+                    error = ""
+                if error:
+                    self.fileStatus.emit(f"❌ Lỗi file {names[fi]}: {error}")
+                else:
+                    self.fileStatus.emit(f"✅ Hoàn thành file: {names[fi]}")
+                self.fileDone.emit(names[fi], error)
+                metrics = stats.snapshot()
+                self.fileProgress.emit(metrics.files_done, total)
+                self.batchMetrics.emit(metrics)
+
+            # Đoạn được emit theo thứ tự toàn cục (file theo SJF, đoạn trong file theo thứ tự)
+            # qua cửa sổ có giới hạn; file xong khi đoạn cuối của nó được emit/bỏ qua
+            def on_emit(index1: int, result: Tuple[str, str]) -> None:
+                if self.stop_flag:
+                    return
+                fi, local = owner[index1 - 1]
+                self.segment_translated.emit(result[0], result[1], index1)
+                stats.chunk_done()
+                if local == totals[fi]:
+                    file_finished(fi)
+
+            def on_skip(index1: int, message: str) -> None:
+                if self.stop_flag:
+                    return
+                fi, local = owner[index1 - 1]
+                self.fileStatus.emit(f"⚠️ {names[fi]}: {message}")
+                errors[fi] += 1
+                stats.chunk_done()
+                if local == totals[fi]:
+                    file_finished(fi)
+
+            window = ReorderWindow(on_emit, on_skip)
+
+            for fi in range(total):
+                if totals[fi] == 0:
+                    file_finished(fi)
+
+            # 2) Một engine cho mọi đoạn (callback chạy trên luồng này nên không cần khóa)
+            if chunks and not self.stop_flag:
+                client = self.client_pool.get(self.service, self.api_key, self.source_lang, self.target_lang)
+                engine = AsyncTranslateEngine(
+                    client, self.service, self.workers_chunk * self.workers_file,
+                    custom_prompt=self.custom_prompt,
+                    should_stop=lambda: self.stop_flag,
+                    window=window
+                )
+                engine.run(chunks)
+                self.fileStatus.emit(window.metrics().describe())
+
+            if self.stop_flag:
+                self.fileStatus.emit("⏹ Đã dừng theo yêu cầu người dùng.")
+            self.fileStatus.emit(stats.snapshot().describe())
+        except Exception as e:
+            self.fileStatus.emit(f"❌ Lỗi: {str(e)}")
         finally:
-            self.fileStatus.emit("�� Hoàn tất batch.")
+            self.client_pool.close()
+            self.fileStatus.emit("🏁 Hoàn tất batch.")
 
 class TranslateTTSWorker(QThread):
     """
     Worker để tạo audio TTS cho các đoạn đã dịch
-    Tự động phát audio khi hoàn thành mỗi đoạn
+    Sinh audio song song (thread pool), emit theo đúng thứ tự với thời lượng thực tế
     """
     
     # Signals
@@ -381,9 +346,11 @@ class TranslateTTSWorker(QThread):
     tts_progress = Signal(int, int)      # completed, total
     tts_status = Signal(str)             # status message
     tts_error = Signal(str)              # error message
+    tts_done = Signal()                  # all segments processed
     
     def __init__(self, translated_segments: List[Tuple[str, str, int]], 
-                 target_lang: str, voice: str = "", rate: int = 0, pitch: int = 0) -> None:
+                 target_lang: str, voice: str = "", rate: int = 0, pitch: int = 0,
+                 workers: int = AppConfig.DEFAULT_WORKERS_CHUNK) -> None:
         """
         Khởi tạo worker TTS cho dịch thuật
         
@@ -393,113 +360,89 @@ class TranslateTTSWorker(QThread):
             voice: Voice cụ thể (nếu để trống sẽ tự động chọn)
             rate: Tốc độ (-50 đến 50)
             pitch: Cao độ (-12 đến 12)
+            workers: Số luồng tạo audio song song
         """
         super().__init__()
         
-        self.translated_segments = translated_segments
+        self.translated_segments = sorted(translated_segments, key=lambda x: x[2])
         self.target_lang = target_lang
-        self.voice = voice
+        # Tự động chọn voice nếu không có
+        self.voice = voice or self._get_auto_voice(target_lang)
         self.rate = rate
         self.pitch = pitch
+        self.workers = max(1, workers)
         self.stop_flag = False
-        self.tmpdir = None
         
     def stop(self) -> None:
         """Dừng worker"""
         self.stop_flag = True
         
     def run(self) -> None:
-        """Chạy worker TTS"""
+        """Chạy worker TTS - song song, emit theo thứ tự index"""
         try:
             if not self.translated_segments:
                 self.tts_error.emit("Không có đoạn văn bản nào để tạo audio")
                 return
                 
-            # Tạo thư mục tạm
-            self.tmpdir = tempfile.mkdtemp(prefix="translate_tts_")
-            
             total_segments = len(self.translated_segments)
-            completed = 0
-            
-            self.tts_status.emit(f"Bắt đầu tạo audio cho {total_segments} đoạn văn bản...")
-            
-            for index, (original, translated, segment_index) in enumerate(self.translated_segments):
+            self.tts_status.emit(
+                f"Bắt đầu tạo audio cho {total_segments} đoạn văn bản bằng {self.workers} luồng...")
+
+            # Emit theo thứ tự vị trí trong danh sách (1-based) qua cửa sổ có giới hạn, index gốc giữ nguyên
+            order = [segment_index for _, _, segment_index in self.translated_segments]
+            processed = 0
+
+            def on_emit(pos1: int, result: Tuple[str, int]) -> None:
+                nonlocal processed
                 if self.stop_flag:
-                    break
-                    
-                try:
-                    # Tạo audio cho đoạn đã dịch
-                    audio_path = self._create_audio_for_segment(translated, segment_index)
-                    
-                    if audio_path and os.path.exists(audio_path):
-                        # Sử dụng duration cố định dựa trên độ dài text
-                        # Ước tính: 1 ký tự = 100ms, tối thiểu 1000ms
-                        estimated_duration = max(1000, len(translated) * 100)
-                        
-                        # Emit signal audio ready
-                        self.audio_ready.emit(audio_path, estimated_duration, segment_index)
-                        
-                        completed += 1
-                        self.tts_progress.emit(completed, total_segments)
-                        
-                        # Tự động phát audio ngay khi hoàn thành
-                        self.tts_status.emit(f"✅ Đã tạo audio cho đoạn {segment_index + 1}")
-                        
-                except Exception as e:
-                    self.tts_error.emit(f"Lỗi tạo audio cho đoạn {segment_index + 1}: {str(e)}")
-                    continue
-                    
+                    temp_workspace.discard(result[0])
+                    return
+                path, duration = result
+                self.audio_ready.emit(path, duration, order[pos1 - 1])
+                processed += 1
+                self.tts_progress.emit(processed, total_segments)
+
+            def on_skip(pos1: int, error: str) -> None:
+                nonlocal processed
+                if self.stop_flag:
+                    return
+                self.tts_error.emit(f"Lỗi tạo audio cho đoạn {order[pos1 - 1]}: {error}")
+                processed += 1
+                self.tts_progress.emit(processed, total_segments)
+
+            # Kết quả không được emit (hedge thua, còn giữ khi dừng) -> bỏ hold của file tạm
+            window = ReorderWindow(on_emit, on_skip, on_drop=lambda i, result: temp_workspace.discard(result[0]))
+
+            def job(pos1: int, segment: Tuple[str, str, int]) -> Tuple[str, int]:
+                _, translated, segment_index = segment
+                return self._create_audio_for_segment(translated, segment_index)
+
+            with job_scheduler.executor("tts", self.workers, label="translate-tts") as executor:
+                submitter = OrderedSubmitter(
+                    executor, window, job, self.translated_segments,
+                    should_stop=lambda: self.stop_flag,
+                    on_hedge=lambda i: self.tts_status.emit(
+                        f"⏱ Đoạn {order[i - 1]} chờ quá {AppConfig.REORDER_HEDGE_AFTER_S}s, gửi thêm một lần"))
+                if not (submitter.submit(range(1, total_segments + 1)) and submitter.wait(total_segments)):
+                    executor.shutdown(wait=False, cancel_futures=True)
+            window.close()
+            self.tts_status.emit(window.metrics().describe())
+
             if not self.stop_flag:
                 self.tts_status.emit("🎵 Hoàn thành tạo audio cho tất cả đoạn văn bản!")
+                self.tts_done.emit()
                 
         except Exception as e:
             self.tts_error.emit(f"Lỗi trong quá trình tạo audio: {str(e)}")
-        finally:
-            # Cleanup
-            # self._cleanup_temp_files()
-            pass
-                    
-    def _cleanup_temp_files(self):
-        """Cleanup temporary files"""
-        if self.tmpdir and os.path.exists(self.tmpdir):
-            try:
-                import shutil
-                shutil.rmtree(self.tmpdir)
-                self.tmpdir = None
-            except Exception as e:
-                print(f"Warning: Error cleaning up temp files: {e}")
-                
-    def _create_audio_for_segment(self, text: str, segment_index: int) -> Optional[str]:
-        """Tạo audio cho một đoạn văn bản"""
-        try:
-            # Tự động chọn voice nếu không có
-            if not self.voice:
-                self.voice = self._get_auto_voice(self.target_lang)
                 
-            # Tạo tên file
-            filename = f"translate_segment_{segment_index:03d}_{int(time.time())}.mp3"
-            output_path = os.path.join(self.tmpdir, filename)
-            
-            # Sử dụng TTS function từ helps.py với đúng signature
-            from app.utils.helps import tts_sync_save
-            
-            # Signature: tts_sync_save(text, out_path, voice, rate_percent, pitch_hz)
-            tts_sync_save(
-                text=text,
-                out_path=output_path,  # Sửa từ output_path thành out_path
-                voice=self.voice,
-                rate_percent=self.rate,  # Sửa từ rate thành rate_percent
-                pitch_hz=self.pitch      # Sửa từ pitch thành pitch_hz
-            )
-            
-            if os.path.exists(output_path):
-                return output_path
-            else:
-                return None
-                
-        except Exception as e:
-            print(f"Lỗi tạo audio: {e}")
-            return None
+    def _create_audio_for_segment(self, text: str, segment_index: int) -> Tuple[str, int]:
+        """Tạo audio cho một đoạn văn bản, trả về (path, duration_ms thực tế)"""
+        # Signature: tts_sync_bytes(text, voice, rate_percent, pitch_hz)
+        data = tts_sync_bytes(text, self.voice, self.rate, self.pitch)
+        if not data:
+            raise Exception("Không tạo được file audio")
+        output_path = segment_store.put(data, ".mp3", tag="translate_segment", hold=True)
+        return output_path, get_mp3_duration_ms(output_path)
             
     def _get_auto_voice(self, lang_code: str) -> str:
         """Tự động chọn voice phù hợp với ngôn ngữ"""
@@ -519,11 +462,3 @@ class TranslateTTSWorker(QThread):
         }
         
         return voice_mapping.get(lang_code, "en-US-JennyNeural")
-        
-    def __del__(self):
-        """Destructor để đảm bảo cleanup"""
-        try:
-            if hasattr(self, 'tmpdir') and self.tmpdir:
-                self._cleanup_temp_files()
-        except:
-            pass
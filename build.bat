@@ -37,12 +37,20 @@ if exist *.spec (
 )
 
 REM Build ứng dụng
+REM Các thư viện nặng được import lười (app/utils/lazy_import.py) nên cần khai báo hidden-import
 echo 🔨 Đang build ứng dụng...
 pyinstaller --noconsole --onefile --name "Download_TTS" ^
     --add-data "app;app" ^
     --add-data "images;images" ^
     --add-data "demo.txt;." ^
     --add-data "run.bat;." ^
+    --hidden-import "pydub" ^
+    --hidden-import "edge_tts" ^
+    --hidden-import "requests" ^
+    --hidden-import "deep_translator" ^
+    --hidden-import "google.generativeai" ^
+    --hidden-import "openai" ^
+    --hidden-import "langdetect" ^
     --icon "images/icon.ico" ^
     main.py
 
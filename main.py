@@ -7,28 +7,30 @@ Phiên bản tối ưu với comment tiếng Việt và cấu trúc code rõ rà
 from PySide6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QPushButton, QHBoxLayout,
     QLabel, QProgressBar, QMainWindow, QTabWidget, QStatusBar,
-    QLineEdit, QGroupBox, QListWidget, QListWidgetItem, QSizePolicy,
+    QLineEdit, QGroupBox, QComboBox, QSizePolicy,
 )
-from PySide6.QtCore import Qt, QTimer, QTime, QEvent, Signal
-from PySide6.QtGui import QAction, QColor, QIcon
+from PySide6.QtCore import Qt, QTimer, QEvent, Signal
+from PySide6.QtGui import QAction, QIcon
 import sys
 import signal
 import os
+import json
 from datetime import datetime
 from typing import Optional, List
 
 # Import các module của ứng dụng
 from app.historyPanel import HistoryPanel
 from app.core.config import AppConfig
-from app.tabs.tts_tab import TTSTab
-from app.tabs.convert_tab import ConvertTab
-from app.tabs.downloadvideo_tab import DownloadVideoTab
-from app.tabs.translate_tab import TranslateTab
-from app.tabs.srt_tab import SRTTab
+# Các tab được import/dựng khi mở lần đầu (xem app/ui/lazy_tab.py)
 # from app.tabs.downloadvideo_tab_1 import DownloadVideoTab1
 from app.uiToolbarTab import UIToolbarTab
+from app.ui.lazy_tab import LazyTabHost, tab_factory
 from app.ui_setting import _init_addStyle, resource_path
 from app.utils.helps import clean_all_temp_parts
+from app.core.temp_workspace import temp_workspace
+from app.core.log_sink import log_sink
+from app.core.job_scheduler import job_scheduler
+from app.ui.log_view import LEVEL_FILTERS, LogView
 
 
 class ClickToCloseOverlay(QWidget):
@@ -175,25 +177,73 @@ class MainWindow(QMainWindow):
 
     def _setup_tabs(self) -> None:
         """
-        Thiết lập và tạo các tab chức năng
-        Hiện tại chỉ có tab TTS, có thể mở rộng thêm Convert, Simple
+        Thiết lập các tab chức năng
+        Mỗi tab chỉ được dựng khi được mở lần đầu (placeholder nhẹ cho tới lúc đó),
+        tab mở lần trước được khôi phục khi khởi động.
         """
-        # Tạo tab TTS
-        self.tab_tts = TTSTab(self)
-        # Tạo tab Download Video
-        self.tab_downloadvideo = DownloadVideoTab(self)
-        self.tab_translate = TranslateTab(self)
-        self.tab_srt = SRTTab(self)
-
-        # Lưu danh sách tất cả tabs để quản lý
-        self._all_tabs: List[UIToolbarTab] = [self.tab_tts, self.tab_downloadvideo, self.tab_translate, self.tab_srt]
-
-        # Thêm tabs vào widget
-        # self.tabs.addTab(self.tab_downloadvideo1, "Download Video New")
-        self.tabs.addTab(self.tab_downloadvideo, "Download Video")
-        self.tabs.addTab(self.tab_tts, "Text to Speech")
-        self.tabs.addTab(self.tab_translate, "Dịch Văn bản / Prompt Tùy chỉnh")
-        self.tabs.addTab(self.tab_srt, "SRT Checker")
+        # Tab thật (None cho tới khi được dựng), giữ nguyên thứ tự slot để quản lý
+        self.tab_tts: Optional[UIToolbarTab] = None
+        self.tab_downloadvideo: Optional[UIToolbarTab] = None
+        self.tab_translate: Optional[UIToolbarTab] = None
+        self.tab_srt: Optional[UIToolbarTab] = None
+        self._all_tabs: List[Optional[UIToolbarTab]] = [None, None, None, None]
+
+        # (thuộc tính, slot trong _all_tabs, module, class, tiêu đề) theo thứ tự hiển thị
+        tab_specs = [
+            # ("tab_downloadvideo1", ..., "Download Video New"),
+            ("tab_downloadvideo", 1, "app.tabs.downloadvideo_tab", "DownloadVideoTab", "Download Video"),
+            ("tab_tts", 0, "app.tabs.tts_tab", "TTSTab", "Text to Speech"),
+            ("tab_translate", 2, "app.tabs.translate_tab", "TranslateTab", "Dịch Văn bản / Prompt Tùy chỉnh"),
+            ("tab_srt", 3, "app.tabs.srt_tab", "SRTTab", "SRT Checker"),
+        ]
+        self._tab_hosts: List[LazyTabHost] = []
+        for attr, slot, module_name, class_name, title in tab_specs:
+            host = LazyTabHost(tab_factory(module_name, class_name, self), title)
+            host.built.connect(
+                lambda tab, attr=attr, slot=slot: self._on_tab_built(attr, slot, tab))
+            host.build_failed.connect(
+                lambda msg, title=title: self._add_log_item(f"❌ Không thể tải tab {title}: {msg}", level="error"))
+            self._tab_hosts.append(host)
+            self.tabs.addTab(host, title)
+
+        # Khôi phục tab đang mở lần trước; chỉ tab đó được dựng lúc khởi động
+        last_index = self._load_ui_state().get("current_tab", 0)
+        if isinstance(last_index, int) and 0 <= last_index < self.tabs.count():
+            self.tabs.setCurrentIndex(last_index)
+        self.tabs.currentChanged.connect(self._activate_tab)
+        self._tab_hosts[self.tabs.currentIndex()].ensure_built()
+
+    def _activate_tab(self, index: int) -> None:
+        """Dựng tab khi được mở lần đầu"""
+        if 0 <= index < len(self._tab_hosts):
+            self._tab_hosts[index].activate()
+
+    def _on_tab_built(self, attr: str, slot: int, tab: UIToolbarTab) -> None:
+        """Tab vừa được dựng: gắn vào slot quản lý và nối tín hiệu lịch sử"""
+        setattr(self, attr, tab)
+        self._all_tabs[slot] = tab
+        if self._setup_complete:
+            self._connect_tab_history(slot, tab)
+            self._update_tab_buttons_visibility()
+            # Trạng thái progress/lịch sử của tab đang mở
+            self._on_tab_changed(self.tabs.currentIndex())
+
+    def _load_ui_state(self) -> dict:
+        try:
+            with open(AppConfig.UI_STATE_FILE, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            return state if isinstance(state, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save_ui_state(self) -> None:
+        state = self._load_ui_state()
+        state["current_tab"] = self.tabs.currentIndex()
+        try:
+            with open(AppConfig.UI_STATE_FILE, "w", encoding="utf-8") as f:
+                json.dump(state, f, ensure_ascii=False, indent=2)
+        except OSError:
+            pass
 
     def _initialize_ui_state(self) -> None:
         """
@@ -280,13 +330,25 @@ class MainWindow(QMainWindow):
     def _setup_log_area(self, progress_layout: QVBoxLayout) -> None:
         """
         Thiết lập khu vực hiển thị log
+        Log nằm trong ring buffer của log_sink; LogView chỉ vẽ các dòng đang nhìn thấy
         """
-        self.output_list = QListWidget()
-
-        # Cấu hình hiển thị log
-        self.output_list.setAlternatingRowColors(True)  # Màu xen kẽ các dòng
-        self.output_list.setVerticalScrollMode(
-            QListWidget.ScrollPerPixel)  # Cuộn mượt
+        self.output_list = LogView(log_sink)
+
+        # Bộ lọc mức log + nút xóa
+        filter_layout = QHBoxLayout()
+        self.log_level_filter = QComboBox()
+        for name, levels in LEVEL_FILTERS:
+            self.log_level_filter.addItem(name, levels)
+        self.log_level_filter.currentIndexChanged.connect(
+            lambda _: self.output_list.set_level_filter(self.log_level_filter.currentData()))
+        clear_log_btn = QPushButton("🧹 Xóa log")
+        clear_log_btn.setStyleSheet(AppConfig.BUTTON_STYLE)
+        clear_log_btn.clicked.connect(self.output_list.clear)
+        filter_layout.addWidget(QLabel("📋 Log:"))
+        filter_layout.addWidget(self.log_level_filter)
+        filter_layout.addStretch()
+        filter_layout.addWidget(clear_log_btn)
+        progress_layout.addLayout(filter_layout)
 
         # Giới hạn chiều cao của log frame để không quá dài
         # Giới hạn chiều cao tối đa 150px
@@ -472,22 +534,27 @@ class MainWindow(QMainWindow):
         self.setStatusBar(self.status)
         self.status.showMessage("Sẵn sàng")
 
+        # Trạng thái bộ lập lịch dùng chung (số luồng, việc đang chạy/đang chờ mỗi hàng đợi)
+        self.scheduler_label = QLabel()
+        self.status.addPermanentWidget(self.scheduler_label)
+        self._scheduler_timer = QTimer(self)
+        self._scheduler_timer.setInterval(1000)
+        self._scheduler_timer.timeout.connect(self._refresh_scheduler_status)
+        self._scheduler_timer.start()
+        self._refresh_scheduler_status()
+
+    def _refresh_scheduler_status(self):
+        """Cập nhật nhãn job_scheduler trên status bar (tooltip: danh sách việc đang chạy)"""
+        snap = job_scheduler.snapshot()
+        self.scheduler_label.setText(job_scheduler.describe())
+        lines = [f"{q['name']}: {q['running']}/{q['limit']} đang chạy, {q['pending']} chờ (ưu tiên {q['priority']})"
+                 for q in snap["queues"]]
+        lines += [f"• {job['label']} [{job['queue']}] {job['seconds']}s" for job in snap["jobs"]]
+        self.scheduler_label.setToolTip("\n".join(lines))
+
     def _add_log_item(self, message: str, level=""):
-        """Add item to output list with timestamp and color coding"""
-        if hasattr(self, 'output_list') and self.output_list:
-            current_time = QTime.currentTime().toString("HH:mm:ss")
-            message = f"[{current_time}] {message}"
-            item = QListWidgetItem(message)
-            if level == "info":
-                item.setForeground(QColor("#05df60"))
-            elif level == "warning":
-                item.setForeground(QColor("orange"))
-            elif level == "error":
-                item.setForeground(QColor("red"))
-            elif level == "blue":
-                item.setForeground(QColor("#4a5568"))
-            self.output_list.addItem(item)
-            self.output_list.scrollToBottom()
+        """Add log line (timestamp + color by level); LogView flushes in batches"""
+        log_sink.write(message, level)
 
     def _setup_progress_system(self):
         """Setup progress tracking system"""
@@ -728,13 +795,17 @@ class MainWindow(QMainWindow):
             self._safe_layout_update()
 
     def _connect_history_signals(self):
-        """Connect history show/hide signals from tabs"""
+        """Connect history show/hide signals from tabs (tabs built so far)"""
         for i, tab in enumerate(self._all_tabs):
-            if hasattr(tab, 'history') and tab.history:
-                tab.history.request_show_history.connect(
-                    lambda checked=False, tab_index=i: self._open_tab_history(tab_index))
-                tab.history.request_hide_history.connect(
-                    lambda checked=False, tab_index=i: self._close_tab_history(tab_index))
+            self._connect_tab_history(i, tab)
+
+    def _connect_tab_history(self, tab_index: int, tab: Optional[UIToolbarTab]) -> None:
+        """Connect history show/hide signals of one tab"""
+        if hasattr(tab, 'history') and tab.history:
+            tab.history.request_show_history.connect(
+                lambda checked=False, tab_index=tab_index: self._open_tab_history(tab_index))
+            tab.history.request_hide_history.connect(
+                lambda checked=False, tab_index=tab_index: self._close_tab_history(tab_index))
 
     # Progress Control Methods
     def on_start(self):
@@ -805,9 +876,10 @@ class MainWindow(QMainWindow):
     # History Management Methods
 
     def _get_current_tab(self) -> Optional[UIToolbarTab]:
-        """Get current active tab"""
+        """Get current active tab (None if it has not been built yet)"""
         try:
-            return self.tabs.currentWidget()
+            host = self.tabs.currentWidget()
+            return host.widget if isinstance(host, LazyTabHost) else host
         except Exception:
             return None
 
@@ -1081,11 +1153,14 @@ class MainWindow(QMainWindow):
 
     def closeEvent(self, event):
         """Cleanup temporary parts when the application is closing."""
+        self._save_ui_state()
         try:
             cleaned = clean_all_temp_parts()
             # Log to output list if available
             self._add_log_item(
                 f"🧹 Đã dọn {cleaned} thư mục tạm.", level="info")
+            # Xóa toàn bộ thư mục tạm của phiên
+            temp_workspace.close()
         except Exception as e:
             try:
                 self._add_log_item(
@@ -1093,14 +1168,16 @@ class MainWindow(QMainWindow):
             except Exception:
                 pass
         finally:
+            log_sink.close()
             event.accept()
 
 
 def main():
     """Main application entry point"""
-    # Dọn dẹp tàn dư từ phiên trước (trong trường hợp app bị treo/crash)
+    # Dọn dẹp tàn dư từ phiên trước (trong trường hợp app bị treo/crash);
+    # thư mục của phiên khác đang chạy được giữ lại
     try:
-        cleaned_on_start = clean_all_temp_parts()
+        cleaned_on_start = temp_workspace.reclaim_orphans()
         # Không log được ở đây vì chưa có window; chỉ đảm bảo sạch tàn dư
     except Exception:
         pass
@@ -1122,14 +1199,16 @@ def main():
     try:
         def _qt_about_to_quit():
             try:
-                clean_all_temp_parts()
+                temp_workspace.close()
             except Exception:
                 pass
+            log_sink.close()
         app.aboutToQuit.connect(_qt_about_to_quit)
     except Exception:
         pass
 
     # Cài đặt bắt exception toàn cục để dọn dẹp trước khi thoát bất thường
+    # (chỉ dọn file tạm không còn dùng vì Qt vẫn chạy tiếp sau exception trong slot)
     try:
         def _global_excepthook(exctype, exc, tb):
             try:
@@ -1146,9 +1225,10 @@ def main():
     try:
         def _signal_handler(signum, frame):
             try:
-                clean_all_temp_parts()
+                temp_workspace.close()
             except Exception:
                 pass
+            log_sink.close()
             # Kết thúc tiến trình ngay
             sys.exit(0)
         signal.signal(signal.SIGINT, _signal_handler)
@@ -97,6 +97,7 @@ setup(
             "ui/*.py",
             "tabs/*.py",
             "core/*.py",
+            "core/*.json",
             "history/*.py",
             "utils/*.py",
         ],